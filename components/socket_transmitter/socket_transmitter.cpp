@@ -2,11 +2,11 @@
 
 namespace esphome {
 namespace socket_transmitter {
-void SocketTransmitter::send(std::string data) {
-  return this->send((uint8_t *)data.c_str(), data.length());
+void SocketTransmitter::send(const std::string &data) {
+  return this->send((const uint8_t *)data.data(), data.length());
 }
 
-void SocketTransmitter::send(std::vector<uint8_t> data) {
+void SocketTransmitter::send(const std::vector<uint8_t> &data) {
   return this->send(data.data(), data.size());
 }
 
@@ -16,8 +16,8 @@ public:
   void set_host(std::string host) { this->host = host; };
   void set_port(int port) { this->port = port; };
   void set_protocol(int protocol) { this->protocol = protocol; };
-  void send(std::string data);
-  void send(std::vector<uint8_t> data);
+  void send(const std::string &data);
+  void send(const std::vector<uint8_t> &data);
   void send(const uint8_t *data, size_t length);
   void dump_config() override;
   float get_setup_priority() const override {
@@ -3,9 +3,11 @@
 // Copyright (C) 2017-2019 kokke (CC0-1.0)
 /*
 
-This is an implementation of the AES algorithm, specifically ECB and CBC mode.
-Block size can be chosen in aes.h - available choices are AES128, AES192,
-AES256.
+AES-128 in ECB and CBC mode, on top of the backend selected in aes.h.
+
+The software backend is the classic 32-bit table implementation: SubBytes,
+ShiftRows and MixColumns of a round are four table lookups per column, with
+the tables computed at compile time from the S-boxes.
 
 The implementation is verified against the test vectors in:
   National Institute of Standards and Technology Special Publication 800-38A
@@ -29,76 +31,49 @@ ECB-AES128
     43b1cd7f598ece23881b00e3ed030688
     7b0c785e27e8ad3f8223207104725dd4
 
-
-NOTE:   String length must be evenly divisible by 16byte (str_len % 16 == 0)
-        You should pad the end of the string with zeros if this is not the case.
-        For AES192/256 the block size is proportionally larger.
-
 */
 
-/*****************************************************************************/
-/* Includes:                                                                 */
-/*****************************************************************************/
 #include "aes.h"
-#include <stdint.h>
-#include <string.h> // CBC mode, for memset
-
-/*****************************************************************************/
-/* Defines:                                                                  */
-/*****************************************************************************/
-// The number of columns comprising a state in AES. This is a constant in AES.
-// Value=4
-#define Nb 4
-#define BLOCKLEN 16 // Block length in bytes AES is 128b block only
-
-#if defined(AES256) && (AES256 == 1)
-#define Nk 8
-#define KEYLEN 32
-#define Nr 14
-#define keyExpSize 240
-#elif defined(AES192) && (AES192 == 1)
-#define Nk 6
-#define KEYLEN 24
-#define Nr 12
-#define keyExpSize 208
-#else
-#define Nk 4      // The number of 32 bit words in a key.
-#define KEYLEN 16 // Key length in bytes
-#define Nr 10     // The number of rounds in AES Cipher.
-#define keyExpSize 176
-#endif
-
-// jcallan@github points out that declaring Multiply as a function
-// reduces code size considerably with the Keil ARM compiler.
-// See this link for more information:
-// https://github.com/kokke/tiny-AES128-C/pull/3
-#ifndef MULTIPLY_AS_A_FUNCTION
-#define MULTIPLY_AS_A_FUNCTION 0
-#endif
-
-/*****************************************************************************/
-/* Private variables:                                                        */
-/*****************************************************************************/
-// state - array holding the intermediate results during decryption.
-typedef uint8_t state_t[4][4];
-static state_t *state;
-
-// The array that stores the round keys.
-static uint8_t RoundKey[keyExpSize];
-
-// The Key input to the AES Program
-static const uint8_t *Key;
-
-#if defined(CBC) && CBC
-// Initial Vector used only for CBC mode
-static uint8_t *Iv;
-#endif
-
-// The lookup-tables are marked const so they can be placed in read-only storage
-// instead of RAM The numbers below can be computed dynamically trading ROM for
-// RAM - This can be useful in (embedded) bootloader applications, where ROM is
-// often limited.
-static const uint8_t sbox[256] = {
+
+void AES_ECB_encrypt(const uint8_t *input, const uint8_t *key, uint8_t *output,
+                     const uint32_t length) {
+  struct AES_ctx ctx;
+  AES_init_ctx(&ctx, key);
+  for (uint32_t i = 0; i + AES_BLOCKLEN <= length; i += AES_BLOCKLEN) {
+    AES_ECB_encrypt_ctx(&ctx, input + i, output + i);
+  }
+  AES_free_ctx(&ctx);
+}
+
+void AES_ECB_decrypt(const uint8_t *input, const uint8_t *key, uint8_t *output,
+                     const uint32_t length) {
+  struct AES_ctx ctx;
+  AES_init_ctx(&ctx, key);
+  for (uint32_t i = 0; i + AES_BLOCKLEN <= length; i += AES_BLOCKLEN) {
+    AES_ECB_decrypt_ctx(&ctx, input + i, output + i);
+  }
+  AES_free_ctx(&ctx);
+}
+
+void AES_CBC_encrypt_buffer(uint8_t *output, uint8_t *input, uint32_t length,
+                            const uint8_t *key, const uint8_t *iv) {
+  struct AES_ctx ctx;
+  AES_init_ctx(&ctx, key);
+  AES_CBC_encrypt_buffer_ctx(&ctx, output, input, length, iv);
+  AES_free_ctx(&ctx);
+}
+
+void AES_CBC_decrypt_buffer(uint8_t *output, uint8_t *input, uint32_t length,
+                            const uint8_t *key, const uint8_t *iv) {
+  struct AES_ctx ctx;
+  AES_init_ctx(&ctx, key);
+  AES_CBC_decrypt_buffer_ctx(&ctx, output, input, length, iv);
+  AES_free_ctx(&ctx);
+}
+
+#ifndef ESP_PLATFORM
+
+static constexpr uint8_t sbox[256] = {
     // 0     1    2      3     4    5     6     7      8    9     A      B    C
     // D     E     F
     0x63, 0x7c, 0x77, 0x7b, 0xf2, 0x6b, 0x6f, 0xc5, 0x30, 0x01, 0x67, 0x2b,
@@ -124,7 +99,7 @@ static const uint8_t sbox[256] = {
     0x8c, 0xa1, 0x89, 0x0d, 0xbf, 0xe6, 0x42, 0x68, 0x41, 0x99, 0x2d, 0x0f,
     0xb0, 0x54, 0xbb, 0x16};
 
-static const uint8_t rsbox[256] = {
+static constexpr uint8_t rsbox[256] = {
     0x52, 0x09, 0x6a, 0xd5, 0x30, 0x36, 0xa5, 0x38, 0xbf, 0x40, 0xa3, 0x9e,
     0x81, 0xf3, 0xd7, 0xfb, 0x7c, 0xe3, 0x39, 0x82, 0x9b, 0x2f, 0xff, 0x87,
     0x34, 0x8e, 0x43, 0x44, 0xc4, 0xde, 0xe9, 0xcb, 0x54, 0x7b, 0x94, 0x32,
@@ -148,435 +123,199 @@ static const uint8_t rsbox[256] = {
     0x17, 0x2b, 0x04, 0x7e, 0xba, 0x77, 0xd6, 0x26, 0xe1, 0x69, 0x14, 0x63,
     0x55, 0x21, 0x0c, 0x7d};
 
-// The round constant word array, Rcon[i], contains the values given by
-// x to th e power (i-1) being powers of x (x is denoted as {02}) in the field
-// GF(2^8)
-static const uint8_t Rcon[11] = {0x8d, 0x01, 0x02, 0x04, 0x08, 0x10,
+static const uint8_t Rcon[10] = {0x01, 0x02, 0x04, 0x08, 0x10,
                                  0x20, 0x40, 0x80, 0x1b, 0x36};
 
-/*
- * Jordan Goulder points out in PR #12
- * (https://github.com/kokke/tiny-AES128-C/pull/12), that you can remove most of
- * the elements in the Rcon array, because they are unused.
- *
- * From Wikipedia's article on the Rijndael key schedule @
- * https://en.wikipedia.org/wiki/Rijndael_key_schedule#Rcon
- *
- * "Only the first some of these constants are actually used – up to rcon[10]
- * for AES-128 (as 11 round keys are needed), up to rcon[8] for AES-192, up to
- * rcon[7] for AES-256. rcon[0] is not used in AES algorithm."
- *
- * ... which is why the full array below has been 'disabled' below.
- */
-#if 0
-static const uint8_t Rcon[256] = {
-  0x8d, 0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1b, 0x36, 0x6c, 0xd8, 0xab, 0x4d, 0x9a,
-  0x2f, 0x5e, 0xbc, 0x63, 0xc6, 0x97, 0x35, 0x6a, 0xd4, 0xb3, 0x7d, 0xfa, 0xef, 0xc5, 0x91, 0x39,
-  0x72, 0xe4, 0xd3, 0xbd, 0x61, 0xc2, 0x9f, 0x25, 0x4a, 0x94, 0x33, 0x66, 0xcc, 0x83, 0x1d, 0x3a,
-  0x74, 0xe8, 0xcb, 0x8d, 0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1b, 0x36, 0x6c, 0xd8,
-  0xab, 0x4d, 0x9a, 0x2f, 0x5e, 0xbc, 0x63, 0xc6, 0x97, 0x35, 0x6a, 0xd4, 0xb3, 0x7d, 0xfa, 0xef,
-  0xc5, 0x91, 0x39, 0x72, 0xe4, 0xd3, 0xbd, 0x61, 0xc2, 0x9f, 0x25, 0x4a, 0x94, 0x33, 0x66, 0xcc,
-  0x83, 0x1d, 0x3a, 0x74, 0xe8, 0xcb, 0x8d, 0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1b,
-  0x36, 0x6c, 0xd8, 0xab, 0x4d, 0x9a, 0x2f, 0x5e, 0xbc, 0x63, 0xc6, 0x97, 0x35, 0x6a, 0xd4, 0xb3,
-  0x7d, 0xfa, 0xef, 0xc5, 0x91, 0x39, 0x72, 0xe4, 0xd3, 0xbd, 0x61, 0xc2, 0x9f, 0x25, 0x4a, 0x94,
-  0x33, 0x66, 0xcc, 0x83, 0x1d, 0x3a, 0x74, 0xe8, 0xcb, 0x8d, 0x01, 0x02, 0x04, 0x08, 0x10, 0x20,
-  0x40, 0x80, 0x1b, 0x36, 0x6c, 0xd8, 0xab, 0x4d, 0x9a, 0x2f, 0x5e, 0xbc, 0x63, 0xc6, 0x97, 0x35,
-  0x6a, 0xd4, 0xb3, 0x7d, 0xfa, 0xef, 0xc5, 0x91, 0x39, 0x72, 0xe4, 0xd3, 0xbd, 0x61, 0xc2, 0x9f,
-  0x25, 0x4a, 0x94, 0x33, 0x66, 0xcc, 0x83, 0x1d, 0x3a, 0x74, 0xe8, 0xcb, 0x8d, 0x01, 0x02, 0x04,
-  0x08, 0x10, 0x20, 0x40, 0x80, 0x1b, 0x36, 0x6c, 0xd8, 0xab, 0x4d, 0x9a, 0x2f, 0x5e, 0xbc, 0x63,
-  0xc6, 0x97, 0x35, 0x6a, 0xd4, 0xb3, 0x7d, 0xfa, 0xef, 0xc5, 0x91, 0x39, 0x72, 0xe4, 0xd3, 0xbd,
-  0x61, 0xc2, 0x9f, 0x25, 0x4a, 0x94, 0x33, 0x66, 0xcc, 0x83, 0x1d, 0x3a, 0x74, 0xe8, 0xcb, 0x8d };
-#endif
-
-/*****************************************************************************/
-/* Private functions:                                                        */
-/*****************************************************************************/
-static uint8_t getSBoxValue(uint8_t num) { return sbox[num]; }
-
-static uint8_t getSBoxInvert(uint8_t num) { return rsbox[num]; }
-
-// This function produces Nb(Nr+1) round keys. The round keys are used in each
-// round to decrypt the states.
-static void KeyExpansion(void) {
-  uint32_t i, k;
-  uint8_t tempa[4]; // Used for the column/row operations
-
-  // The first round key is the key itself.
-  for (i = 0; i < Nk; ++i) {
-    RoundKey[(i * 4) + 0] = Key[(i * 4) + 0];
-    RoundKey[(i * 4) + 1] = Key[(i * 4) + 1];
-    RoundKey[(i * 4) + 2] = Key[(i * 4) + 2];
-    RoundKey[(i * 4) + 3] = Key[(i * 4) + 3];
-  }
-
-  // All other round keys are found from the previous round keys.
-  // i == Nk
-  for (; i < Nb * (Nr + 1); ++i) {
-    {
-      tempa[0] = RoundKey[(i - 1) * 4 + 0];
-      tempa[1] = RoundKey[(i - 1) * 4 + 1];
-      tempa[2] = RoundKey[(i - 1) * 4 + 2];
-      tempa[3] = RoundKey[(i - 1) * 4 + 3];
-    }
-
-    if (i % Nk == 0) {
-      // This function shifts the 4 bytes in a word to the left once.
-      // [a0,a1,a2,a3] becomes [a1,a2,a3,a0]
-
-      // Function RotWord()
-      {
-        k = tempa[0];
-        tempa[0] = tempa[1];
-        tempa[1] = tempa[2];
-        tempa[2] = tempa[3];
-        tempa[3] = k;
-      }
-
-      // SubWord() is a function that takes a four-byte input word and
-      // applies the S-box to each of the four bytes to produce an output word.
-
-      // Function Subword()
-      {
-        tempa[0] = getSBoxValue(tempa[0]);
-        tempa[1] = getSBoxValue(tempa[1]);
-        tempa[2] = getSBoxValue(tempa[2]);
-        tempa[3] = getSBoxValue(tempa[3]);
-      }
-
-      tempa[0] = tempa[0] ^ Rcon[i / Nk];
-    }
-#if defined(AES256) && (AES256 == 1)
-    if (i % Nk == 4) {
-      // Function Subword()
-      {
-        tempa[0] = getSBoxValue(tempa[0]);
-        tempa[1] = getSBoxValue(tempa[1]);
-        tempa[2] = getSBoxValue(tempa[2]);
-        tempa[3] = getSBoxValue(tempa[3]);
-      }
-    }
-#endif
-    RoundKey[i * 4 + 0] = RoundKey[(i - Nk) * 4 + 0] ^ tempa[0];
-    RoundKey[i * 4 + 1] = RoundKey[(i - Nk) * 4 + 1] ^ tempa[1];
-    RoundKey[i * 4 + 2] = RoundKey[(i - Nk) * 4 + 2] ^ tempa[2];
-    RoundKey[i * 4 + 3] = RoundKey[(i - Nk) * 4 + 3] ^ tempa[3];
-  }
-}
-
-// This function adds the round key to state.
-// The round key is added to the state by an XOR function.
-static void AddRoundKey(uint8_t round) {
-  uint8_t i, j;
-  for (i = 0; i < 4; ++i) {
-    for (j = 0; j < 4; ++j) {
-      (*state)[i][j] ^= RoundKey[round * Nb * 4 + i * Nb + j];
-    }
-  }
+static constexpr uint8_t xtime(uint8_t x) {
+  return (x << 1) ^ (((x >> 7) & 1) * 0x1b);
 }
 
-// The SubBytes Function Substitutes the values in the
-// state matrix with values in an S-box.
-static void SubBytes(void) {
-  uint8_t i, j;
-  for (i = 0; i < 4; ++i) {
-    for (j = 0; j < 4; ++j) {
-      (*state)[j][i] = getSBoxValue((*state)[j][i]);
-    }
+static constexpr uint8_t Multiply(uint8_t x, uint8_t y) {
+  uint8_t product = 0;
+  for (; y; y >>= 1, x = xtime(x)) {
+    if (y & 1)
+      product ^= x;
   }
+  return product;
 }
 
-// The ShiftRows() function shifts the rows in the state to the left.
-// Each row is shifted with different offset.
-// Offset = Row number. So the first row is not shifted.
-static void ShiftRows(void) {
-  uint8_t temp;
-
-  // Rotate first row 1 columns to left
-  temp = (*state)[0][1];
-  (*state)[0][1] = (*state)[1][1];
-  (*state)[1][1] = (*state)[2][1];
-  (*state)[2][1] = (*state)[3][1];
-  (*state)[3][1] = temp;
-
-  // Rotate second row 2 columns to left
-  temp = (*state)[0][2];
-  (*state)[0][2] = (*state)[2][2];
-  (*state)[2][2] = temp;
-
-  temp = (*state)[1][2];
-  (*state)[1][2] = (*state)[3][2];
-  (*state)[3][2] = temp;
-
-  // Rotate third row 3 columns to left
-  temp = (*state)[0][3];
-  (*state)[0][3] = (*state)[3][3];
-  (*state)[3][3] = (*state)[2][3];
-  (*state)[2][3] = (*state)[1][3];
-  (*state)[1][3] = temp;
-}
-
-static uint8_t xtime(uint8_t x) { return ((x << 1) ^ (((x >> 7) & 1) * 0x1b)); }
-
-// MixColumns function mixes the columns of the state matrix
-static void MixColumns(void) {
-  uint8_t i;
-  uint8_t Tmp, Tm, t;
-  for (i = 0; i < 4; ++i) {
-    t = (*state)[i][0];
-    Tmp = (*state)[i][0] ^ (*state)[i][1] ^ (*state)[i][2] ^ (*state)[i][3];
-    Tm = (*state)[i][0] ^ (*state)[i][1];
-    Tm = xtime(Tm);
-    (*state)[i][0] ^= Tm ^ Tmp;
-    Tm = (*state)[i][1] ^ (*state)[i][2];
-    Tm = xtime(Tm);
-    (*state)[i][1] ^= Tm ^ Tmp;
-    Tm = (*state)[i][2] ^ (*state)[i][3];
-    Tm = xtime(Tm);
-    (*state)[i][2] ^= Tm ^ Tmp;
-    Tm = (*state)[i][3] ^ t;
-    Tm = xtime(Tm);
-    (*state)[i][3] ^= Tm ^ Tmp;
-  }
+static constexpr uint32_t Word(uint8_t b0, uint8_t b1, uint8_t b2,
+                               uint8_t b3) {
+  return (uint32_t)b0 << 24 | (uint32_t)b1 << 16 | (uint32_t)b2 << 8 | b3;
 }
 
-// Multiply is used to multiply numbers in the field GF(2^8)
-#if MULTIPLY_AS_A_FUNCTION
-static uint8_t Multiply(uint8_t x, uint8_t y) {
-  return (((y & 1) * x) ^ ((y >> 1 & 1) * xtime(x)) ^
-          ((y >> 2 & 1) * xtime(xtime(x))) ^
-          ((y >> 3 & 1) * xtime(xtime(xtime(x)))) ^
-          ((y >> 4 & 1) * xtime(xtime(xtime(xtime(x))))));
-}
-#else
-#define Multiply(x, y)                                                         \
-  (((y & 1) * x) ^ ((y >> 1 & 1) * xtime(x)) ^                                 \
-   ((y >> 2 & 1) * xtime(xtime(x))) ^                                          \
-   ((y >> 3 & 1) * xtime(xtime(xtime(x)))) ^                                   \
-   ((y >> 4 & 1) * xtime(xtime(xtime(xtime(x))))))
-
-#endif
-
-// MixColumns function mixes the columns of the state matrix.
-// The method used to multiply may be difficult to understand for the
-// inexperienced. Please use the references to gain more information.
-static void InvMixColumns(void) {
-  int i;
-  uint8_t a, b, c, d;
-  for (i = 0; i < 4; ++i) {
-    a = (*state)[i][0];
-    b = (*state)[i][1];
-    c = (*state)[i][2];
-    d = (*state)[i][3];
-
-    (*state)[i][0] = Multiply(a, 0x0e) ^ Multiply(b, 0x0b) ^ Multiply(c, 0x0d) ^
-                     Multiply(d, 0x09);
-    (*state)[i][1] = Multiply(a, 0x09) ^ Multiply(b, 0x0e) ^ Multiply(c, 0x0b) ^
-                     Multiply(d, 0x0d);
-    (*state)[i][2] = Multiply(a, 0x0d) ^ Multiply(b, 0x09) ^ Multiply(c, 0x0e) ^
-                     Multiply(d, 0x0b);
-    (*state)[i][3] = Multiply(a, 0x0b) ^ Multiply(b, 0x0d) ^ Multiply(c, 0x09) ^
-                     Multiply(d, 0x0e);
-  }
+static constexpr uint32_t RotateRight(uint32_t w, int bits) {
+  return bits ? (w >> bits) | (w << (32 - bits)) : w;
 }
 
-// The SubBytes Function Substitutes the values in the
-// state matrix with values in an S-box.
-static void InvSubBytes(void) {
-  uint8_t i, j;
-  for (i = 0; i < 4; ++i) {
-    for (j = 0; j < 4; ++j) {
-      (*state)[j][i] = getSBoxInvert((*state)[j][i]);
+// Te[n][x] is column n of MixColumns applied to sbox[x] (big endian words),
+// Td[n][x] the same for InvMixColumns and rsbox[x].
+struct Tables {
+  uint32_t Te[4][256];
+  uint32_t Td[4][256];
+};
+
+static constexpr Tables MakeTables() {
+  Tables t{};
+  for (int x = 0; x < 256; ++x) {
+    uint8_t s = sbox[x];
+    uint32_t te = Word(Multiply(s, 2), s, s, Multiply(s, 3));
+    uint8_t r = rsbox[x];
+    uint32_t td = Word(Multiply(r, 14), Multiply(r, 9), Multiply(r, 13),
+                       Multiply(r, 11));
+    for (int n = 0; n < 4; ++n) {
+      t.Te[n][x] = RotateRight(te, 8 * n);
+      t.Td[n][x] = RotateRight(td, 8 * n);
     }
   }
+  return t;
 }
 
-static void InvShiftRows(void) {
-  uint8_t temp;
-
-  // Rotate first row 1 columns to right
-  temp = (*state)[3][1];
-  (*state)[3][1] = (*state)[2][1];
-  (*state)[2][1] = (*state)[1][1];
-  (*state)[1][1] = (*state)[0][1];
-  (*state)[0][1] = temp;
-
-  // Rotate second row 2 columns to right
-  temp = (*state)[0][2];
-  (*state)[0][2] = (*state)[2][2];
-  (*state)[2][2] = temp;
-
-  temp = (*state)[1][2];
-  (*state)[1][2] = (*state)[3][2];
-  (*state)[3][2] = temp;
-
-  // Rotate third row 3 columns to right
-  temp = (*state)[0][3];
-  (*state)[0][3] = (*state)[1][3];
-  (*state)[1][3] = (*state)[2][3];
-  (*state)[2][3] = (*state)[3][3];
-  (*state)[3][3] = temp;
-}
-
-// Cipher is the main function that encrypts the PlainText.
-static void Cipher(void) {
-  uint8_t round = 0;
-
-  // Add the First round key to the state before starting the rounds.
-  AddRoundKey(0);
-
-  // There will be Nr rounds.
-  // The first Nr-1 rounds are identical.
-  // These Nr-1 rounds are executed in the loop below.
-  for (round = 1; round < Nr; ++round) {
-    SubBytes();
-    ShiftRows();
-    MixColumns();
-    AddRoundKey(round);
-  }
-
-  // The last round is given below.
-  // The MixColumns function is not here in the last round.
-  SubBytes();
-  ShiftRows();
-  AddRoundKey(Nr);
-}
-
-static void InvCipher(void) {
-  uint8_t round = 0;
-
-  // Add the First round key to the state before starting the rounds.
-  AddRoundKey(Nr);
-
-  // There will be Nr rounds.
-  // The first Nr-1 rounds are identical.
-  // These Nr-1 rounds are executed in the loop below.
-  for (round = (Nr - 1); round > 0; --round) {
-    InvShiftRows();
-    InvSubBytes();
-    AddRoundKey(round);
-    InvMixColumns();
-  }
-
-  // The last round is given below.
-  // The MixColumns function is not here in the last round.
-  InvShiftRows();
-  InvSubBytes();
-  AddRoundKey(0);
-}
-
-/*****************************************************************************/
-/* Public functions:                                                         */
-/*****************************************************************************/
-#if defined(ECB) && (ECB == 1)
-
-void AES_ECB_encrypt(const uint8_t *input, const uint8_t *key, uint8_t *output,
-                     const uint32_t length) {
-  // Copy input to output, and work in-memory on output
-  memcpy(output, input, length);
-  state = (state_t *)output;
+static constexpr Tables tables = MakeTables();
+static constexpr const uint32_t(&Te)[4][256] = tables.Te;
+static constexpr const uint32_t(&Td)[4][256] = tables.Td;
 
-  Key = key;
-  KeyExpansion();
+static uint32_t Load(const uint8_t *p) { return Word(p[0], p[1], p[2], p[3]); }
 
-  // The next function call encrypts the PlainText with the Key using AES
-  // algorithm.
-  Cipher();
+static void Store(uint8_t *p, uint32_t w) {
+  p[0] = w >> 24;
+  p[1] = w >> 16;
+  p[2] = w >> 8;
+  p[3] = w;
 }
 
-void AES_ECB_decrypt(const uint8_t *input, const uint8_t *key, uint8_t *output,
-                     const uint32_t length) {
-  // Copy input to output, and work in-memory on output
-  memcpy(output, input, length);
-  state = (state_t *)output;
-
-  // The KeyExpansion routine must be called before encryption.
-  Key = key;
-  KeyExpansion();
-
-  InvCipher();
+static uint32_t SubWord(const uint8_t *box, uint32_t a, uint32_t b,
+                        uint32_t c, uint32_t d) {
+  return Word(box[a >> 24], box[(b >> 16) & 0xff], box[(c >> 8) & 0xff],
+              box[d & 0xff]);
 }
 
-#endif // #if defined(ECB) && (ECB == 1)
-
-#if defined(CBC) && (CBC == 1)
+void AES_init_ctx(struct AES_ctx *ctx, const uint8_t *key) {
+  uint32_t *rk = ctx->enc;
+  for (int i = 0; i < 4; ++i) {
+    rk[i] = Load(key + 4 * i);
+  }
+  for (int i = 0; i < 10; ++i, rk += 4) {
+    uint32_t rotated = RotateRight(rk[3], 24);
+    rk[4] = rk[0] ^ SubWord(sbox, rotated, rotated, rotated, rotated) ^
+            (uint32_t)Rcon[i] << 24;
+    rk[5] = rk[1] ^ rk[4];
+    rk[6] = rk[2] ^ rk[5];
+    rk[7] = rk[3] ^ rk[6];
+  }
 
-static void XorWithIv(uint8_t *buf) {
-  uint8_t i;
-  for (i = 0; i < BLOCKLEN; ++i) // WAS for(i = 0; i < KEYLEN; ++i) but the
-                                 // block in AES is always 128bit so 16 bytes!
-  {
-    buf[i] ^= Iv[i];
+  // Equivalent inverse cipher: reversed round keys, InvMixColumns applied to
+  // all but the first and last one.
+  for (int round = 0; round <= 10; ++round) {
+    for (int i = 0; i < 4; ++i) {
+      uint32_t w = ctx->enc[4 * (10 - round) + i];
+      if (round > 0 && round < 10) {
+        w = Td[0][sbox[w >> 24]] ^ Td[1][sbox[(w >> 16) & 0xff]] ^
+            Td[2][sbox[(w >> 8) & 0xff]] ^ Td[3][sbox[w & 0xff]];
+      }
+      ctx->dec[4 * round + i] = w;
+    }
   }
 }
 
-void AES_CBC_encrypt_buffer(uint8_t *output, uint8_t *input, uint32_t length,
-                            const uint8_t *key, const uint8_t *iv) {
-  uintptr_t i;
-  //  uint8_t extra = length % BLOCKLEN; /* Remaining bytes in the last non-full
-  //  block */
-
-  // Skip the key expansion if key is passed as 0
-  if (0 != key) {
-    Key = key;
-    KeyExpansion();
+void AES_free_ctx(struct AES_ctx *ctx) {}
+
+void AES_ECB_encrypt_ctx(struct AES_ctx *ctx, const uint8_t *input,
+                         uint8_t *output) {
+  const uint32_t *rk = ctx->enc;
+  uint32_t s0 = Load(input) ^ rk[0];
+  uint32_t s1 = Load(input + 4) ^ rk[1];
+  uint32_t s2 = Load(input + 8) ^ rk[2];
+  uint32_t s3 = Load(input + 12) ^ rk[3];
+
+  for (int round = 1; round < 10; ++round) {
+    rk += 4;
+    uint32_t t0 = Te[0][s0 >> 24] ^ Te[1][(s1 >> 16) & 0xff] ^
+                  Te[2][(s2 >> 8) & 0xff] ^ Te[3][s3 & 0xff] ^ rk[0];
+    uint32_t t1 = Te[0][s1 >> 24] ^ Te[1][(s2 >> 16) & 0xff] ^
+                  Te[2][(s3 >> 8) & 0xff] ^ Te[3][s0 & 0xff] ^ rk[1];
+    uint32_t t2 = Te[0][s2 >> 24] ^ Te[1][(s3 >> 16) & 0xff] ^
+                  Te[2][(s0 >> 8) & 0xff] ^ Te[3][s1 & 0xff] ^ rk[2];
+    uint32_t t3 = Te[0][s3 >> 24] ^ Te[1][(s0 >> 16) & 0xff] ^
+                  Te[2][(s1 >> 8) & 0xff] ^ Te[3][s2 & 0xff] ^ rk[3];
+    s0 = t0;
+    s1 = t1;
+    s2 = t2;
+    s3 = t3;
   }
 
-  if (iv != 0) {
-    Iv = (uint8_t *)iv;
-  }
+  // Last round has no MixColumns
+  rk += 4;
+  Store(output, SubWord(sbox, s0, s1, s2, s3) ^ rk[0]);
+  Store(output + 4, SubWord(sbox, s1, s2, s3, s0) ^ rk[1]);
+  Store(output + 8, SubWord(sbox, s2, s3, s0, s1) ^ rk[2]);
+  Store(output + 12, SubWord(sbox, s3, s0, s1, s2) ^ rk[3]);
+}
 
-  for (i = 0; i < length; i += BLOCKLEN) {
-    XorWithIv(input);
-    memcpy(output, input, BLOCKLEN);
-    state = (state_t *)output;
-    Cipher();
-    Iv = output;
-    input += BLOCKLEN;
-    output += BLOCKLEN;
-    // printf("Step %d - %d", i/16, i);
+void AES_ECB_decrypt_ctx(struct AES_ctx *ctx, const uint8_t *input,
+                         uint8_t *output) {
+  const uint32_t *rk = ctx->dec;
+  uint32_t s0 = Load(input) ^ rk[0];
+  uint32_t s1 = Load(input + 4) ^ rk[1];
+  uint32_t s2 = Load(input + 8) ^ rk[2];
+  uint32_t s3 = Load(input + 12) ^ rk[3];
+
+  for (int round = 1; round < 10; ++round) {
+    rk += 4;
+    uint32_t t0 = Td[0][s0 >> 24] ^ Td[1][(s3 >> 16) & 0xff] ^
+                  Td[2][(s2 >> 8) & 0xff] ^ Td[3][s1 & 0xff] ^ rk[0];
+    uint32_t t1 = Td[0][s1 >> 24] ^ Td[1][(s0 >> 16) & 0xff] ^
+                  Td[2][(s3 >> 8) & 0xff] ^ Td[3][s2 & 0xff] ^ rk[1];
+    uint32_t t2 = Td[0][s2 >> 24] ^ Td[1][(s1 >> 16) & 0xff] ^
+                  Td[2][(s0 >> 8) & 0xff] ^ Td[3][s3 & 0xff] ^ rk[2];
+    uint32_t t3 = Td[0][s3 >> 24] ^ Td[1][(s2 >> 16) & 0xff] ^
+                  Td[2][(s1 >> 8) & 0xff] ^ Td[3][s0 & 0xff] ^ rk[3];
+    s0 = t0;
+    s1 = t1;
+    s2 = t2;
+    s3 = t3;
   }
 
-  /*  if (extra)
-    {
-      memcpy(output, input, extra);
-      state = (state_t*)output;
-      Cipher();
-      } */
+  // Last round has no InvMixColumns
+  rk += 4;
+  Store(output, SubWord(rsbox, s0, s3, s2, s1) ^ rk[0]);
+  Store(output + 4, SubWord(rsbox, s1, s0, s3, s2) ^ rk[1]);
+  Store(output + 8, SubWord(rsbox, s2, s1, s0, s3) ^ rk[2]);
+  Store(output + 12, SubWord(rsbox, s3, s2, s1, s0) ^ rk[3]);
 }
 
-void AES_CBC_decrypt_buffer(uint8_t *output, uint8_t *input, uint32_t length,
-                            const uint8_t *key, const uint8_t *iv) {
-  uintptr_t i;
-  //  uint8_t extra = length % BLOCKLEN; /* Remaining bytes in the last non-full
-  //  block */
-
-  // Skip the key expansion if key is passed as 0
-  if (0 != key) {
-    Key = key;
-    KeyExpansion();
+static void XorBlock(uint8_t *buf, const uint8_t *with) {
+  for (uint8_t i = 0; i < AES_BLOCKLEN; ++i) {
+    buf[i] ^= with[i];
   }
+}
 
-  // If iv is passed as 0, we continue to encrypt without re-setting the Iv
-  if (iv != 0) {
-    Iv = (uint8_t *)iv;
+void AES_CBC_encrypt_buffer_ctx(struct AES_ctx *ctx, uint8_t *output,
+                                const uint8_t *input, uint32_t length,
+                                const uint8_t *iv) {
+  const uint8_t *previous = iv;
+  for (uint32_t i = 0; i < length; i += AES_BLOCKLEN) {
+    uint8_t block[AES_BLOCKLEN];
+    memcpy(block, input + i, AES_BLOCKLEN);
+    XorBlock(block, previous);
+    AES_ECB_encrypt_ctx(ctx, block, output + i);
+    previous = output + i;
   }
+}
 
-  for (i = 0; i < length; i += BLOCKLEN) {
-    memcpy(output, input, BLOCKLEN);
-    state = (state_t *)output;
-    InvCipher();
-    XorWithIv(output);
-    Iv = input;
-    input += BLOCKLEN;
-    output += BLOCKLEN;
+void AES_CBC_decrypt_buffer_ctx(struct AES_ctx *ctx, uint8_t *output,
+                                const uint8_t *input, uint32_t length,
+                                const uint8_t *iv) {
+  uint8_t previous[AES_BLOCKLEN];
+  memcpy(previous, iv, AES_BLOCKLEN);
+  for (uint32_t i = 0; i < length; i += AES_BLOCKLEN) {
+    // Keep the cipher text, output may be the same buffer as input
+    uint8_t block[AES_BLOCKLEN];
+    memcpy(block, input + i, AES_BLOCKLEN);
+    AES_ECB_decrypt_ctx(ctx, block, output + i);
+    XorBlock(output + i, previous);
+    memcpy(previous, block, AES_BLOCKLEN);
   }
-
-  /*  if (extra)
-    {
-      memcpy(output, input, extra);
-      state = (state_t*)output;
-      InvCipher();
-      }*/
 }
 
-#endif // #if defined(CBC) && (CBC == 1)
+#endif // #ifndef ESP_PLATFORM
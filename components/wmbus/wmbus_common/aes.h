@@ -5,43 +5,98 @@
 #define _AES_H_
 
 #include <stdint.h>
+#include <string.h>
 
-// #define the macros below to 1/0 to enable/disable the mode of operation.
+// AES-128 with the key expanded once into a context, so that decrypting many
+// telegrams with the same meter key does not expand the key again. There is
+// no global state, contexts can be used from different threads.
 //
-// CBC enables AES encryption in CBC-mode of operation.
-// ECB enables the basic ECB 16-byte block algorithm. Both can be enabled
-// simultaneously.
-
-// The #ifndef-guard allows it to be configured before #include'ing or at
-// compile time.
-#ifndef CBC
-#define CBC 1
-#endif
+// Backends:
+//   ESP_PLATFORM  mbedTLS, which uses the ESP32 hardware AES accelerator
+//   otherwise     table based software AES (for host builds)
+
+#define AES_BLOCKLEN 16
+#define AES_KEYLEN 16
+
+#ifdef ESP_PLATFORM
+#include "mbedtls/aes.h"
 
-#ifndef ECB
-#define ECB 1
+struct AES_ctx {
+  mbedtls_aes_context enc;
+  mbedtls_aes_context dec;
+};
+#else
+struct AES_ctx {
+  // Round keys, the decryption ones for the equivalent inverse cipher.
+  uint32_t enc[44];
+  uint32_t dec[44];
+};
 #endif
 
-#define AES128 1
-//#define AES192 1
-//#define AES256 1
+void AES_init_ctx(struct AES_ctx *ctx, const uint8_t *key);
+// Releases what the backend holds for an initialized context. Call before
+// initializing it again and before it goes away.
+void AES_free_ctx(struct AES_ctx *ctx);
+
+// Single block, input and output may be the same buffer.
+void AES_ECB_encrypt_ctx(struct AES_ctx *ctx, const uint8_t *input,
+                         uint8_t *output);
+void AES_ECB_decrypt_ctx(struct AES_ctx *ctx, const uint8_t *input,
+                         uint8_t *output);
+
+// Length must be a multiple of AES_BLOCKLEN, iv is left untouched.
+void AES_CBC_encrypt_buffer_ctx(struct AES_ctx *ctx, uint8_t *output,
+                                const uint8_t *input, uint32_t length,
+                                const uint8_t *iv);
+void AES_CBC_decrypt_buffer_ctx(struct AES_ctx *ctx, uint8_t *output,
+                                const uint8_t *input, uint32_t length,
+                                const uint8_t *iv);
+
+// Expanded key kept between uses, for example per meter in MeterKeys. The key
+// is expanded again when it changes. Copies start out empty, since backend
+// contexts are not safe to copy.
+struct AESKeyCache {
+  AESKeyCache() {}
+  AESKeyCache(const AESKeyCache &) {}
+  AESKeyCache &operator=(const AESKeyCache &) {
+    clear();
+    return *this;
+  }
+  ~AESKeyCache() { clear(); }
 
-#if defined(ECB) && (ECB == 1)
+  struct AES_ctx *get(const uint8_t *key) {
+    if (!valid_ || memcmp(key_, key, AES_KEYLEN) != 0) {
+      clear();
+      AES_init_ctx(&ctx_, key);
+      memcpy(key_, key, AES_KEYLEN);
+      valid_ = true;
+    }
+    return &ctx_;
+  }
+
+private:
+  void clear() {
+    if (valid_) {
+      AES_free_ctx(&ctx_);
+      valid_ = false;
+    }
+  }
+
+  bool valid_ = false;
+  uint8_t key_[AES_KEYLEN];
+  struct AES_ctx ctx_;
+};
+
+// The functions below expand the key on every call.
 
 void AES_ECB_encrypt(const uint8_t *input, const uint8_t *key, uint8_t *output,
                      const uint32_t length);
 void AES_ECB_decrypt(const uint8_t *input, const uint8_t *key, uint8_t *output,
                      const uint32_t length);
 
-#endif // #if defined(ECB) && (ECB == !)
-
-#if defined(CBC) && (CBC == 1)
-
 void AES_CBC_encrypt_buffer(uint8_t *output, uint8_t *input, uint32_t length,
                             const uint8_t *key, const uint8_t *iv);
 void AES_CBC_decrypt_buffer(uint8_t *output, uint8_t *input, uint32_t length,
                             const uint8_t *key, const uint8_t *iv);
 
-#endif // #if defined(CBC) && (CBC == 1)
-
 #endif //_AES_H_
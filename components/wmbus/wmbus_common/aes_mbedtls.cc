@@ -0,0 +1,48 @@
+// AES backend on top of mbedTLS, which ESP-IDF builds with the ESP32 hardware
+// AES accelerator. See aes.h.
+
+#include "aes.h"
+
+#ifdef ESP_PLATFORM
+
+void AES_init_ctx(struct AES_ctx *ctx, const uint8_t *key) {
+  mbedtls_aes_init(&ctx->enc);
+  mbedtls_aes_init(&ctx->dec);
+  mbedtls_aes_setkey_enc(&ctx->enc, key, AES_KEYLEN * 8);
+  mbedtls_aes_setkey_dec(&ctx->dec, key, AES_KEYLEN * 8);
+}
+
+void AES_free_ctx(struct AES_ctx *ctx) {
+  mbedtls_aes_free(&ctx->enc);
+  mbedtls_aes_free(&ctx->dec);
+}
+
+void AES_ECB_encrypt_ctx(struct AES_ctx *ctx, const uint8_t *input,
+                         uint8_t *output) {
+  mbedtls_aes_crypt_ecb(&ctx->enc, MBEDTLS_AES_ENCRYPT, input, output);
+}
+
+void AES_ECB_decrypt_ctx(struct AES_ctx *ctx, const uint8_t *input,
+                         uint8_t *output) {
+  mbedtls_aes_crypt_ecb(&ctx->dec, MBEDTLS_AES_DECRYPT, input, output);
+}
+
+void AES_CBC_encrypt_buffer_ctx(struct AES_ctx *ctx, uint8_t *output,
+                                const uint8_t *input, uint32_t length,
+                                const uint8_t *iv) {
+  uint8_t chain[AES_BLOCKLEN];
+  memcpy(chain, iv, AES_BLOCKLEN);
+  mbedtls_aes_crypt_cbc(&ctx->enc, MBEDTLS_AES_ENCRYPT, length, chain, input,
+                        output);
+}
+
+void AES_CBC_decrypt_buffer_ctx(struct AES_ctx *ctx, uint8_t *output,
+                                const uint8_t *input, uint32_t length,
+                                const uint8_t *iv) {
+  uint8_t chain[AES_BLOCKLEN];
+  memcpy(chain, iv, AES_BLOCKLEN);
+  mbedtls_aes_crypt_cbc(&ctx->dec, MBEDTLS_AES_DECRYPT, length, chain, input,
+                        output);
+}
+
+#endif // #ifdef ESP_PLATFORM
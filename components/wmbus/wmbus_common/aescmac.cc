@@ -24,14 +24,14 @@
 uchar vec87[16] = {0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
                    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x87};
 
-void generateSubkeys(uchar *key, uchar *K1, uchar *K2) {
+void generateSubkeys(struct AES_ctx *ctx, uchar *K1, uchar *K2) {
   uchar L[16];
   uchar Z[16];
   uchar tmp[16];
 
   memset(Z, 0, 16);
 
-  AES_ECB_encrypt(Z, key, L, 16);
+  AES_ECB_encrypt_ctx(ctx, Z, L);
 
   if (!(L[0] & 0x80)) {
     shiftLeft(L, K1, 16);
@@ -61,12 +61,19 @@ void pad(uchar *in, uchar *out, int len) {
 }
 
 void AES_CMAC(uchar *key, uchar *input, int len, uchar *mac) {
+  struct AES_ctx ctx;
+  AES_init_ctx(&ctx, key);
+  AES_CMAC(&ctx, input, len, mac);
+  AES_free_ctx(&ctx);
+}
+
+void AES_CMAC(struct AES_ctx *ctx, uchar *input, int len, uchar *mac) {
   bool len_is_multiple_of_block;
   uchar X[16], Y[16];
   uchar K1[16], K2[16];
   uchar M_last[16], padded[16];
 
-  generateSubkeys(key, K1, K2);
+  generateSubkeys(ctx, K1, K2);
 
   int num_blocks = (len + 15) / 16;
 
@@ -88,11 +95,11 @@ void AES_CMAC(uchar *key, uchar *input, int len, uchar *mac) {
 
   for (int i = 0; i < num_blocks - 1; i++) {
     xorit(X, input + (16 * i), Y, 16);
-    AES_ECB_encrypt(Y, key, X, 16);
+    AES_ECB_encrypt_ctx(ctx, Y, X);
   }
 
   xorit(X, M_last, Y, 16);
-  AES_ECB_encrypt(Y, key, X, 16);
+  AES_ECB_encrypt_ctx(ctx, Y, X);
 
   memcpy(mac, X, 16);
 }
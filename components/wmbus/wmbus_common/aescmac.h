@@ -20,6 +20,10 @@
 
 typedef unsigned char uchar;
 
+struct AES_ctx;
+
 void AES_CMAC(uchar *key, uchar *input, int length, uchar *mac);
+// With an already expanded key, see AESKeyCache.
+void AES_CMAC(struct AES_ctx *ctx, uchar *input, int length, uchar *mac);
 
 #endif //_AESCMAC_H_
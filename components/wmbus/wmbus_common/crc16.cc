@@ -0,0 +1,92 @@
+#include "crc16.h"
+
+#include <string.h>
+
+#define CRC16_EN_13757 0x3D65
+
+struct Crc16EN13757Table {
+  uint16_t values[256];
+
+  constexpr Crc16EN13757Table() : values() {
+    for (int b = 0; b < 256; b++) {
+      uint16_t crc = b << 8;
+      for (int i = 0; i < 8; i++)
+        crc = (crc & 0x8000) ? (crc << 1) ^ CRC16_EN_13757 : (crc << 1);
+      values[b] = crc;
+    }
+  }
+};
+
+// One lookup per byte instead of eight shift/xor steps
+static constexpr Crc16EN13757Table crc16_EN13757_table;
+
+uint16_t crc16_EN13757(unsigned char *data, size_t len) {
+  uint16_t crc = 0x0000;
+
+  for (size_t i = 0; i < len; ++i)
+    crc = (crc << 8) ^ crc16_EN13757_table.values[(crc >> 8) ^ data[i]];
+
+  return (~crc);
+}
+
+static bool checkBlockCRC(unsigned char *data, size_t from, size_t to) {
+  uint16_t check_crc = data[to] << 8 | data[to + 1];
+  return crc16_EN13757(data + from, to - from) == check_crc;
+}
+
+size_t stripDLLCRCsFrameFormatA(unsigned char *data, size_t len,
+                                size_t *failed_block, bool verify) {
+  // First block: L C M A (10 bytes) + CRC, then blocks of 16 bytes + CRC,
+  // the last one may be shorter. Up to 2 trailing bytes are ignored.
+  if (len < 12)
+    return 0;
+
+  size_t pos;
+  if (verify && !checkBlockCRC(data, 0, 10)) {
+    *failed_block = 0;
+    return 0;
+  }
+  for (pos = 12; pos + 18 <= len; pos += 18)
+    if (verify && !checkBlockCRC(data, pos, pos + 16)) {
+      *failed_block = pos;
+      return 0;
+    }
+  if (verify && pos + 2 < len && !checkBlockCRC(data, pos, len - 2)) {
+    *failed_block = pos;
+    return 0;
+  }
+
+  // All blocks are valid, so compacting can no longer fail half way
+  size_t out = 10;
+  for (pos = 12; pos + 18 <= len; pos += 18, out += 16)
+    memmove(data + out, data + pos, 16);
+  if (pos + 2 < len) {
+    memmove(data + out, data + pos, len - 2 - pos);
+    out += len - 2 - pos;
+  }
+  return out;
+}
+
+size_t stripDLLCRCsFrameFormatB(unsigned char *data, size_t len,
+                                size_t *failed_block, bool verify) {
+  // Up to 128 bytes are covered by a single CRC, the rest by a second one
+  if (len < 12)
+    return 0;
+
+  size_t crc1_pos = len <= 128 ? len - 2 : 126;
+  size_t crc2_pos = len <= 128 ? 0 : len - 2;
+
+  if (verify && !checkBlockCRC(data, 0, crc1_pos)) {
+    *failed_block = 0;
+    return 0;
+  }
+  if (!crc2_pos)
+    return crc1_pos;
+
+  if (verify && !checkBlockCRC(data, crc1_pos + 2, crc2_pos)) {
+    *failed_block = crc1_pos + 2;
+    return 0;
+  }
+  memmove(data + crc1_pos, data + crc1_pos + 2, crc2_pos - crc1_pos - 2);
+  return crc2_pos - 2;
+}
@@ -0,0 +1,18 @@
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+
+// CRC16 of EN 13757-4 (polynomial 0x3D65) used by wM-Bus DLL blocks.
+// Kept free of other wmbusmeters dependencies, so it can be built on host.
+uint16_t crc16_EN13757(unsigned char *data, size_t len);
+
+// Verify every DLL block CRC of a frame format A or B and, only if all of them
+// match, remove them by compacting the buffer in place. Returns the new length
+// (L-field is not updated), or 0 if a CRC did not match, in which case
+// *failed_block is set to the offset of that block and data is left untouched.
+// With verify false (fuzzing builds) CRCs are removed without checking them.
+size_t stripDLLCRCsFrameFormatA(unsigned char *data, size_t len,
+                                size_t *failed_block, bool verify = true);
+size_t stripDLLCRCsFrameFormatB(unsigned char *data, size_t len,
+                                size_t *failed_block, bool verify = true);
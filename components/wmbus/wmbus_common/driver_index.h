@@ -0,0 +1,115 @@
+#pragma once
+
+#include <algorithm>
+#include <cstdint>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+// Index of drivers by their auto-detection triple (manufacturer, media,
+// version), filled when drivers are registered, so that picking a driver for
+// a telegram does not walk the detection list of every driver.
+// Kept free of other wmbusmeters dependencies, so it can be built on host.
+template <typename Driver> class DriverDetectIndex {
+public:
+  static uint32_t key(uint16_t mfct, uint8_t type, uint8_t version) {
+    // Some weird meters (aptor08 and itronheat) send a mfct where the first
+    // character is lower case, so restrict mfct to the correct range.
+    return (uint32_t)(mfct & 0x7fff) << 16 | (uint32_t)type << 8 | version;
+  }
+
+  void add(uint16_t mfct, uint8_t type, uint8_t version, Driver *driver) {
+    auto &drivers = index_[key(mfct, type, version)];
+    if (std::find(drivers.begin(), drivers.end(), driver) == drivers.end())
+      drivers.push_back(driver);
+  }
+
+  void remove(Driver *driver) {
+    for (auto i = index_.begin(); i != index_.end();) {
+      auto &drivers = i->second;
+      drivers.erase(std::remove(drivers.begin(), drivers.end(), driver),
+                    drivers.end());
+      i = drivers.empty() ? index_.erase(i) : std::next(i);
+    }
+  }
+
+  // Drivers detecting the triple in registration order, empty if none.
+  const std::vector<Driver *> &find(uint16_t mfct, uint8_t type,
+                                    uint8_t version) const {
+    static const std::vector<Driver *> none;
+    auto i = index_.find(key(mfct, type, version));
+    return i == index_.end() ? none : i->second;
+  }
+
+  size_t size() const { return index_.size(); }
+
+private:
+  std::unordered_map<uint32_t, std::vector<Driver *>> index_;
+};
+
+// Open-addressing index of drivers by name and name alias. Names win over
+// aliases of other drivers, otherwise the first registered driver wins, as
+// with the former map lookup followed by the alias scan.
+template <typename Driver> class DriverNameIndex {
+public:
+  void add(const std::string &name, Driver *driver, bool alias) {
+    if ((size_ + 1) * 2 > slots_.size())
+      grow_();
+    auto hash = hash_(name);
+    auto &slot = slots_[probe_(name, hash)];
+    if (slot.driver != nullptr && (alias || !slot.alias))
+      return;
+    size_ += slot.driver == nullptr;
+    slot = {hash, name, driver, alias};
+  }
+
+  void clear() {
+    slots_.clear();
+    size_ = 0;
+  }
+
+  Driver *find(const std::string &name) const {
+    if (slots_.empty())
+      return nullptr;
+    return slots_[probe_(name, hash_(name))].driver;
+  }
+
+  size_t size() const { return size_; }
+
+private:
+  struct Slot {
+    uint32_t hash;
+    std::string name;
+    Driver *driver;
+    bool alias;
+  };
+
+  static uint32_t hash_(const std::string &name) {
+    // FNV-1a
+    uint32_t hash = 2166136261u;
+    for (unsigned char c : name)
+      hash = (hash ^ c) * 16777619u;
+    return hash;
+  }
+
+  // Slot holding name or the empty slot where it belongs, linear probing
+  size_t probe_(const std::string &name, uint32_t hash) const {
+    size_t mask = slots_.size() - 1;
+    size_t i = hash & mask;
+    while (slots_[i].driver != nullptr &&
+           (slots_[i].hash != hash || slots_[i].name != name))
+      i = (i + 1) & mask;
+    return i;
+  }
+
+  void grow_() {
+    std::vector<Slot> old(std::max<size_t>(64, slots_.size() * 2));
+    old.swap(slots_);
+    for (auto &slot : old)
+      if (slot.driver != nullptr)
+        slots_[probe_(slot.name, slot.hash)] = std::move(slot);
+  }
+
+  std::vector<Slot> slots_;
+  size_t size_{0};
+};
@@ -15,6 +15,7 @@
  along with this program.  If not, see <http://www.gnu.org/licenses/>.
 */
 
+#include "driver_index.h"
 #include "meters.h"
 #include "meters_common_implementation.h"
 #include "units.h"
@@ -31,6 +32,8 @@
 
 std::map<std::string, DriverInfo> *registered_drivers_ = NULL;
 std::vector<DriverInfo *> *registered_drivers_list_ = NULL;
+DriverDetectIndex<DriverInfo> *driver_detect_index_ = NULL;
+DriverNameIndex<DriverInfo> *driver_name_index_ = NULL;
 
 void verifyDriverLookupCreated() {
   if (registered_drivers_ == NULL) {
@@ -39,34 +42,41 @@ void verifyDriverLookupCreated() {
   if (registered_drivers_list_ == NULL) {
     registered_drivers_list_ = new std::vector<DriverInfo *>;
   }
+  if (driver_detect_index_ == NULL) {
+    driver_detect_index_ = new DriverDetectIndex<DriverInfo>;
+  }
+  if (driver_name_index_ == NULL) {
+    driver_name_index_ = new DriverNameIndex<DriverInfo>;
+  }
 }
 
-DriverInfo *lookupDriver(std::string name) {
-  verifyDriverLookupCreated();
-
-  // Check if we have a compiled/loaded driver available.
-  if (registered_drivers_->count(name) == 1) {
-    return &(*registered_drivers_)[name];
+void indexDriverNames(DriverInfo *di) {
+  driver_name_index_->add(di->name().str(), di, false);
+  for (DriverName &dn : di->nameAliases()) {
+    driver_name_index_->add(dn.str(), di, true);
   }
+}
 
-  // No, ok lets look for driver aliases.
-  for (DriverInfo *di : *registered_drivers_list_) {
-    for (DriverName &dn : di->nameAliases()) {
-      if (dn.str() == name) {
-        return di;
-      }
-    }
-  }
+DriverInfo *lookupDriver(std::string name) {
+  verifyDriverLookupCreated();
 
-  return NULL;
+  // Driver names and aliases, the handles point into registered_drivers_.
+  return driver_name_index_->find(name);
 }
 
 std::vector<DriverInfo *> &allDrivers() { return *registered_drivers_list_; }
 
+const std::vector<DriverInfo *> &detectingDrivers(int mfct, int media,
+                                                  int version) {
+  verifyDriverLookupCreated();
+  return driver_detect_index_->find(mfct, media, version);
+}
+
 void removeDriver(const std::string &name) {
   for (auto i = registered_drivers_list_->begin();
        i != registered_drivers_list_->end(); i++) {
     if ((*i)->name().str() == name) {
+      driver_detect_index_->remove(*i);
       registered_drivers_list_->erase(i);
       break;
     }
@@ -74,6 +84,12 @@ void removeDriver(const std::string &name) {
 
   registered_drivers_->erase(name);
   assert(registered_drivers_->count(name) == 0);
+
+  // Aliases hidden by the removed driver become visible again.
+  driver_name_index_->clear();
+  for (DriverInfo *di : *registered_drivers_list_) {
+    indexDriverNames(di);
+  }
 }
 
 void addRegisteredDriver(DriverInfo di) {
@@ -84,9 +100,17 @@ void addRegisteredDriver(DriverInfo di) {
     exit(1);
   }
 
-  (*registered_drivers_)[di.name().str()] = di;
-  // The list elements points into the map.
-  (*registered_drivers_list_).push_back(lookupDriver(di.name().str()));
+  // The list elements and name index handles point into the map.
+  DriverInfo *registered = &(*registered_drivers_)[di.name().str()];
+  *registered = di;
+  (*registered_drivers_list_).push_back(registered);
+  indexDriverNames(registered);
+
+  for (auto &dd : registered->detect()) {
+    if (dd.mfct == 0 && dd.type == 0 && dd.version == 0)
+      continue; // Ignore drivers with no detection.
+    driver_detect_index_->add(dd.mfct, dd.type, dd.version, registered);
+  }
 }
 
 bool DriverInfo::detect(uint16_t mfct, uchar type, uchar version) {
@@ -131,13 +155,12 @@ bool forceRegisterDriver(std::function<void(DriverInfo &)> setup) {
 
   // Check that no other driver also triggers on the same detection values.
   for (auto &d : di.detect()) {
-    for (DriverInfo *p : allDrivers()) {
-      bool foo = p->detect(d.mfct, d.type, d.version);
-      if (foo) {
-        error("Internal error: driver %s tried to register the same auto "
-              "detect combo as driver %s alread has taken!\n",
-              di.name().str().c_str(), p->name().str().c_str());
-      }
+    if (d.mfct == 0 && d.type == 0 && d.version == 0)
+      continue; // Ignore drivers with no detection.
+    for (DriverInfo *p : detectingDrivers(d.mfct, d.type, d.version)) {
+      error("Internal error: driver %s tried to register the same auto "
+            "detect combo as driver %s alread has taken!\n",
+            di.name().str().c_str(), p->name().str().c_str());
     }
   }
 
@@ -160,13 +183,12 @@ bool registerDriver(std::function<void(DriverInfo &)> setup) {
 
   // Check that no other driver also triggers on the same detection values.
   for (auto &d : di.detect()) {
-    for (DriverInfo *p : allDrivers()) {
-      bool foo = p->detect(d.mfct, d.type, d.version);
-      if (foo) {
-        error("Internal error: driver %s tried to register the same auto "
-              "detect combo as driver %s alread has taken!\n",
-              di.name().str().c_str(), p->name().str().c_str());
-      }
+    if (d.mfct == 0 && d.type == 0 && d.version == 0)
+      continue; // Ignore drivers with no detection.
+    for (DriverInfo *p : detectingDrivers(d.mfct, d.type, d.version)) {
+      error("Internal error: driver %s tried to register the same auto "
+            "detect combo as driver %s alread has taken!\n",
+            di.name().str().c_str(), p->name().str().c_str());
     }
   }
 
@@ -318,6 +340,7 @@ void MeterCommonImplementation::addNumericFieldWithExtractor(
       NULL,                       /* Formula */
       this                        /* Meter */
       ));
+  internFieldValueIds(&field_infos_.back());
 }
 
 void MeterCommonImplementation::addNumericFieldWithCalculator(
@@ -345,6 +368,7 @@ void MeterCommonImplementation::addNumericFieldWithCalculator(
       f,        /* Formula */
       this      /* Meter */
       ));
+  internFieldValueIds(&field_infos_.back());
 }
 
 void MeterCommonImplementation::addNumericFieldWithCalculatorAndMatcher(
@@ -372,6 +396,7 @@ void MeterCommonImplementation::addNumericFieldWithCalculatorAndMatcher(
       f,                                                  /* Formula */
       this                                                /* Meter */
       ));
+  internFieldValueIds(&field_infos_.back());
 }
 
 void MeterCommonImplementation::addNumericField(
@@ -391,6 +416,7 @@ void MeterCommonImplementation::addNumericField(
       NULL,           /* Formula */
       this            /* Meter */
       ));
+  internFieldValueIds(&field_infos_.back());
 }
 
 void MeterCommonImplementation::addStringFieldWithExtractor(
@@ -404,6 +430,7 @@ void MeterCommonImplementation::addStringFieldWithExtractor(
       NULL,                                               /* Formula */
       this                                                /* Meter */
       ));
+  internFieldValueIds(&field_infos_.back());
 }
 
 void MeterCommonImplementation::addStringFieldWithExtractorAndLookup(
@@ -416,6 +443,7 @@ void MeterCommonImplementation::addStringFieldWithExtractorAndLookup(
       print_properties, NULL, NULL, NULL, NULL, lookup, NULL, /* Formula */
       this                                                    /* Meter */
       ));
+  internFieldValueIds(&field_infos_.back());
 }
 
 void MeterCommonImplementation::addStringField(
@@ -428,6 +456,7 @@ void MeterCommonImplementation::addStringField(
       NULL,                                               /* Formula */
       this                                                /* Meter */
       ));
+  internFieldValueIds(&field_infos_.back());
 }
 
 std::vector<AddressExpression> &
@@ -917,12 +946,11 @@ void MeterCommonImplementation::processFieldCalculators() {
 }
 
 std::string MeterCommonImplementation::getStatusField(FieldInfo *fi) {
-  std::string field_name_no_unit = fi->vname();
-  if (string_values_.count(field_name_no_unit) == 0) {
+  StringField &sf = string_values_[stringValueId(fi)];
+  if (sf.field_info == NULL) {
     return "null"; // This is translated to a real(non-std::string) null in the
                    // json.
   }
-  StringField &sf = string_values_[field_name_no_unit];
   std::string value = sf.value;
 
   // This is >THE< status field, only one is allowed.
@@ -954,18 +982,57 @@ bool MeterCommonImplementation::hasProcessContent() {
   return has_process_content_;
 }
 
+int MeterCommonImplementation::numericValueId(const std::string &vname,
+                                              Unit u) {
+  auto i = numeric_value_ids_.emplace(std::pair<std::string, Unit>(vname, u),
+                                      numeric_values_.size());
+  if (i.second) {
+    numeric_values_.emplace_back();
+  }
+  return i.first->second;
+}
+
+int MeterCommonImplementation::numericValueId(FieldInfo *fi) {
+  if (fi->numericValueId() < 0) {
+    fi->setNumericValueId(numericValueId(fi->vname(), fi->displayUnit()));
+  }
+  return fi->numericValueId();
+}
+
+int MeterCommonImplementation::stringValueId(const std::string &vname) {
+  auto i = string_value_ids_.emplace(vname, string_values_.size());
+  if (i.second) {
+    string_values_.emplace_back();
+  }
+  return i.first->second;
+}
+
+int MeterCommonImplementation::stringValueId(FieldInfo *fi) {
+  if (fi->stringValueId() < 0) {
+    fi->setStringValueId(stringValueId(fi->vname()));
+  }
+  return fi->stringValueId();
+}
+
+void MeterCommonImplementation::internFieldValueIds(FieldInfo *fi) {
+  // The other id is interned on first use, few fields are set both ways.
+  if (fi->xuantity() == Quantity::Text) {
+    stringValueId(fi);
+  } else {
+    numericValueId(fi);
+  }
+}
+
 void MeterCommonImplementation::setNumericValue(FieldInfo *fi, DVEntry *dve,
                                                 Unit u, double v) {
-  std::string field_name_no_unit;
-
   if (dve == NULL) {
-    std::string field_name_no_unit = fi->vname();
-    numeric_values_[std::pair<std::string, Unit>(
-        field_name_no_unit, fi->displayUnit())] = NumericField(u, v, fi);
+    numeric_values_[numericValueId(fi)] = NumericField(u, v, fi);
+  } else if (fi->hasFixedName()) {
+    numeric_values_[numericValueId(fi)] = NumericField(u, v, fi, *dve);
   } else {
-    field_name_no_unit = fi->generateFieldNameNoUnit(this, dve);
-    numeric_values_[std::pair<std::string, Unit>(
-        field_name_no_unit, fi->displayUnit())] = NumericField(u, v, fi, *dve);
+    std::string field_name_no_unit = fi->generateFieldNameNoUnit(this, dve);
+    numeric_values_[numericValueId(field_name_no_unit, fi->displayUnit())] =
+        NumericField(u, v, fi, *dve);
   }
 }
 
@@ -988,46 +1055,42 @@ bool MeterCommonImplementation::hasValue(FieldInfo *fi) {
 }
 
 bool MeterCommonImplementation::hasNumericValue(FieldInfo *fi) {
-  std::pair<std::string, Unit> key(fi->vname(), fi->displayUnit());
-
-  return numeric_values_.count(key) != 0;
+  return numeric_values_[numericValueId(fi)].field_info != NULL;
 }
 
 bool MeterCommonImplementation::hasStringValue(FieldInfo *fi) {
-  return string_values_.count(fi->vname()) != 0;
+  return string_values_[stringValueId(fi)].field_info != NULL;
 }
 
 double MeterCommonImplementation::getNumericValue(FieldInfo *fi, Unit to) {
-  std::string field_name_no_unit = fi->vname();
-  std::pair<std::string, Unit> key(field_name_no_unit, fi->displayUnit());
-  if (numeric_values_.count(key) == 0) {
+  return getNumericValueById(numericValueId(fi), to);
+}
+
+double MeterCommonImplementation::getNumericValue(std::string vname, Unit to) {
+  auto i = numeric_value_ids_.find(std::pair<std::string, Unit>(vname, to));
+  if (i == numeric_value_ids_.end()) {
     return std::numeric_limits<double>::quiet_NaN(); // This is translated into
                                                      // a null in the json.
   }
-  NumericField &nf = numeric_values_[key];
-  return convert(nf.value, nf.unit, to);
+  return getNumericValueById(i->second, to);
 }
 
-double MeterCommonImplementation::getNumericValue(std::string vname, Unit to) {
-  std::pair<std::string, Unit> key(vname, to);
-  if (numeric_values_.count(key) == 0) {
+double MeterCommonImplementation::getNumericValueById(int id, Unit to) {
+  NumericField &nf = numeric_values_[id];
+  if (nf.field_info == NULL) {
     return std::numeric_limits<double>::quiet_NaN(); // This is translated into
                                                      // a null in the json.
   }
-  NumericField &nf = numeric_values_[key];
   return convert(nf.value, nf.unit, to);
 }
 
 void MeterCommonImplementation::setStringValue(FieldInfo *fi, std::string v,
                                                DVEntry *dve) {
-  std::string field_name_no_unit;
-
-  if (dve == NULL) {
-    std::string field_name_no_unit = fi->vname();
-    string_values_[field_name_no_unit] = StringField(v, fi);
+  if (dve == NULL || fi->hasFixedName()) {
+    string_values_[stringValueId(fi)] = StringField(v, fi);
   } else {
-    field_name_no_unit = fi->generateFieldNameNoUnit(this, dve);
-    string_values_[field_name_no_unit] = StringField(v, fi);
+    std::string field_name_no_unit = fi->generateFieldNameNoUnit(this, dve);
+    string_values_[stringValueId(field_name_no_unit)] = StringField(v, fi);
   }
 }
 
@@ -1045,12 +1108,11 @@ void MeterCommonImplementation::setStringValue(std::string vname, std::string v,
 }
 
 std::string MeterCommonImplementation::getStringValue(FieldInfo *fi) {
-  std::string field_name_no_unit = fi->vname();
-  if (string_values_.count(field_name_no_unit) == 0) {
+  StringField &sf = string_values_[stringValueId(fi)];
+  if (sf.field_info == NULL) {
     return "null"; // This is translated to a real(non-std::string) null in the
                    // json.
   }
-  StringField &sf = string_values_[field_name_no_unit];
   std::string value = sf.value;
 
   if (fi->printProperties().hasSTATUS()) {
@@ -1106,17 +1168,21 @@ MeterCommonImplementation::renderJsonOnlyDefaultUnit(std::string vname,
 std::string MeterCommonImplementation::debugValues() {
   std::string s;
 
-  for (auto &p : numeric_values_) {
+  for (auto &p : numeric_value_ids_) {
     std::string vname = p.first.first;
     std::string us = unitToStringLowerCase(p.first.second);
-    NumericField &nf = p.second;
+    NumericField &nf = numeric_values_[p.second];
+    if (nf.field_info == NULL)
+      continue;
 
     s += tostrprintf("%s_%s = %g\n", vname.c_str(), us.c_str(), nf.value);
   }
 
-  for (auto &p : string_values_) {
+  for (auto &p : string_value_ids_) {
     std::string vname = p.first;
-    StringField &nf = p.second;
+    StringField &nf = string_values_[p.second];
+    if (nf.field_info == NULL)
+      continue;
 
     s += tostrprintf("%s = \"%s\"\n", vname.c_str(), nf.value.c_str());
   }
@@ -1144,7 +1210,8 @@ FieldInfo::FieldInfo(
       set_numeric_value_override_(set_numeric_value_override),
       set_string_value_override_(set_string_value_override), lookup_(lookup),
       formula_(formula), field_name_(newStringInterpolator()),
-      valid_field_name_(field_name_->parse(m, vname)) {
+      valid_field_name_(field_name_->parse(m, vname)),
+      fixed_name_(valid_field_name_ && vname.find('{') == std::string::npos) {
   if (!valid_field_name_) {
     warning("(meter) field template \"%s\" could not be parsed!\n",
             vname.c_str());
@@ -1291,9 +1358,11 @@ void MeterCommonImplementation::printMeter(
         founds; // Multiple dventries can match to a single field info.
     std::set<std::string> found_vnames;
 
-    for (auto &p : numeric_values_) {
+    for (auto &p : numeric_value_ids_) {
       std::string vname = p.first.first;
-      NumericField &nf = p.second;
+      NumericField &nf = numeric_values_[p.second];
+      if (nf.field_info == NULL)
+        continue;
       if (nf.field_info->printProperties().hasHIDE())
         continue;
 
@@ -1310,11 +1379,13 @@ void MeterCommonImplementation::printMeter(
       }
     }
 
-    for (auto &p : string_values_) {
+    for (auto &p : string_value_ids_) {
       std::string vname = p.first;
-      StringField &sf = p.second;
+      StringField &sf = string_values_[p.second];
       std::string out;
 
+      if (sf.field_info == NULL)
+        continue;
       if (sf.field_info->printProperties().hasHIDE())
         continue;
       if (sf.field_info->printProperties().hasSTATUS()) {
@@ -1421,20 +1492,16 @@ ELLSecurityMode MeterCommonImplementation::expectedELLSecurityMode() {
 
 void detectMeterDrivers(int manufacturer, int media, int version,
                         std::vector<std::string> *drivers) {
-  for (DriverInfo *p : allDrivers()) {
-    if (p->detect(manufacturer, media, version)) {
-      drivers->push_back(p->name().str());
-    }
+  for (DriverInfo *p : detectingDrivers(manufacturer, media, version)) {
+    drivers->push_back(p->name().str());
   }
 }
 
 bool isMeterDriverValid(DriverName driver_name, int manufacturer, int media,
                         int version) {
-  for (DriverInfo *p : allDrivers()) {
-    if (p->detect(manufacturer, media, version)) {
-      if (p->hasDriverName(driver_name))
-        return true;
-    }
+  for (DriverInfo *p : detectingDrivers(manufacturer, media, version)) {
+    if (p->hasDriverName(driver_name))
+      return true;
   }
 
   return false;
@@ -1467,10 +1534,9 @@ DriverInfo pickMeterDriver(Telegram *t) {
     version = t->tpl_version;
   }
 
-  for (DriverInfo *p : allDrivers()) {
-    if (p->detect(manufacturer, media, version)) {
-      return *p;
-    }
+  auto &drivers = detectingDrivers(manufacturer, media, version);
+  if (!drivers.empty()) {
+    return *drivers.front();
   }
 
   return driver_unknown_;
@@ -236,6 +236,9 @@ bool driverNeedsPolling(DriverName &dn);
 std::string loadDriver(const std::string &file, const char *content);
 
 std::vector<DriverInfo *> &allDrivers();
+// Drivers auto-detecting the given triple, in registration order.
+const std::vector<DriverInfo *> &detectingDrivers(int mfct, int media,
+                                                  int version);
 
 ////////////////////////////////////////////////////////////////////////////////////////////////////////////
 
@@ -354,6 +357,14 @@ struct FieldInfo {
     index_ = -1;
   }
 
+  // The generated field name is always the vname, no {...} in it.
+  bool hasFixedName() { return fixed_name_; }
+  // Ids of the vname value storage in the meter, -1 until interned.
+  int numericValueId() { return numeric_value_id_; }
+  void setNumericValueId(int id) { numeric_value_id_ = id; }
+  int stringValueId() { return string_value_id_; }
+  void setStringValueId(int id) { string_value_id_ = id; }
+
 private:
   int index_;         // The field infos for a meter are ordered.
   std::string vname_; // Value name, like: total current previous target, ie no
@@ -394,6 +405,11 @@ private:
 
   // If the field name template could not be parsed.
   bool valid_field_name_{};
+  bool fixed_name_{};
+
+  // Value storage ids in the meter, see MeterCommonImplementation.
+  int numeric_value_id_ = -1;
+  int string_value_id_ = -1;
 
   // If true then this field was fetched from the library.
   bool from_library_{};
@@ -435,6 +451,10 @@ struct Meter {
                                double v) = 0;
   virtual double getNumericValue(std::string vname, Unit u) = 0;
   virtual double getNumericValue(FieldInfo *fi, Unit u) = 0;
+  // Intern vname+Unit into an id of the value storage, for getting the value
+  // repeatedly without looking up the name.
+  virtual int numericValueId(const std::string &vname, Unit u) = 0;
+  virtual double getNumericValueById(int id, Unit u) = 0;
   virtual void setStringValue(FieldInfo *fi, std::string v, DVEntry *dve) = 0;
   virtual void setStringValue(std::string vname, std::string v,
                               DVEntry *dve = NULL) = 0;
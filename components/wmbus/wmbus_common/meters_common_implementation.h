@@ -22,6 +22,7 @@
 #include "meters.h"
 #include "units.h"
 
+#include <deque>
 #include <map>
 #include <set>
 
@@ -205,6 +206,7 @@ protected:
   void setNumericValue(FieldInfo *fi, DVEntry *dve, Unit u, double v);
   double getNumericValue(std::string vname, Unit u);
   double getNumericValue(FieldInfo *fi, Unit u);
+  double getNumericValueById(int id, Unit u);
   void setStringValue(std::string vname, std::string v, DVEntry *dve = NULL);
   void setStringValue(FieldInfo *fi, std::string v, DVEntry *dve);
   std::string getStringValue(FieldInfo *fi);
@@ -214,6 +216,13 @@ protected:
   bool hasNumericValue(FieldInfo *fi);
   bool hasStringValue(FieldInfo *fi);
 
+  // Intern a field name (+Unit) into an id of the value storage.
+  int numericValueId(const std::string &vname, Unit u);
+  int numericValueId(FieldInfo *fi);
+  int stringValueId(const std::string &vname);
+  int stringValueId(FieldInfo *fi);
+  void internFieldValueIds(FieldInfo *fi);
+
   std::string decodeTPLStatusByte(uchar sts);
 
   bool addOptionalLibraryFields(std::string fields);
@@ -262,10 +271,16 @@ protected:
   std::vector<std::string> selected_fields_;
   // Map difvif key to hex values from telegrams.
   std::map<std::string, std::pair<int, std::string>> hex_values_;
-  // Map field name+Unit to Numeric field which includes the value.
-  std::map<std::pair<std::string, Unit>, NumericField> numeric_values_;
-  // Map field name (at_date) to string value.
-  std::map<std::string, StringField> string_values_;
+  // Values are stored indexed by ids interned from the field name+Unit and
+  // the field name (at_date), when the fields are added or, for names
+  // generated from dventries, when first set. The FieldInfos cache the ids of
+  // their vnames. A value without field_info has not been received. The maps
+  // order the values by name when printing. A deque keeps references to
+  // values valid while new names are interned.
+  std::map<std::pair<std::string, Unit>, int> numeric_value_ids_;
+  std::deque<NumericField> numeric_values_;
+  std::map<std::string, int> string_value_ids_;
+  std::deque<StringField> string_values_;
   // If the telegram ends with 0x1f then set this to true, and the poll
   // code will poll again with 0x7b instead of 0x5b.
   bool more_records_follow_;
@@ -449,37 +449,6 @@ int parseTime(const std::string &s) {
   return n * mul;
 }
 
-#define CRC16_EN_13757 0x3D65
-
-uint16_t crc16_EN13757_per_byte(uint16_t crc, uchar b) {
-  unsigned char i;
-
-  for (i = 0; i < 8; i++) {
-
-    if (((crc & 0x8000) >> 8) ^ (b & 0x80)) {
-      crc = (crc << 1) ^ CRC16_EN_13757;
-    } else {
-      crc = (crc << 1);
-    }
-
-    b <<= 1;
-  }
-
-  return crc;
-}
-
-uint16_t crc16_EN13757(uchar *data, size_t len) {
-  uint16_t crc = 0x0000;
-
-  assert(len == 0 || data != NULL);
-
-  for (size_t i = 0; i < len; ++i) {
-    crc = crc16_EN13757_per_byte(crc, data[i]);
-  }
-
-  return (~crc);
-}
-
 #define CRC16_INIT_VALUE 0xFFFF
 #define CRC16_GOOD_VALUE 0x0F47
 #define CRC16_POLYNOM 0x8408
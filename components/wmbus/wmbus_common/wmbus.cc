@@ -1237,7 +1237,8 @@ bool Telegram::parseELL(std::vector<uchar>::iterator &pos) {
 
     if (ell_sec_mode == ELLSecurityMode::AES_CTR) {
       if (meter_keys) {
-        decrypt_ELL_AES_CTR(this, frame, pos, meter_keys->confidentiality_key);
+        decrypt_ELL_AES_CTR(this, frame, pos, meter_keys->confidentiality_key,
+                            &meter_keys->confidentiality_aes);
         // Actually this ctr decryption always succeeds, if wrong key, it will
         // decrypt to garbage.
       }
@@ -1564,7 +1565,8 @@ bool Telegram::parseTPLConfig(std::vector<uchar>::iterator &pos) {
         debug("(wmbus) no key, thus cannot execute kdf.\n");
         return false;
       }
-      AES_CMAC(safeButUnsafeVectorPtr(meter_keys->confidentiality_key),
+      AES_CMAC(meter_keys->confidentiality_aes.get(
+                   safeButUnsafeVectorPtr(meter_keys->confidentiality_key)),
                safeButUnsafeVectorPtr(input), 16, safeButUnsafeVectorPtr(mac));
       std::string s = bin2hex(mac);
       debug("(wmbus) ephemereal Kenc %s\n", s.c_str());
@@ -1575,7 +1577,8 @@ bool Telegram::parseTPLConfig(std::vector<uchar>::iterator &pos) {
       mac.clear();
       mac.resize(16);
       debugPayload("(wmbus) input to kdf for mac", input);
-      AES_CMAC(safeButUnsafeVectorPtr(meter_keys->confidentiality_key),
+      AES_CMAC(meter_keys->confidentiality_aes.get(
+                   safeButUnsafeVectorPtr(meter_keys->confidentiality_key)),
                safeButUnsafeVectorPtr(input), 16, safeButUnsafeVectorPtr(mac));
       s = bin2hex(mac);
       debug("(wmbus) ephemereal Kmac %s\n", s.c_str());
@@ -1742,7 +1745,7 @@ bool Telegram::potentiallyDecrypt(std::vector<uchar>::iterator &pos) {
 
     bool ok = decrypt_TPL_AES_CBC_IV(
         this, frame, pos, meter_keys->confidentiality_key, &num_encrypted_bytes,
-        &num_not_encrypted_at_end);
+        &num_not_encrypted_at_end, &meter_keys->confidentiality_aes);
     if (!ok) {
       // No key supplied.
       std::string info = bin2hex(pos, frame.end(), num_encrypted_bytes);
@@ -4848,75 +4851,24 @@ bool trimCRCsFrameFormatAInternal(std::vector<uchar> &payload,
     debugPayload("(wmbus) trimming frame A", payload);
   }
 
-  std::vector<uchar> out;
-
-  uint16_t calc_crc = crc16_EN13757(safeButUnsafeVectorPtr(payload), 10);
-  uint16_t check_crc = payload[10] << 8 | payload[11];
-
-  if (calc_crc != check_crc && !FUZZING) {
+  // Compacts in place, payload is left untouched unless all CRCs are ok
+  // (fuzzing builds skip the check, so that any input reaches the parser).
+  size_t failed_block = 0;
+  size_t new_len = stripDLLCRCsFrameFormatA(safeButUnsafeVectorPtr(payload),
+                                            len, &failed_block, !FUZZING);
+  if (!new_len) {
     if (!fail_is_ok) {
-      debug("(wmbus) ff a dll crc first (calculated %04x) did not match "
-            "(expected %04x) for bytes 0-%zu!\n",
-            calc_crc, check_crc, 10);
+      debug("(wmbus) ff a dll crc did not match for block starting at %zu!\n",
+            failed_block);
     }
     return false;
   }
-  out.insert(out.end(), payload.begin(), payload.begin() + 10);
-  if (!fail_is_ok) {
-    debug("(wmbus) ff a dll crc 0-%zu %04x ok\n", 10 - 1, calc_crc);
-  }
-
-  size_t pos = 12;
-  for (pos = 12; pos + 18 <= len; pos += 18) {
-    size_t to = pos + 16;
-    calc_crc = crc16_EN13757(&payload[pos], 16);
-    check_crc = payload[to] << 8 | payload[to + 1];
-    if (calc_crc != check_crc && !FUZZING) {
-      if (!fail_is_ok) {
-        debug("(wmbus) ff a dll crc mid (calculated %04x) did not match "
-              "(expected %04x) for bytes %zu-%zu!\n",
-              calc_crc, check_crc, pos, to - 1);
-      }
-      return false;
-    }
-    out.insert(out.end(), payload.begin() + pos, payload.begin() + pos + 16);
-    if (!fail_is_ok) {
-      debug("(wmbus) ff a dll crc mid %zu-%zu %04x ok\n", pos, to - 1,
-            calc_crc);
-    }
-  }
-
-  if (pos < len - 2) {
-    size_t tto = len - 2;
-    size_t blen = (tto - pos);
-    calc_crc = crc16_EN13757(&payload[pos], blen);
-    check_crc = payload[tto] << 8 | payload[tto + 1];
-    if (calc_crc != check_crc && !FUZZING) {
-      if (!fail_is_ok) {
-        debug("(wmbus) ff a dll crc final (calculated %04x) did not match "
-              "(expected %04x) for bytes %zu-%zu!\n",
-              calc_crc, check_crc, pos, tto - 1);
-      }
-      return false;
-    }
-    out.insert(out.end(), payload.begin() + pos, payload.begin() + tto);
-    if (!fail_is_ok) {
-      debug("(wmbus) ff a dll crc final %zu-%zu %04x ok\n", pos, tto - 1,
-            calc_crc);
-    }
-  }
-
-  debugPayload("(wmbus) trimming frame A", payload);
 
-  out[0] = out.size() - 1;
-  size_t new_len = out[0] + 1;
-  size_t old_size = payload.size();
-  payload = out;
-  size_t new_size = payload.size();
+  payload.resize(new_len);
+  payload[0] = new_len - 1;
 
-  debug("(wmbus) trimmed %zu dll crc bytes from frame a and ignored %zu suffix "
-        "bytes.\n",
-        (len - new_len), (old_size - new_size) - (len - new_len));
+  debug("(wmbus) trimmed %zu dll crc and suffix bytes from frame a.\n",
+        len - new_len);
   debugPayload("(wmbus) trimmed frame A", payload);
 
   return true;
@@ -4936,74 +4888,31 @@ bool trimCRCsFrameFormatBInternal(std::vector<uchar> &payload,
     debugPayload("(wmbus) trimming frame B", payload);
   }
 
-  std::vector<uchar> out;
-  size_t crc1_pos, crc2_pos;
-  if (len <= 128) {
-    crc1_pos = len - 2;
-    crc2_pos = 0;
-  } else {
-    crc1_pos = 126;
-    crc2_pos = len - 2;
-  }
-
-  uint16_t calc_crc = crc16_EN13757(safeButUnsafeVectorPtr(payload), crc1_pos);
-  uint16_t check_crc = payload[crc1_pos] << 8 | payload[crc1_pos + 1];
-
-  if (calc_crc != check_crc && !FUZZING) {
+  // Compacts in place, payload is left untouched unless all CRCs are ok
+  // (fuzzing builds skip the check, so that any input reaches the parser).
+  size_t failed_block = 0;
+  size_t new_len = stripDLLCRCsFrameFormatB(safeButUnsafeVectorPtr(payload),
+                                            len, &failed_block, !FUZZING);
+  if (!new_len) {
     if (!fail_is_ok) {
-      debug("(wmbus) ff b dll crc (calculated %04x) did not match (expected "
-            "%04x) for bytes 0-%zu!\n",
-            calc_crc, check_crc, crc1_pos);
+      debug("(wmbus) ff b dll crc did not match for block starting at %zu!\n",
+            failed_block);
     }
     return false;
   }
 
-  out.insert(out.end(), payload.begin(), payload.begin() + crc1_pos);
-  if (!fail_is_ok) {
-    debug("(wmbus) ff b dll crc first 0-%zu %04x ok\n", crc1_pos, calc_crc);
-  }
-
-  if (crc2_pos > 0) {
-    calc_crc = crc16_EN13757(&payload[crc1_pos + 2], crc2_pos);
-    check_crc = payload[crc2_pos] << 8 | payload[crc2_pos + 1];
-
-    if (calc_crc != check_crc && !FUZZING) {
-      if (!fail_is_ok) {
-        debug("(wmbus) ff b dll crc (calculated %04x) did not match (expected "
-              "%04x) for bytes %zu-%zu!\n",
-              calc_crc, check_crc, crc1_pos + 2, crc2_pos);
-      }
-      return false;
-    }
-
-    out.insert(out.end(), payload.begin() + crc1_pos + 2,
-               payload.begin() + crc2_pos);
-    if (!fail_is_ok) {
-      debug("(wmbus) ff b dll crc final %zu-%zu %04x ok\n", crc1_pos + 2,
-            crc2_pos, calc_crc);
-    }
-  }
-
-  debugPayload("(wmbus) trimming frame B", payload);
-
-  out[0] = out.size() - 1;
-  size_t new_len = out[0] + 1;
-  size_t old_size = payload.size();
-  payload = out;
-  size_t new_size = payload.size();
+  payload.resize(new_len);
+  payload[0] = new_len - 1;
 
-  debug("(wmbus) trimmed %zu dll crc bytes from frame b and ignored %zu suffix "
-        "bytes.\n",
-        (len - new_len), (old_size - new_size) - (len - new_len));
+  debug("(wmbus) trimmed %zu dll crc bytes from frame b.\n", len - new_len);
   debugPayload("(wmbus) trimmed frame B", payload);
 
   return true;
 }
 
-void removeAnyDLLCRCs(std::vector<uchar> &payload) {
-  bool trimmed = trimCRCsFrameFormatAInternal(payload, true);
-  if (!trimmed)
-    trimCRCsFrameFormatBInternal(payload, true);
+bool removeAnyDLLCRCs(std::vector<uchar> &payload) {
+  return trimCRCsFrameFormatAInternal(payload, true) ||
+         trimCRCsFrameFormatBInternal(payload, true);
 }
 
 bool trimCRCsFrameFormatA(std::vector<uchar> &payload) {
@@ -19,6 +19,7 @@
 #define WMBUS_H
 
 #include "address.h"
+#include "aes.h"
 #include "dvparser.h"
 #include "manufacturers.h"
 #include "translatebits.h"
@@ -30,7 +31,8 @@
 
 // Check and remove the data link layer CRCs from a wmbus telegram.
 // If the CRCs do not pass the test, return false.
-void removeAnyDLLCRCs(std::vector<uchar> &payload);
+// Returns false if neither format A nor B CRCs matched
+bool removeAnyDLLCRCs(std::vector<uchar> &payload);
 bool trimCRCsFrameFormatA(std::vector<uchar> &payload);
 bool trimCRCsFrameFormatB(std::vector<uchar> &payload);
 
@@ -269,6 +271,8 @@ int toLen(AFLAuthenticationType aat);
 struct MeterKeys {
   std::vector<uchar> confidentiality_key;
   std::vector<uchar> authentication_key;
+  // Expanded confidentiality_key, reused for every telegram of the meter.
+  AESKeyCache confidentiality_aes;
 
   bool hasConfidentialityKey() { return confidentiality_key.size() > 0; }
   bool hasAuthenticationKey() { return authentication_key.size() > 0; }
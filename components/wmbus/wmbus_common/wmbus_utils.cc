@@ -24,10 +24,15 @@
 
 bool decrypt_ELL_AES_CTR(Telegram *t, std::vector<uchar> &frame,
                          std::vector<uchar>::iterator &pos,
-                         std::vector<uchar> &aeskey) {
+                         std::vector<uchar> &aeskey, AESKeyCache *key_cache) {
   if (aeskey.size() == 0)
     return true;
 
+  AESKeyCache local_key_cache;
+  if (key_cache == NULL)
+    key_cache = &local_key_cache;
+  AES_ctx *ctx = key_cache->get(safeButUnsafeVectorPtr(aeskey));
+
   std::vector<uchar> encrypted_bytes;
   std::vector<uchar> decrypted_bytes;
   encrypted_bytes.insert(encrypted_bytes.end(), pos, frame.end());
@@ -72,7 +77,7 @@ bool decrypt_ELL_AES_CTR(Telegram *t, std::vector<uchar> &frame,
 
     // Generate the pseudo-random bits from the IV and the key.
     uchar xordata[16];
-    AES_ECB_encrypt(iv, safeButUnsafeVectorPtr(aeskey), xordata, 16);
+    AES_ECB_encrypt_ctx(ctx, iv, xordata);
 
     // Xor the data with the pseudo-random bits to decrypt into tmp.
     uchar tmp[block_size];
@@ -111,7 +116,8 @@ bool decrypt_TPL_AES_CBC_IV(Telegram *t, std::vector<uchar> &frame,
                             std::vector<uchar>::iterator &pos,
                             std::vector<uchar> &aeskey,
                             int *num_encrypted_bytes,
-                            int *num_not_encrypted_at_end) {
+                            int *num_not_encrypted_at_end,
+                            AESKeyCache *key_cache) {
   std::vector<uchar> buffer;
   buffer.insert(buffer.end(), pos, frame.end());
 
@@ -199,8 +205,12 @@ bool decrypt_TPL_AES_CBC_IV(Telegram *t, std::vector<uchar> &frame,
   memcpy(buffer_data, safeButUnsafeVectorPtr(buffer), num_bytes_to_decrypt);
   uchar decrypted_data[num_bytes_to_decrypt];
 
-  AES_CBC_decrypt_buffer(decrypted_data, buffer_data, num_bytes_to_decrypt,
-                         safeButUnsafeVectorPtr(aeskey), iv);
+  AESKeyCache local_key_cache;
+  if (key_cache == NULL)
+    key_cache = &local_key_cache;
+  AES_CBC_decrypt_buffer_ctx(key_cache->get(safeButUnsafeVectorPtr(aeskey)),
+                             decrypted_data, buffer_data, num_bytes_to_decrypt,
+                             iv);
 
   // Remove the encrypted bytes.
   frame.erase(pos, frame.end());
@@ -21,14 +21,17 @@
 #include "util.h"
 #include "wmbus.h"
 
+// Pass a key_cache to reuse the expanded aeskey between telegrams.
 bool decrypt_ELL_AES_CTR(Telegram *t, std::vector<uchar> &frame,
                          std::vector<uchar>::iterator &pos,
-                         std::vector<uchar> &aeskey);
+                         std::vector<uchar> &aeskey,
+                         AESKeyCache *key_cache = NULL);
 bool decrypt_TPL_AES_CBC_IV(Telegram *t, std::vector<uchar> &frame,
                             std::vector<uchar>::iterator &pos,
                             std::vector<uchar> &aeskey,
                             int *num_encrypted_bytes,
-                            int *num_not_encrypted_at_end);
+                            int *num_not_encrypted_at_end,
+                            AESKeyCache *key_cache = NULL);
 bool decrypt_TPL_AES_CBC_NO_IV(Telegram *t, std::vector<uchar> &frame,
                                std::vector<uchar>::iterator &pos,
                                std::vector<uchar> &aeskey,
@@ -9,13 +9,19 @@ from esphome.const import (
     CONF_MODE,
 )
 from esphome import automation
+import esphome.final_validate as fv
 from esphome.components.mqtt import (
     MQTT_PUBLISH_ACTION_SCHEMA,
     MQTTPublishAction,
     mqtt_publish_action_to_code,
 )
 
-from ..wmbus_radio import RadioComponent
+from ..wmbus_radio import (
+    CONF_ADDRESS_FILTER,
+    CONF_LISTEN_SCHEDULE,
+    CONF_SLEEP,
+    RadioComponent,
+)
 
 
 def validate_driver(value):
@@ -64,7 +70,7 @@ CONFIG_SCHEMA = cv.Schema(
     {
         cv.GenerateID(): cv.declare_id(Meter),
         cv.GenerateID(CONF_RADIO_ID): cv.use_id(RadioComponent),
-        cv.Optional(CONF_METER_ID, default=""): cv.hex_int,
+        cv.Optional(CONF_METER_ID): cv.hex_int,
         cv.Optional(CONF_TYPE, default="auto"): validate_driver,
         cv.Optional(CONF_KEY): cv.Any(
             cv.All(cv.string_strict, lambda s: s.encode().hex(),
@@ -84,11 +90,37 @@ CONFIG_SCHEMA = cv.Schema(
 ).extend(cv.COMPONENT_SCHEMA)
 
 
+def _final_validate(config):
+    # Frames are shared between radios, so any filtering radio may drop ours
+    radio_configs = fv.full_config.get().get("wmbus_radio", [])
+    if CONF_METER_ID not in config and any(
+        radio_config.get(CONF_ADDRESS_FILTER) for radio_config in radio_configs
+    ):
+        raise cv.Invalid(
+            f"{CONF_METER_ID} is required when a radio has {CONF_ADDRESS_FILTER} enabled"
+        )
+    # Sleeping radio only wakes up for meters it knows
+    if CONF_METER_ID not in config and any(
+        radio_config.get(CONF_LISTEN_SCHEDULE, {}).get(CONF_SLEEP)
+        for radio_config in radio_configs
+    ):
+        raise cv.Invalid(
+            f"{CONF_METER_ID} is required when a radio has {CONF_LISTEN_SCHEDULE} {CONF_SLEEP} enabled"
+        )
+    return config
+
+
+FINAL_VALIDATE_SCHEMA = _final_validate
+
+
 async def to_code(config):
     meter = cg.new_Pvariable(config[CONF_ID])
     cg.add(
         meter.set_meter_params(
-            str('{:08x}'.format(config[CONF_METER_ID])),
+            # Without meter_id the meter handles telegrams from any address
+            '{:08x}'.format(config[CONF_METER_ID])
+            if CONF_METER_ID in config
+            else "*",
             config[CONF_TYPE],
             config.get(CONF_KEY, ""),
             config[CONF_MODE],
@@ -97,6 +129,8 @@ async def to_code(config):
 
     radio = await cg.get_variable(config[CONF_RADIO_ID])
     cg.add(meter.set_radio(radio))
+    if CONF_METER_ID in config:
+        cg.add(radio.add_address_filter_id(config[CONF_METER_ID]))
     await cg.register_component(meter, config)
 
     for conf in config.get(CONF_ON_TELEGRAM, []):
@@ -14,6 +14,8 @@ public:
 
 protected:
   std::string field_name;
+  // Resolved on the first telegram, when the meter has all its fields
+  optional<FieldHandle> field_;
 };
 } // namespace wmbus_meter
 } // namespace esphome
\ No newline at end of file
@@ -5,7 +5,9 @@ namespace wmbus_meter {
 static const char *TAG = "wmbus_meter.sensor";
 
 void Sensor::handle_update() {
-  auto val = this->parent_->get_numeric_field(this->field_name);
+  if (!this->field_.has_value())
+    this->field_ = this->parent_->resolve_numeric_field(this->field_name);
+  auto val = this->parent_->get_numeric_field(*this->field_);
   if (val.has_value())
     this->publish_state(*val);
 }
@@ -1,9 +1,60 @@
 #include "wmbus_meter.h"
 
+#include <cinttypes>
+#include <cmath>
+#include <cstdlib>
+
 namespace esphome {
 namespace wmbus_meter {
 static const char *TAG = "wmbus_meter";
 
+// Frame ids are matched as printed by FrameAddress::to_address (lower case)
+static HeaderAddressMatch to_header_match(const AddressExpression &expression) {
+  HeaderAddressMatch match;
+  match.mfct = expression.mfct;
+  match.version = expression.version;
+  match.type = expression.type;
+  match.filter_out = expression.filter_out;
+  match.required = expression.required;
+
+  size_t digits = 0;
+  bool wildcard = false;
+  for (char c : expression.id) {
+    uint32_t nibble;
+    if (c == '*') {
+      wildcard = true;
+      break;
+    } else if (c >= '0' && c <= '9') {
+      nibble = c - '0';
+    } else if (c >= 'a' && c <= 'f') {
+      nibble = c - 'a' + 10;
+    } else {
+      return match;
+    }
+    if (++digits > 8)
+      return match;
+    match.id = match.id << 4 | nibble;
+  }
+  if (!wildcard && digits != 8)
+    return match;
+
+  if (digits) {
+    auto shift = 4 * (8 - digits);
+    match.id <<= shift;
+    match.id_mask = UINT32_MAX << shift;
+  }
+  match.id_valid = true;
+  return match;
+}
+
+bool HeaderAddressMatch::matches(
+    const wmbus_radio::FrameAddress &address) const {
+  return this->id_valid && (address.id & this->id_mask) == this->id &&
+         (this->mfct == 0xffff || this->mfct == address.manufacturer) &&
+         (this->version == 0xff || this->version == address.version) &&
+         (this->type == 0xff || this->type == address.type);
+}
+
 void Meter::set_meter_params(std::string id, std::string driver,
                              std::string key,
                              std::initializer_list<LinkMode> linkModes) {
@@ -17,8 +68,26 @@ void Meter::set_meter_params(std::string id, std::string driver,
 }
 void Meter::set_radio(wmbus_radio::Radio *radio) {
   this->radio = radio;
-  radio->add_frame_handler(
-      [this](wmbus_radio::Frame *frame) { return this->handle_frame(frame); });
+  auto handler = [this](wmbus_radio::Frame *frame) {
+    return this->handle_frame(frame);
+  };
+
+  auto expressions = this->meter->addressExpressions();
+  for (auto &expression : expressions)
+    this->header_matches_.push_back(to_header_match(expression));
+
+  // Let radio route frames by address, unless meter listens to any address
+  if (expressions.size() == 1) {
+    auto &expression = expressions[0];
+    char *end;
+    uint32_t id = std::strtoul(expression.id.c_str(), &end, 16);
+    if (!expression.has_wildcard && !expression.filter_out &&
+        expression.id.size() == 8 && *end == '\0') {
+      radio->add_frame_handler(id, expression.mfct, std::move(handler));
+      return;
+    }
+  }
+  radio->add_frame_handler(std::move(handler));
 }
 void Meter::dump_config() {
   std::string id = this->get_id();
@@ -45,7 +114,43 @@ std::string Meter::get_key() {
                                        : "not-encrypted";
 }
 
+// Same rules as doesTelegramMatchExpressions
+bool Meter::matches_header_(const wmbus_radio::FrameHeader &header) {
+  bool match = false;
+  bool filtered_out = false;
+  bool required_found = false;
+  bool required_failed = true;
+
+  for (size_t i = 0; i < header.addresses_count; i++) {
+    bool found_match = false;
+    bool found_negative_match = false;
+    for (auto &expression : this->header_matches_) {
+      if (expression.required)
+        required_found = true;
+      if (!expression.matches(header.addresses[i]))
+        continue;
+      if (expression.filter_out)
+        found_negative_match = true;
+      else if (expression.required)
+        required_failed = false;
+      else
+        found_match = true;
+    }
+    if (found_negative_match)
+      filtered_out = true;
+    else if (found_match)
+      match = true;
+  }
+
+  return match && !filtered_out && !(required_found && required_failed);
+}
+
 void Meter::handle_frame(wmbus_radio::Frame *frame) {
+  // Skip telegrams of other meters before any payload parsing or decryption
+  auto &header = frame->header();
+  if (header.complete && !this->matches_header_(header))
+    return;
+
   if (!this->link_modes_.has(frame->link_mode())) {
     ESP_LOGW(TAG, "Frame link mode %s not supported by meter %s",
              toString(frame->link_mode()), this->meter->name().c_str());
@@ -63,9 +168,23 @@ void Meter::handle_frame(wmbus_radio::Frame *frame) {
                               telegram.get());
 
   if (id_match) {
+    this->wakeup_us_ = frame->timestamps().wakeup_us;
+    this->handled_us_ = micros();
+    this->radio->latency(wmbus_radio::LatencyStage::HANDLE)
+        .record(this->handled_us_ - frame->timestamps().dequeue_us);
+
+    if (this->transmission_interval_.record(millis()) &&
+        this->transmission_interval_.learned())
+      ESP_LOGD(TAG, "Meter %s transmits every %" PRIu32 " ms (%" PRIu32
+                    " telegrams missed)",
+               this->meter->name().c_str(),
+               this->transmission_interval_.interval_ms(),
+               this->transmission_interval_.missed());
+
     this->last_telegram = std::move(telegram);
     this->defer([this]() {
       this->on_telegram_callback_manager();
+      this->record_publish_latency_();
       this->last_telegram = nullptr;
     });
 
@@ -81,38 +200,102 @@ std::string Meter::as_json(bool pretty_print) {
 }
 
 optional<std::string> Meter::get_string_field(std::string field_name) {
+  return this->get_string_field(this->resolve_string_field(field_name));
+}
 
-  if (field_name == "timestamp")
-    return this->meter->datetimeOfUpdateHumanReadable();
+optional<float> Meter::get_numeric_field(std::string field_name) {
+  return this->get_numeric_field(this->resolve_numeric_field(field_name));
+}
 
-  if (field_name == "timestamp_zulu")
-    return this->meter->datetimeOfUpdateRobot();
+FieldHandle Meter::resolve_string_field(const std::string &field_name) {
+  FieldHandle field;
 
-  auto field_info = this->meter->findFieldInfo(field_name, Quantity::Text);
-  if (field_info)
-    return this->meter->getStringValue(field_info);
+  if (field_name == "timestamp") {
+    field.source = FieldSource::TIMESTAMP;
+  } else if (field_name == "timestamp_zulu") {
+    field.source = FieldSource::TIMESTAMP_ZULU;
+  } else {
+    field.field_info = this->meter->findFieldInfo(field_name, Quantity::Text);
+    if (field.field_info)
+      field.source = FieldSource::VALUE;
+  }
 
-  return {};
+  return field;
 }
 
-optional<float> Meter::get_numeric_field(std::string field_name) {
+FieldHandle Meter::resolve_numeric_field(const std::string &field_name) {
+  FieldHandle field;
+
   // RSSI is not handled by meter but by telegram :/
-  if (field_name == "rssi_dbm")
-    return this->last_telegram->about.rssi_dbm;
+  if (field_name == "rssi_dbm") {
+    field.source = FieldSource::RSSI;
+  } else if (field_name == "timestamp") {
+    field.source = FieldSource::TIMESTAMP;
+  } else if (field_name == "transmission_interval_s") {
+    field.source = FieldSource::TRANSMISSION_INTERVAL;
+  } else if (field_name == "capture_rate_pct") {
+    field.source = FieldSource::CAPTURE_RATE;
+  } else {
+    // Values of fields named after dventries (total_at_month_2) only get
+    // stored later, so intern the name instead of looking up a FieldInfo
+    std::string name;
+    extractUnit(field_name, &name, &field.unit);
+    field.source = FieldSource::VALUE;
+    field.value_id = this->meter->numericValueId(name, field.unit);
+  }
 
-  if (field_name == "timestamp")
-    return this->meter->timestampLastUpdate();
+  return field;
+}
 
-  std::string name;
-  Unit unit;
-  extractUnit(field_name, &name, &unit);
+optional<std::string> Meter::get_string_field(const FieldHandle &field) {
+  switch (field.source) {
+  case FieldSource::TIMESTAMP:
+    return this->meter->datetimeOfUpdateHumanReadable();
+  case FieldSource::TIMESTAMP_ZULU:
+    return this->meter->datetimeOfUpdateRobot();
+  case FieldSource::VALUE:
+    return this->meter->getStringValue(field.field_info);
+  default:
+    return {};
+  }
+}
 
-  auto value = this->meter->getNumericValue(name, unit);
+optional<float> Meter::get_numeric_field(const FieldHandle &field) {
+  // Learned from arrival times of telegrams, not sent by meter
+  auto &interval = this->transmission_interval_;
 
-  if (!std::isnan(value))
-    return value;
+  switch (field.source) {
+  case FieldSource::RSSI:
+    return this->last_telegram->about.rssi_dbm;
+  case FieldSource::TIMESTAMP:
+    return this->meter->timestampLastUpdate();
+  case FieldSource::TRANSMISSION_INTERVAL:
+    if (!interval.learned())
+      return {};
+    return interval.interval_ms() / 1000.0f;
+  case FieldSource::CAPTURE_RATE: {
+    auto expected = interval.captured() + interval.missed();
+    if (!expected)
+      return {};
+    return interval.captured() * 100.0f / expected;
+  }
+  case FieldSource::VALUE: {
+    auto value = this->meter->getNumericValueById(field.value_id, field.unit);
+    if (!std::isnan(value))
+      return value;
+    return {};
+  }
+  default:
+    return {};
+  }
+}
 
-  return {};
+void Meter::record_publish_latency_() {
+  auto now = micros();
+  this->radio->latency(wmbus_radio::LatencyStage::PUBLISH)
+      .record(now - this->handled_us_);
+  this->radio->latency(wmbus_radio::LatencyStage::TOTAL)
+      .record(now - this->wakeup_us_);
 }
 
 void Meter::on_telegram(std::function<void()> &&callback) {
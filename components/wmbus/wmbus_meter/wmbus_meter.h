@@ -6,9 +6,48 @@
 
 #include "esphome/components/wmbus/wmbus_common/meters.h"
 #include "esphome/components/wmbus_radio/component.h"
+#include "esphome/components/wmbus_radio/transmission_interval.h"
 
 namespace esphome {
 namespace wmbus_meter {
+enum class FieldSource : uint8_t {
+  NONE,
+  VALUE,
+  RSSI,
+  TIMESTAMP,
+  TIMESTAMP_ZULU,
+  TRANSMISSION_INTERVAL,
+  CAPTURE_RATE,
+};
+
+// Field name of a sensor resolved once, so that publishing values of each
+// telegram does not parse the name and look it up again
+struct FieldHandle {
+  FieldSource source{FieldSource::NONE};
+  // Numeric fields: value id and unit in the meter
+  int value_id{-1};
+  Unit unit{};
+  // Text fields
+  FieldInfo *field_info{nullptr};
+};
+
+// Address expression of the meter in numeric form, so that frame headers can
+// be matched without building wmbusmeters addresses
+struct HeaderAddressMatch {
+  uint32_t id{0};
+  // Id digits given before a wildcard
+  uint32_t id_mask{0};
+  // False if no frame id can match (mbus primary or upper case ids)
+  bool id_valid{false};
+  uint16_t mfct{0xffff};
+  uint8_t version{0xff};
+  uint8_t type{0xff};
+  bool filter_out{false};
+  bool required{false};
+
+  bool matches(const wmbus_radio::FrameAddress &address) const;
+};
+
 class Meter : public Component {
 public:
   void set_meter_params(std::string id, std::string driver, std::string key,
@@ -26,6 +65,16 @@ public:
   optional<std::string> get_string_field(std::string field_name);
   optional<float> get_numeric_field(std::string field_name);
 
+  FieldHandle resolve_string_field(const std::string &field_name);
+  FieldHandle resolve_numeric_field(const std::string &field_name);
+  optional<std::string> get_string_field(const FieldHandle &field);
+  optional<float> get_numeric_field(const FieldHandle &field);
+
+  // Inter-arrival statistics of telegrams handled by this meter
+  const wmbus_radio::TransmissionInterval &transmission_interval() const {
+    return this->transmission_interval_;
+  }
+
 protected:
   LinkModeSet link_modes_;
   time::RealTimeClock *rtc;
@@ -36,6 +85,16 @@ protected:
 
   CallbackManager<void()> on_telegram_callback_manager;
 
+  // micros() of the last handled frame, for latency statistics
+  uint32_t wakeup_us_{0};
+  uint32_t handled_us_{0};
+  wmbus_radio::TransmissionInterval transmission_interval_;
+
+  std::vector<HeaderAddressMatch> header_matches_;
+
+  // Once all sensors published values of the last telegram
+  void record_publish_latency_();
+  bool matches_header_(const wmbus_radio::FrameHeader &header);
   void handle_frame(wmbus_radio::Frame *frame);
 };
 } // namespace wmbus_meter
@@ -1,7 +1,9 @@
 import esphome.config_validation as cv
 import esphome.codegen as cg
+import esphome.final_validate as fv
 from esphome.components import spi
-from esphome import pins
+from esphome import automation, pins
+from esphome.core import CORE, ID
 from esphome.const import (
     CONF_RESET_PIN,
     CONF_FREQUENCY,
@@ -14,16 +16,75 @@ MULTI_CONF = True
 wmbus_radio_ns = cg.esphome_ns.namespace("wmbus_radio")
 RadioComponent = wmbus_radio_ns.class_("Radio", cg.Component, spi.SPIDevice)
 Radio = RadioComponent
+Dispatcher = wmbus_radio_ns.class_("Dispatcher")
+QueueOverflowPolicy = wmbus_radio_ns.enum("QueueOverflowPolicy", is_class=True)
+DumpLatencyAction = wmbus_radio_ns.class_(
+    "DumpLatencyAction", automation.Action, cg.Parented.template(RadioComponent)
+)
 
 # Configuration keys
 CONF_RADIO_TYPE = "radio_type"
 CONF_GDO0_PIN = "gdo0_pin"
 CONF_GDO2_PIN = "gdo2_pin"
 CONF_IRQ_PIN = "irq_pin"
+CONF_FIFO_LEVEL_INTERRUPT = "fifo_level_interrupt"
+CONF_QUEUE_SIZE = "queue_size"
+CONF_QUEUE_OVERFLOW_POLICY = "queue_overflow_policy"
+CONF_DISPATCH_TIME_BUDGET = "dispatch_time_budget"
+CONF_ADDRESS_FILTER = "address_filter"
+CONF_DUPLICATE_FILTER_TTL = "duplicate_filter_ttl"
+CONF_DUPLICATE_FILTER_SIZE = "duplicate_filter_size"
+CONF_RECEIVER_TASK = "receiver_task"
+CONF_CORE = "core"
+CONF_PRIORITY = "priority"
+CONF_STACK_SIZE = "stack_size"
+CONF_LISTEN_SCHEDULE = "listen_schedule"
+CONF_LEARN_INTERVALS = "learn_intervals"
+CONF_GUARD_TIME = "guard_time"
+CONF_SLEEP = "sleep"
 
 # Supported radio types
 RADIO_TYPES = ["SX1276", "CC1101"]
 
+QUEUE_OVERFLOW_POLICIES = {
+    "DROP_NEWEST": QueueOverflowPolicy.DROP_NEWEST,
+    "DROP_OLDEST": QueueOverflowPolicy.DROP_OLDEST,
+}
+
+# Values of TASK_CORE_ANY and TASK_CORE_AUTO
+TASK_CORES = {"ANY": -1, "AUTO": -2}
+
+RECEIVER_TASK_SCHEMA = cv.Schema(
+    {
+        # AUTO pins the task to the core not running WiFi
+        cv.Optional(CONF_CORE, default="AUTO"): cv.Any(
+            cv.enum(TASK_CORES, upper=True), cv.int_range(min=0, max=1)
+        ),
+        # Above main loop (1), below WiFi (23) and other system tasks
+        cv.Optional(CONF_PRIORITY, default=2): cv.int_range(min=1, max=22),
+        cv.Optional(CONF_STACK_SIZE, default=3 * 1024): cv.int_range(
+            min=2 * 1024, max=16 * 1024
+        ),
+    }
+)
+
+FREQUENCY_SCHEMA = cv.float_range(min=300.0, max=928.0)
+
+LISTEN_SCHEDULE_SCHEMA = cv.Schema(
+    {
+        # Learn transmission intervals of meters heard, for capture statistics
+        cv.Optional(CONF_LEARN_INTERVALS, default=True): cv.boolean,
+        # Radio only listens within windows once all meters are predictable
+        cv.Optional(CONF_SLEEP, default=False): cv.boolean,
+        cv.Optional(
+            CONF_GUARD_TIME, default="500ms"
+        ): cv.positive_time_period_milliseconds,
+    }
+)
+
+# All radios feed one dispatcher shared via CORE.data
+DATA_DISPATCHER = "wmbus_radio_dispatcher"
+
 def validate_radio_config(config):
     """Validate radio-specific configuration"""
     radio_type = config[CONF_RADIO_TYPE]
@@ -45,6 +106,14 @@ def validate_radio_config(config):
         # GDO pins not used for SX1276
         if CONF_GDO0_PIN in config or CONF_GDO2_PIN in config:
             raise cv.Invalid("gdo0_pin and gdo2_pin are not supported for SX1276, use irq_pin instead")
+
+    if config[CONF_FIFO_LEVEL_INTERRUPT] and radio_type != "SX1276":
+        raise cv.Invalid("fifo_level_interrupt is only supported for SX1276")
+
+    schedule = config.get(CONF_LISTEN_SCHEDULE)
+    if schedule is not None:
+        if schedule[CONF_SLEEP] and not schedule[CONF_LEARN_INTERVALS]:
+            raise cv.Invalid("listen_schedule sleep requires learn_intervals")
     
     return config
 
@@ -53,7 +122,8 @@ CONFIG_SCHEMA = cv.All(
         cv.GenerateID(): cv.declare_id(RadioComponent),
         cv.Required(CONF_RADIO_TYPE): cv.one_of(*RADIO_TYPES, upper=True),
         cv.Optional(CONF_RESET_PIN): pins.gpio_output_pin_schema,
-        cv.Optional(CONF_FREQUENCY, default=868.95): cv.float_range(min=300.0, max=928.0),
+        cv.Optional(CONF_FREQUENCY, default=868.95): FREQUENCY_SCHEMA,
+        cv.Optional(CONF_LISTEN_SCHEDULE): LISTEN_SCHEDULE_SCHEMA,
         
         # CC1101 specific pins
         cv.Optional(CONF_GDO0_PIN): pins.gpio_input_pin_schema,
@@ -61,13 +131,59 @@ CONFIG_SCHEMA = cv.All(
         
         # SX1276 specific pins
         cv.Optional(CONF_IRQ_PIN): pins.gpio_input_pin_schema,
+        cv.Optional(CONF_FIFO_LEVEL_INTERRUPT, default=False): cv.boolean,
+
+        # Receive queue between receiver task and main loop
+        cv.Optional(CONF_QUEUE_SIZE, default=3): cv.int_range(min=1, max=64),
+        cv.Optional(CONF_QUEUE_OVERFLOW_POLICY, default="DROP_NEWEST"): cv.enum(
+            QUEUE_OVERFLOW_POLICIES, upper=True, space="_"
+        ),
+        # Zero dispatches a single packet per main loop pass
+        cv.Optional(CONF_DISPATCH_TIME_BUDGET, default="0ms"): cv.All(
+            cv.positive_time_period_microseconds,
+            cv.Range(max=cv.TimePeriod(milliseconds=30)),
+        ),
+        # Discard frames of meters without wmbus_meter already in receiver task
+        cv.Optional(CONF_ADDRESS_FILTER, default=False): cv.boolean,
+        # Zero disables dropping of repeated frames
+        cv.Optional(CONF_DUPLICATE_FILTER_TTL, default="0s"): cv.All(
+            cv.positive_time_period_milliseconds,
+            cv.Range(max=cv.TimePeriod(minutes=10)),
+        ),
+        cv.Optional(CONF_DUPLICATE_FILTER_SIZE, default=16): cv.int_range(
+            min=1, max=256
+        ),
+        cv.Optional(CONF_RECEIVER_TASK, default={}): RECEIVER_TASK_SCHEMA,
         
     }).extend(cv.COMPONENT_SCHEMA).extend(spi.spi_device_schema()),
     validate_radio_config
 )
 
+
+def _final_validate(config):
+    # Duplicate filter belongs to the shared dispatcher
+    for other in fv.full_config.get().get("wmbus_radio", []):
+        for key in (CONF_DUPLICATE_FILTER_TTL, CONF_DUPLICATE_FILTER_SIZE):
+            if other[key] != config[key]:
+                raise cv.Invalid(f"{key} must be the same for all radios")
+    return config
+
+
+FINAL_VALIDATE_SCHEMA = _final_validate
+
+
+def _get_dispatcher():
+    if DATA_DISPATCHER not in CORE.data:
+        CORE.data[DATA_DISPATCHER] = cg.new_Pvariable(
+            ID(DATA_DISPATCHER, is_declaration=True, type=Dispatcher)
+        )
+    return CORE.data[DATA_DISPATCHER]
+
+
 async def to_code(config):
     var = cg.new_Pvariable(config[CONF_ID])
+    # Before anything that may await, meters register handlers through it
+    cg.add(var.set_dispatcher(_get_dispatcher()))
     await cg.register_component(var, config)
     await spi.register_spi_device(var, config)
 
@@ -81,6 +197,32 @@ async def to_code(config):
     
     # Set frequency
     cg.add(var.set_frequency(config[CONF_FREQUENCY]))
+    if CONF_LISTEN_SCHEDULE in config:
+        schedule = config[CONF_LISTEN_SCHEDULE]
+        cg.add(var.set_listen_learning(schedule[CONF_LEARN_INTERVALS]))
+        cg.add(var.set_listen_sleep(schedule[CONF_SLEEP]))
+        cg.add(
+            var.set_listen_guard_time(schedule[CONF_GUARD_TIME].total_milliseconds)
+        )
+
+    cg.add(var.set_queue_size(config[CONF_QUEUE_SIZE]))
+    cg.add(var.set_queue_overflow_policy(config[CONF_QUEUE_OVERFLOW_POLICY]))
+    cg.add(
+        var.set_dispatch_time_budget(
+            config[CONF_DISPATCH_TIME_BUDGET].total_microseconds
+        )
+    )
+    cg.add(var.set_address_filter(config[CONF_ADDRESS_FILTER]))
+    task_config = config[CONF_RECEIVER_TASK]
+    cg.add(var.set_task_core(task_config[CONF_CORE]))
+    cg.add(var.set_task_priority(task_config[CONF_PRIORITY]))
+    cg.add(var.set_task_stack_size(task_config[CONF_STACK_SIZE]))
+    cg.add(
+        var.set_duplicate_filter(
+            config[CONF_DUPLICATE_FILTER_SIZE],
+            config[CONF_DUPLICATE_FILTER_TTL].total_milliseconds,
+        )
+    )
     
     # Configure radio-specific pins
     if config[CONF_RADIO_TYPE] == "CC1101":
@@ -95,3 +237,18 @@ async def to_code(config):
         if CONF_IRQ_PIN in config:
             irq_pin = await cg.gpio_pin_expression(config[CONF_IRQ_PIN])
             cg.add(var.set_irq_pin(irq_pin))
+            if config[CONF_FIFO_LEVEL_INTERRUPT]:
+                # DIO1 signals FIFO level, so it also wakes the receiver task
+                cg.add(var.set_fifo_level_mode(True))
+                cg.add(var.set_data_pin(irq_pin))
+
+
+@automation.register_action(
+    "wmbus_radio.dump_latency",
+    DumpLatencyAction,
+    automation.maybe_simple_id({cv.GenerateID(): cv.use_id(RadioComponent)}),
+)
+async def dump_latency_to_code(config, action_id, template_arg, args):
+    var = cg.new_Pvariable(action_id, template_arg)
+    await cg.register_parented(var, config[CONF_ID])
+    return var
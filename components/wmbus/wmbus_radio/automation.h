@@ -17,5 +17,11 @@ public:
   }
 };
 
+template <typename... Ts>
+class DumpLatencyAction : public Action<Ts...>, public Parented<Radio> {
+public:
+  void play(Ts... x) override { this->parent_->dump_latency(); }
+};
+
 } // namespace wmbus_radio
 } // namespace esphome
\ No newline at end of file
@@ -2,9 +2,14 @@
 #include "transceiver_cc1101.h"
 #include "transceiver_sx1276.h"
 
+#include <algorithm>
+#include <cinttypes>
+
 #include "freertos/queue.h"
 #include "freertos/task.h"
 
+#include "sdkconfig.h"
+
 #define ASSERT(expr, expected, before_exit)                                    \
   {                                                                            \
     auto result = (expr);                                                      \
@@ -20,6 +25,10 @@
 namespace esphome {
 namespace wmbus_radio {
 static const char *TAG = "wmbus";
+// Multiple of 3 coded bytes, so T1 symbol groups are never split
+static const size_t RX_CHUNK_SIZE = 24;
+// Packets held beyond the queue: one being received, one being dispatched
+static const size_t PACKETS_IN_FLIGHT = 2;
 
 void Radio::set_radio_type(const std::string &radio_type) {
   if (this->radio != nullptr) {
@@ -38,7 +47,7 @@ void Radio::set_radio_type(const std::string &radio_type) {
 
 void Radio::set_reset_pin(GPIOPin *pin) {
   if (this->radio != nullptr)
-    this->radio->set_reset_pin(pin);
+    this->radio->set_reset_pin(static_cast<InternalGPIOPin *>(pin));
 }
 
 void Radio::set_data_pin(GPIOPin *pin) {
@@ -53,7 +62,7 @@ void Radio::set_sync_pin(GPIOPin *pin) {
 
 void Radio::set_irq_pin(GPIOPin *pin) {
   if (this->radio != nullptr)
-    this->radio->set_irq_pin(pin);
+    this->radio->set_irq_pin(static_cast<InternalGPIOPin *>(pin));
 }
 
 void Radio::set_frequency(float frequency) {
@@ -61,97 +70,311 @@ void Radio::set_frequency(float frequency) {
     this->radio->set_frequency(frequency);
 }
 
+void Radio::set_fifo_level_mode(bool enabled) {
+  if (this->radio != nullptr)
+    this->radio->set_fifo_level_mode(enabled);
+}
+
 void Radio::setup() {
-  ASSERT_SETUP(this->packet_queue_ = xQueueCreate(3, sizeof(Packet *)));
+  this->dispatcher_->setup();
+  if (this->listen_scheduler_.sleep())
+    for (auto id : this->dispatcher_->configured_meter_ids())
+      this->listen_scheduler_.add_meter(id);
+  ASSERT_SETUP(
+      this->packet_pool_.setup(this->queue_size_ + PACKETS_IN_FLIGHT));
+  ASSERT_SETUP(this->packet_queue_ =
+                   xQueueCreate(this->queue_size_, sizeof(Packet *)));
 
-  ASSERT_SETUP(xTaskCreate((TaskFunction_t)this->receiver_task, "radio_recv",
-                           3 * 1024, this, 2, &(this->receiver_task_handle_)));
+  ASSERT_SETUP(xTaskCreatePinnedToCore(
+      (TaskFunction_t)this->receiver_task, "radio_recv",
+      this->task_stack_size_, this, this->task_priority_,
+      &(this->receiver_task_handle_), this->resolved_task_core_()));
 
   ESP_LOGI(TAG, "Receiver task created [%p]", this->receiver_task_handle_);
 
   if (this->radio != nullptr) {
     this->radio->setup();
     this->radio->attach_data_interrupt(Radio::wakeup_receiver_task_from_isr,
-                                       &(this->receiver_task_handle_));
+                                       this);
   }
 }
 
+BaseType_t Radio::resolved_task_core_() const {
+#if portNUM_PROCESSORS > 1
+  if (this->task_core_ == TASK_CORE_AUTO) {
+    // Keep FIFO reads away from WiFi task, which preempts anything below it
+#if defined(CONFIG_ESP_WIFI_TASK_PINNED_TO_CORE_1) ||                          \
+    defined(CONFIG_ESP32_WIFI_TASK_PINNED_TO_CORE_1)
+    return 0;
+#else
+    return 1;
+#endif
+  }
+  if (this->task_core_ >= 0 && this->task_core_ < portNUM_PROCESSORS)
+    return this->task_core_;
+#endif
+  return tskNO_AFFINITY;
+}
+
+uint32_t Radio::task_stack_high_water_mark() const {
+  if (this->receiver_task_handle_ == nullptr)
+    return 0;
+  // ESP-IDF counts stack in bytes, not words
+  return uxTaskGetStackHighWaterMark(this->receiver_task_handle_);
+}
+
 void Radio::loop() {
+  // Without budget exactly one packet is dispatched per loop pass
+  const uint32_t start = micros();
+  uint32_t elapsed = 0;
+  size_t batch_size = 0;
+
+  while (this->dispatch_packet_()) {
+    batch_size++;
+    elapsed = micros() - start;
+    if (elapsed >= this->dispatch_time_budget_us_)
+      break;
+  }
+
+  if (!batch_size)
+    return;
+
+  this->dispatch_last_batch_size_ = batch_size;
+  this->dispatch_last_time_us_ = elapsed;
+  if (batch_size > this->dispatch_max_batch_size_)
+    this->dispatch_max_batch_size_ = batch_size;
+  if (elapsed > this->dispatch_max_time_us_)
+    this->dispatch_max_time_us_ = elapsed;
+}
+
+bool Radio::dispatch_packet_() {
   Packet *p;
   if (xQueueReceive(this->packet_queue_, &p, 0) != pdPASS)
-    return;
+    return false;
 
-  auto frame = p->convert_to_frame();
+  auto &timestamps = p->timestamps();
+  timestamps.dequeue_us = micros();
+  this->latency(LatencyStage::QUEUE)
+      .record(timestamps.dequeue_us - timestamps.enqueue_us);
 
-  if (!frame)
-    return;
+  auto frame = p->convert_to_frame(&this->link_statistics_);
 
-  ESP_LOGI(TAG, "Have data from radio (%zu bytes) [RSSI: %ddBm, mode: %s]",
-           frame->data().size(), frame->rssi(), toString(frame->link_mode()));
-
-  uint8_t packet_handled = 0;
-  for (auto &handler : this->handlers_)
-    handler(&frame.value());
-
-  if (frame->handlers_count())
-    ESP_LOGI(TAG, "Telegram handled by %d handlers", frame->handlers_count());
-  else {
-    ESP_LOGW(TAG, "Telegram not handled by any handler");
-    Telegram t;
-    if (t.parseHeader(frame->data()) && t.addresses.empty()) {
-      ESP_LOGW(TAG, "Check if telegram can be parsed on:");
-    } else {
-      ESP_LOGW(TAG, "Check if telegram with address %s can be parsed on:",
-               t.addresses.back().id.c_str());
-    }
-    ESP_LOGW(TAG,
-             (std::string{"https://wmbusmeters.org/analyze/"} + frame->as_hex())
-                 .c_str());
+  if (!frame) {
+    this->packet_pool_.release(p);
+    return true;
   }
+
+  this->dispatcher_->dispatch(&frame.value());
+  this->packet_pool_.release(p);
+  return true;
 }
 
-void Radio::wakeup_receiver_task_from_isr(TaskHandle_t *arg) {
+void Radio::dump_config() {
+  if (this->radio != nullptr)
+    this->radio->dump_config();
+  auto &scheduler = this->listen_scheduler_;
+  if (scheduler.enabled()) {
+    ESP_LOGCONFIG(TAG, "  Listen schedule:");
+    if (scheduler.learning())
+      ESP_LOGCONFIG(TAG, "    Learning intervals, guard time %" PRIu32 " ms",
+                    scheduler.guard_time());
+    if (scheduler.sleep())
+      ESP_LOGCONFIG(TAG, "    Sleeping between predicted windows");
+  }
+  auto core = this->resolved_task_core_();
+  if (core == tskNO_AFFINITY)
+    ESP_LOGCONFIG(TAG, "  Receiver task: any core, priority %u",
+                  this->task_priority_);
+  else
+    ESP_LOGCONFIG(TAG, "  Receiver task: core %d, priority %u", (int)core,
+                  this->task_priority_);
+  ESP_LOGCONFIG(TAG, "    Stack: %" PRIu32 " bytes, %" PRIu32 " never used",
+                this->task_stack_size_, this->task_stack_high_water_mark());
+  ESP_LOGCONFIG(TAG, "  Packet queue: %zu slots, drop %s on overflow",
+                this->queue_size_,
+                this->queue_overflow_policy_ == QueueOverflowPolicy::DROP_OLDEST
+                    ? "oldest"
+                    : "newest");
+  if (this->dispatch_time_budget_us_)
+    ESP_LOGCONFIG(TAG, "  Dispatch time budget: %" PRIu32 " us",
+                  this->dispatch_time_budget_us_);
+  if (this->address_filter_enabled_)
+    ESP_LOGCONFIG(TAG, "  Address filter: %zu meter ids",
+                  this->dispatcher_->configured_meters());
+  this->dispatcher_->dump_config();
+  ESP_LOGCONFIG(TAG, "  Packet pool: %zu buffers", this->packet_pool_.size());
+  ESP_LOGCONFIG(TAG, "    High water mark: %zu",
+                this->packet_pool_.high_water_mark());
+  ESP_LOGCONFIG(TAG, "    Exhausted: %" PRIu32 " times",
+                this->packet_pool_.exhausted_count());
+}
+
+void Radio::wakeup_receiver_task_from_isr(Radio *arg) {
+  arg->wakeup_us_ = micros();
   BaseType_t xHigherPriorityTaskWoken;
-  vTaskNotifyGiveFromISR(*arg, &xHigherPriorityTaskWoken);
+  vTaskNotifyGiveFromISR(arg->receiver_task_handle_, &xHigherPriorityTaskWoken);
   portYIELD_FROM_ISR(xHigherPriorityTaskWoken);
 }
 
 void Radio::receive_frame() {
+  uint32_t timeout_ms = 60000;
+  if (this->listen_scheduler_.enabled()) {
+    auto now = millis();
+    this->listen_scheduler_.update(now);
+    timeout_ms =
+        std::max<uint32_t>(this->listen_scheduler_.remaining_ms(now), 1);
+
+    if (!this->listen_scheduler_.listening()) {
+      this->radio->standby();
+      vTaskDelay(pdMS_TO_TICKS(timeout_ms));
+      // Drop interrupts of the transition, they carry no frame
+      ulTaskNotifyTake(pdTRUE, 0);
+      return;
+    }
+  }
+
   this->radio->restart_rx();
 
-  if (!ulTaskNotifyTake(pdTRUE, pdMS_TO_TICKS(60000))) {
-    ESP_LOGD(TAG, "Radio interrupt timeout");
+  if (!ulTaskNotifyTake(pdTRUE, pdMS_TO_TICKS(timeout_ms))) {
+    if (!this->listen_scheduler_.enabled())
+      ESP_LOGD(TAG, "Radio interrupt timeout");
+    return;
+  }
+
+  // Taken right away, as level interrupts keep coming while frame is read
+  const uint32_t wakeup_us = this->wakeup_us_;
+
+  auto packet = this->packet_pool_.acquire();
+  if (packet == nullptr) {
+    ESP_LOGW(TAG, "No free packet buffer");
+    return;
+  }
+
+  if (!this->read_packet_(packet)) {
+    this->packet_pool_.release(packet);
+    return;
+  }
+
+  auto &timestamps = packet->timestamps();
+  timestamps.wakeup_us = wakeup_us;
+  timestamps.read_us = micros();
+  this->latency(LatencyStage::RECEIVE).record(timestamps.read_us - wakeup_us);
+
+  // Only intact frames, noise must not make up meters or telegrams
+  if (packet->remove_crcs() && this->listen_scheduler_.enabled())
+    this->listen_scheduler_.record_frame(packet->dll_id(), millis());
+
+  this->enqueue_packet_(packet);
+}
+
+void Radio::enqueue_packet_(Packet *packet) {
+  // Packet belongs to main loop once sent, so only local copies are used after
+  const uint32_t read_us = packet->timestamps().read_us;
+  const uint32_t enqueue_us = packet->timestamps().enqueue_us = micros();
+  bool sent = xQueueSend(this->packet_queue_, &packet, 0) == pdTRUE;
+
+  if (!sent &&
+      this->queue_overflow_policy_ == QueueOverflowPolicy::DROP_OLDEST) {
+    // Main loop may have taken the oldest one meanwhile, which is fine too
+    Packet *oldest;
+    if (xQueueReceive(this->packet_queue_, &oldest, 0) == pdPASS) {
+      ESP_LOGW(TAG, "Queue full, oldest packet dropped");
+      this->packet_pool_.release(oldest);
+      this->queue_dropped_++;
+    }
+    sent = xQueueSend(this->packet_queue_, &packet, 0) == pdTRUE;
+  }
+
+  if (!sent) {
+    ESP_LOGW(TAG, "Queue send failed");
+    this->packet_pool_.release(packet);
+    this->queue_dropped_++;
     return;
   }
-  auto packet = std::make_unique<Packet>();
 
+  this->queue_enqueued_++;
+  this->latency(LatencyStage::ENQUEUE).record(enqueue_us - read_us);
+  size_t occupancy = uxQueueMessagesWaiting(this->packet_queue_);
+  if (occupancy > this->queue_max_occupancy_)
+    this->queue_max_occupancy_ = occupancy;
+  ESP_LOGV(TAG, "Queue items: %zu", occupancy);
+}
+
+bool Radio::read_packet_(Packet *packet) {
   if (!this->radio->read_in_task(packet->rx_data_ptr(),
                                  packet->rx_capacity())) {
     ESP_LOGV(TAG, "Failed to read preamble");
-    return;
+    this->link_statistics_.count(LinkEvent::PREAMBLE_TIMEOUT);
+    return false;
+  }
+
+  if (!packet->rx_advance(packet->rx_capacity())) {
+    ESP_LOGD(TAG, "Cannot decode preamble");
+    this->link_statistics_.count(LinkEvent::DECODE_ERROR);
+    return false;
   }
 
   if (!packet->calculate_payload_size()) {
     ESP_LOGD(TAG, "Cannot calculate payload size");
-    return;
+    this->link_statistics_.count(LinkEvent::SIZE_ERROR);
+    return false;
   }
 
-  if (!this->radio->read_in_task(packet->rx_data_ptr(),
-                                 packet->rx_capacity())) {
-    ESP_LOGW(TAG, "Failed to read data");
-    return;
+  bool address_pending = this->address_filter_enabled_;
+
+  // Read in chunks so that already received data is decoded in the meantime
+  while (auto length = std::min(packet->rx_capacity(), RX_CHUNK_SIZE)) {
+    if (!this->radio->read_in_task(packet->rx_data_ptr(), length)) {
+      ESP_LOGW(TAG, "Failed to read data");
+      this->link_statistics_.count(LinkEvent::READ_TIMEOUT);
+      return false;
+    }
+    if (!packet->rx_advance(length)) {
+      ESP_LOGD(TAG, "Cannot decode data");
+      this->link_statistics_.count(LinkEvent::DECODE_ERROR);
+      return false;
+    }
+
+    if (address_pending) {
+      auto result = this->filter_address_(packet);
+      if (result == AddressFilterResult::REJECT) {
+        ESP_LOGV(TAG, "Frame from not configured meter discarded");
+        this->address_filtered_++;
+        return false;
+      }
+      address_pending = result == AddressFilterResult::PENDING;
+    }
   }
 
   packet->set_rssi(this->radio->get_rssi());
-  auto packet_ptr = packet.get();
-
-  if (xQueueSend(this->packet_queue_, &packet_ptr, 0) == pdTRUE) {
-    ESP_LOGV(TAG, "Queue items: %zu",
-             uxQueueMessagesWaiting(this->packet_queue_));
-    ESP_LOGV(TAG, "Queue send success");
-    packet.release();
-  } else
-    ESP_LOGW(TAG, "Queue send failed");
+  return true;
+}
+
+AddressFilterResult Radio::filter_address_(Packet *packet) {
+  auto data = packet->rx_frame_data();
+  auto size = packet->rx_frame_size();
+
+  auto configured = [this](const uint8_t *id) {
+    return this->dispatcher_->is_meter_configured(
+        id[0] | id[1] << 8 | id[2] << 16 | (uint32_t)id[3] << 24);
+  };
+
+  // L C M(2) A: ID(4) version type
+  if (size < 10)
+    return AddressFilterResult::PENDING;
+  if (configured(data + 4))
+    return AddressFilterResult::ACCEPT;
+
+  // Long TPL header carries the meter address if DLL one is of a converter
+  auto ci_offset = packet->ci_field_offset();
+  if (size <= ci_offset)
+    return AddressFilterResult::PENDING;
+  if (data[ci_offset] != 0x72)
+    return AddressFilterResult::REJECT;
+  if (size < ci_offset + 5)
+    return AddressFilterResult::PENDING;
+  return configured(data + ci_offset + 1) ? AddressFilterResult::ACCEPT
+                                          : AddressFilterResult::REJECT;
 }
 
 void Radio::receiver_task(Radio *arg) {
@@ -160,9 +383,5 @@ void Radio::receiver_task(Radio *arg) {
     arg->receive_frame();
 }
 
-void Radio::add_frame_handler(std::function<void(Frame *)> &&callback) {
-  this->handlers_.push_back(std::move(callback));
-}
-
 } // namespace wmbus_radio
 } // namespace esphome
@@ -1,5 +1,6 @@
 #pragma once
 
+#include <atomic>
 #include <functional>
 #include <string>
 
@@ -11,37 +12,146 @@
 #include "esphome/components/spi/spi.h"
 #include "esphome/components/wmbus/wmbus_common/wmbus.h"
 
+#include "dispatcher.h"
+#include "listen_scheduler.h"
 #include "packet.h"
+#include "packet_pool.h"
 #include "transceiver.h"
 
 namespace esphome {
 namespace wmbus_radio {
+enum class QueueOverflowPolicy { DROP_NEWEST, DROP_OLDEST };
+enum class AddressFilterResult { PENDING, ACCEPT, REJECT };
+
+// Receiver task core, apart from explicit core number
+static const int TASK_CORE_ANY = -1;
+// Core not running WiFi task on multi-core chips, any core otherwise
+static const int TASK_CORE_AUTO = -2;
 
 class Radio : public Component, public spi::SPIDevice {
 public:
   void set_radio(RadioTransceiver *radio) { this->radio = radio; }
+  void set_dispatcher(Dispatcher *dispatcher) {
+    this->dispatcher_ = dispatcher;
+  }
   void set_radio_type(const std::string &radio_type);
   void set_reset_pin(GPIOPin *pin);
   void set_data_pin(GPIOPin *pin);
   void set_sync_pin(GPIOPin *pin);
   void set_irq_pin(GPIOPin *pin);
   void set_frequency(float frequency);
+  void set_fifo_level_mode(bool enabled);
+  void set_listen_learning(bool enabled) {
+    this->listen_scheduler_.set_learning(enabled);
+  }
+  void set_listen_sleep(bool enabled) {
+    this->listen_scheduler_.set_sleep(enabled);
+  }
+  void set_listen_guard_time(uint32_t guard_ms) {
+    this->listen_scheduler_.set_guard_time(guard_ms);
+  }
+  void set_queue_size(size_t queue_size) { this->queue_size_ = queue_size; }
+  void set_queue_overflow_policy(QueueOverflowPolicy policy) {
+    this->queue_overflow_policy_ = policy;
+  }
+  void set_dispatch_time_budget(uint32_t budget_us) {
+    this->dispatch_time_budget_us_ = budget_us;
+  }
+  void set_task_core(int core) { this->task_core_ = core; }
+  void set_task_priority(uint8_t priority) { this->task_priority_ = priority; }
+  void set_task_stack_size(uint32_t stack_size) {
+    this->task_stack_size_ = stack_size;
+  }
+  void set_address_filter(bool enabled) {
+    this->address_filter_enabled_ = enabled;
+  }
+  void add_address_filter_id(uint32_t id) {
+    this->dispatcher_->add_address_filter_id(id);
+  }
+  void set_duplicate_filter(size_t size, uint32_t ttl_ms) {
+    this->dispatcher_->set_duplicate_filter(size, ttl_ms);
+  }
 
   void setup() override;
   void loop() override;
+  void dump_config() override;
   void receive_frame();
+  void dump_latency() { this->dispatcher_->dump_latency(); }
+
+  const PacketPool &packet_pool() const { return this->packet_pool_; }
+  uint32_t queue_enqueued() const { return this->queue_enqueued_; }
+  uint32_t queue_dropped() const { return this->queue_dropped_; }
+  uint32_t address_filtered() const { return this->address_filtered_; }
+  const LinkStatistics &link_statistics() const {
+    return this->link_statistics_;
+  }
+  const ListenScheduler &listen_scheduler() const {
+    return this->listen_scheduler_;
+  }
+  // Lowest amount of stack left so far, in bytes
+  uint32_t task_stack_high_water_mark() const;
+  size_t queue_max_occupancy() const { return this->queue_max_occupancy_; }
+  size_t dispatch_last_batch_size() const {
+    return this->dispatch_last_batch_size_;
+  }
+  size_t dispatch_max_batch_size() const {
+    return this->dispatch_max_batch_size_;
+  }
+  uint32_t dispatch_last_time_us() const { return this->dispatch_last_time_us_; }
+  uint32_t dispatch_max_time_us() const { return this->dispatch_max_time_us_; }
+  LatencyHistogram &latency(LatencyStage stage) {
+    return this->dispatcher_->latency(stage);
+  }
+  const DuplicateFilter &duplicate_filter() const {
+    return this->dispatcher_->duplicate_filter();
+  }
 
-  void add_frame_handler(std::function<void(Frame *)> &&callback);
+  // Handlers are shared by all radios, see Dispatcher
+  void add_frame_handler(std::function<void(Frame *)> &&callback) {
+    this->dispatcher_->add_frame_handler(std::move(callback));
+  }
+  void add_frame_handler(uint32_t id, uint16_t mfct,
+                         std::function<void(Frame *)> &&callback) {
+    this->dispatcher_->add_frame_handler(id, mfct, std::move(callback));
+  }
 
 protected:
-  static void wakeup_receiver_task_from_isr(TaskHandle_t *arg);
+  static void wakeup_receiver_task_from_isr(Radio *arg);
   static void receiver_task(Radio *arg);
+  BaseType_t resolved_task_core_() const;
+  bool read_packet_(Packet *packet);
+  AddressFilterResult filter_address_(Packet *packet);
+  void enqueue_packet_(Packet *packet);
+  bool dispatch_packet_();
 
   RadioTransceiver *radio{nullptr};
+  Dispatcher *dispatcher_{nullptr};
   TaskHandle_t receiver_task_handle_{nullptr};
+  int task_core_{TASK_CORE_AUTO};
+  uint8_t task_priority_{2};
+  uint32_t task_stack_size_{3 * 1024};
+  std::atomic<uint32_t> wakeup_us_{0};
   QueueHandle_t packet_queue_{nullptr};
+  size_t queue_size_{3};
+  QueueOverflowPolicy queue_overflow_policy_{QueueOverflowPolicy::DROP_NEWEST};
+  PacketPool packet_pool_;
+
+  std::atomic<uint32_t> queue_enqueued_{0};
+  std::atomic<uint32_t> queue_dropped_{0};
+  std::atomic<size_t> queue_max_occupancy_{0};
+  LinkStatistics link_statistics_;
+  // Receiver task only
+  ListenScheduler listen_scheduler_;
+
+  bool address_filter_enabled_{false};
+  std::atomic<uint32_t> address_filtered_{0};
 
-  std::vector<std::function<void(Frame *)>> handlers_;
+  // Main loop only
+  uint32_t dispatch_time_budget_us_{0};
+  size_t dispatch_last_batch_size_{0};
+  size_t dispatch_max_batch_size_{0};
+  uint32_t dispatch_last_time_us_{0};
+  uint32_t dispatch_max_time_us_{0};
 };
 } // namespace wmbus_radio
 } // namespace esphome
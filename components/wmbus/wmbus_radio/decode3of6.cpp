@@ -1,53 +1,96 @@
 #include "decode3of6.h"
 
-#include <map>
-
-#include "esphome/core/helpers.h"
-#include "esphome/core/log.h"
-
 namespace esphome {
 namespace wmbus_radio {
-static const char *TAG = "3of6";
+// Direct lookup table indexed by 6-bit symbol. Every valid 3-out-of-6 code maps
+// to its nibble, everything else is marked as invalid (0xFF).
+static constexpr uint8_t lookup_table[64] = {
+    // 0b000000 - 0b001111
+    0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, //
+    0xFF, 0xFF, 0xFF, 0x03, 0xFF, 0x01, 0x02, 0xFF, //
+    // 0b010000 - 0b011111
+    0xFF, 0xFF, 0xFF, 0x07, 0xFF, 0xFF, 0x00, 0xFF, //
+    0xFF, 0x05, 0x06, 0xFF, 0x04, 0xFF, 0xFF, 0xFF, //
+    // 0b100000 - 0b101111
+    0xFF, 0xFF, 0xFF, 0x0B, 0xFF, 0x09, 0x0A, 0xFF, //
+    0xFF, 0x0F, 0xFF, 0xFF, 0x08, 0xFF, 0xFF, 0xFF, //
+    // 0b110000 - 0b111111
+    0xFF, 0x0D, 0x0E, 0xFF, 0x0C, 0xFF, 0xFF, 0xFF, //
+    0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, //
+};
+
+size_t decode3of6(const uint8_t *coded_data, size_t coded_size,
+                  uint8_t *decoded_data) {
+  const uint8_t *src = coded_data;
+  uint8_t *dst = decoded_data;
+
+  // Every 3 coded bytes (24 bits) carry 4 symbols, which are 2 decoded bytes.
+  // Output never overtakes input, so decoding in place is safe.
+  for (size_t groups = coded_size / 3; groups; groups--, src += 3) {
+    uint32_t bits = (src[0] << 16) | (src[1] << 8) | src[2];
+    uint8_t n0 = lookup_table[(bits >> 18) & 0x3F];
+    uint8_t n1 = lookup_table[(bits >> 12) & 0x3F];
+    uint8_t n2 = lookup_table[(bits >> 6) & 0x3F];
+    uint8_t n3 = lookup_table[bits & 0x3F];
+
+    if ((n0 | n1 | n2 | n3) & 0xF0)
+      return 0;
+
+    *dst++ = (n0 << 4) | n1;
+    *dst++ = (n2 << 4) | n3;
+  }
+
+  // Trailing 1 or 2 coded bytes hold 1 or 2 complete symbols
+  switch (coded_size % 3) {
+  case 1: {
+    uint8_t n0 = lookup_table[src[0] >> 2];
+    if (n0 & 0xF0)
+      return 0;
+    *dst++ = n0 << 4;
+    break;
+  }
+  case 2: {
+    uint16_t bits = (src[0] << 8) | src[1];
+    uint8_t n0 = lookup_table[(bits >> 10) & 0x3F];
+    uint8_t n1 = lookup_table[(bits >> 4) & 0x3F];
+    if ((n0 | n1) & 0xF0)
+      return 0;
+    *dst++ = (n0 << 4) | n1;
+    break;
+  }
+  }
+
+  return dst - decoded_data;
+}
+
 std::optional<std::vector<uint8_t>>
 decode3of6(std::vector<uint8_t> &coded_data) {
+  std::vector<uint8_t> decoded(decoded_size(coded_data.size()));
+  if (!decoded.empty() &&
+      !decode3of6(coded_data.data(), coded_data.size(), decoded.data()))
+    return {};
+  return decoded;
+}
 
-  static const std::map<uint8_t, uint8_t> lookupTable = {
-      {0b010110, 0x0}, {0b001101, 0x1}, {0b001110, 0x2}, {0b001011, 0x3},
-      {0b011100, 0x4}, {0b011001, 0x5}, {0b011010, 0x6}, {0b010011, 0x7},
-      {0b101100, 0x8}, {0b100101, 0x9}, {0b100110, 0xA}, {0b100011, 0xB},
-      {0b110100, 0xC}, {0b110001, 0xD}, {0b110010, 0xE}, {0b101001, 0xF},
-  };
-
-  // ESP_LOGD(TAG, "Decoding 3of6 data: %s", format_hex(coded_data).c_str());
-
-  std::vector<uint8_t> decodedBytes;
-  auto segments = coded_data.size() * 8 / 6;
-  auto data = coded_data.data();
-
-  for (size_t i = 0; i < segments; i++) {
-    auto bit_idx = i * 6;
-    auto byte_idx = bit_idx / 8;
-    auto bit_offset = bit_idx % 8;
-
-    uint8_t code = (data[byte_idx] << bit_offset);
-    if (bit_offset > 0)
-      code |= (data[byte_idx + 1] >> (8 - bit_offset));
-    code >>= 2;
-
-    auto it = lookupTable.find(code);
-    if (it == lookupTable.end()) {
-      // ESP_LOGW(TAG, "Invalid code: 0x%02X", code);
-      return {};
-    }
-
-    if (i % 2 == 0)
-      decodedBytes.push_back(it->second << 4);
-    else
-      decodedBytes.back() |= it->second;
-  }
+bool Decoder3of6::advance(uint8_t *buffer, size_t available) {
+  return this->decode_(buffer, (available - this->coded_pos_) / 3 * 3);
+}
 
-  // ESP_LOGV(TAG, "Successfully decoded %zu bytes", decodedBytes.size());
-  return decodedBytes;
+bool Decoder3of6::finish(uint8_t *buffer, size_t available) {
+  return this->decode_(buffer, available - this->coded_pos_);
+}
+
+bool Decoder3of6::decode_(uint8_t *buffer, size_t coded_size) {
+  if (this->failed_ || !coded_size)
+    return !this->failed_;
+
+  // Decoded position always stays behind the coded one, see decode3of6
+  auto size = decode3of6(buffer + this->coded_pos_, coded_size,
+                         buffer + this->decoded_pos_);
+  this->failed_ = !size;
+  this->coded_pos_ += coded_size;
+  this->decoded_pos_ += size;
+  return !this->failed_;
 }
 
 size_t encoded_size(size_t decoded_size) {
@@ -55,5 +98,10 @@ size_t encoded_size(size_t decoded_size) {
   // bytes of coded data +1 for rounding up
   return (3 * decoded_size + 1) / 2;
 }
+
+size_t decoded_size(size_t encoded_size) {
+  // Number of complete 6-bit symbols, two per decoded byte (rounded up)
+  return (encoded_size * 8 / 6 + 1) / 2;
+}
 } // namespace wmbus_radio
-} // namespace esphome
\ No newline at end of file
+} // namespace esphome
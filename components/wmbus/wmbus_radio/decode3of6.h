@@ -1,13 +1,40 @@
 #pragma once
 
+#include <cstddef>
 #include <cstdint>
 #include <optional>
 #include <vector>
 
 namespace esphome {
 namespace wmbus_radio {
+// Decode 3-out-of-6 coded data into a caller supplied buffer of at least
+// decoded_size(coded_size) bytes. Buffers may alias (in-place decoding).
+// Returns number of decoded bytes or 0 if an invalid symbol was found.
+size_t decode3of6(const uint8_t *coded_data, size_t coded_size,
+                  uint8_t *decoded_data);
 std::optional<std::vector<uint8_t>>
 decode3of6(std::vector<uint8_t> &coded_data);
 size_t encoded_size(size_t decoded_size);
+size_t decoded_size(size_t encoded_size);
+
+// Incremental in-place decoder for a buffer that is being filled with 3-out-of-6
+// coded data. Decoded bytes are written to the front of the same buffer.
+class Decoder3of6 {
+public:
+  // Decode all complete symbol groups within the first `available` bytes
+  bool advance(uint8_t *buffer, size_t available);
+  // Decode remaining symbols once all coded bytes were received
+  bool finish(uint8_t *buffer, size_t available);
+
+  size_t size() const { return this->decoded_pos_; }
+  bool failed() const { return this->failed_; }
+
+protected:
+  bool decode_(uint8_t *buffer, size_t coded_size);
+
+  size_t coded_pos_ = 0;
+  size_t decoded_pos_ = 0;
+  bool failed_ = false;
+};
 } // namespace wmbus_radio
-} // namespace esphome
\ No newline at end of file
+} // namespace esphome
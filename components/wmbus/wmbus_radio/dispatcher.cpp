@@ -0,0 +1,144 @@
+#include "dispatcher.h"
+
+#include <algorithm>
+#include <cinttypes>
+
+#include "esphome/core/hal.h"
+#include "esphome/core/log.h"
+
+namespace esphome {
+namespace wmbus_radio {
+static const char *TAG = "wmbus";
+
+const char *latency_stage_to_string(LatencyStage stage) {
+  switch (stage) {
+  case LatencyStage::RECEIVE:
+    return "receive";
+  case LatencyStage::ENQUEUE:
+    return "enqueue";
+  case LatencyStage::QUEUE:
+    return "queue";
+  case LatencyStage::HANDLE:
+    return "handle";
+  case LatencyStage::PUBLISH:
+    return "publish";
+  case LatencyStage::TOTAL:
+    return "total";
+  }
+  return "unknown";
+}
+
+void Dispatcher::setup() {
+  if (this->setup_done_)
+    return;
+  this->setup_done_ = true;
+
+  std::sort(this->address_filter_ids_.begin(), this->address_filter_ids_.end());
+  this->duplicate_filter_.setup(this->duplicate_filter_size_,
+                                this->duplicate_filter_ttl_ms_);
+}
+
+bool Dispatcher::is_meter_configured(uint32_t id) const {
+  return std::binary_search(this->address_filter_ids_.begin(),
+                            this->address_filter_ids_.end(), id);
+}
+
+bool Dispatcher::dispatch(Frame *frame) {
+  // Another radio may have heard the same transmission
+  if (this->duplicate_filter_.check(frame->data().data(), frame->data().size(),
+                                    millis())) {
+    ESP_LOGD(TAG, "Duplicate frame dropped (%zu bytes)", frame->data().size());
+    return false;
+  }
+
+  ESP_LOGI(TAG, "Have data from radio (%zu bytes) [RSSI: %ddBm, mode: %s]",
+           frame->data().size(), frame->rssi(), toString(frame->link_mode()));
+
+  for (auto &handler : this->handlers_)
+    handler(frame);
+  this->dispatch_to_addresses_(frame);
+
+  if (frame->handlers_count())
+    ESP_LOGI(TAG, "Telegram handled by %d handlers", frame->handlers_count());
+  else {
+    ESP_LOGW(TAG, "Telegram not handled by any handler");
+    auto &header = frame->header();
+    if (!header.addresses_count) {
+      ESP_LOGW(TAG, "Check if telegram can be parsed on:");
+    } else {
+      ESP_LOGW(TAG,
+               "Check if telegram with address %08" PRIx32
+               " can be parsed on:",
+               header.addresses[header.addresses_count - 1].id);
+    }
+    frame->as_hex(this->hex_);
+    ESP_LOGW(TAG, "https://wmbusmeters.org/analyze/%s", this->hex_.c_str());
+  }
+  return true;
+}
+
+void Dispatcher::dump_config() {
+  if (this->duplicate_filter_.enabled())
+    ESP_LOGCONFIG(TAG, "  Duplicate filter: %zu frames, TTL %" PRIu32 " ms",
+                  this->duplicate_filter_.capacity(),
+                  this->duplicate_filter_.ttl());
+}
+
+void Dispatcher::dump_latency() {
+  for (size_t i = 0; i < LATENCY_STAGES; i++) {
+    auto stage = (LatencyStage)i;
+    LatencyHistogram::Snapshot snapshot;
+    this->latency(stage).snapshot(&snapshot);
+    ESP_LOGI(TAG, "Latency of %s: %" PRIu32 " samples, max %" PRIu32 " us",
+             latency_stage_to_string(stage), snapshot.total(),
+             snapshot.max_us);
+    for (size_t b = 0; b < LatencyHistogram::BUCKETS; b++)
+      if (snapshot.counts[b])
+        ESP_LOGI(TAG, "  <= %" PRIu32 " us: %" PRIu32,
+                 std::min(LatencyHistogram::BUCKET_LIMITS_US[b],
+                          snapshot.max_us),
+                 snapshot.counts[b]);
+  }
+}
+
+void Dispatcher::add_frame_handler(std::function<void(Frame *)> &&callback) {
+  this->handlers_.push_back(std::move(callback));
+}
+
+void Dispatcher::add_frame_handler(uint32_t id, uint16_t mfct,
+                                   std::function<void(Frame *)> &&callback) {
+  uint64_t key = (uint64_t)mfct << 32 | id;
+  this->address_handlers_[key].push_back(std::move(callback));
+}
+
+void Dispatcher::dispatch_to_addresses_(Frame *frame) {
+  auto &header = frame->header();
+
+  if (!header.complete) {
+    for (auto &entry : this->address_handlers_)
+      for (auto &handler : entry.second)
+        handler(frame);
+    return;
+  }
+
+  auto dispatch = [this, frame](uint16_t mfct, uint32_t id) {
+    auto it = this->address_handlers_.find((uint64_t)mfct << 32 | id);
+    if (it != this->address_handlers_.end())
+      for (auto &handler : it->second)
+        handler(frame);
+  };
+
+  auto &first = header.addresses[0];
+  for (size_t i = 0; i < header.addresses_count; i++) {
+    auto &address = header.addresses[i];
+    // Do not call the same handlers twice if both addresses are equal
+    bool same_id = i && address.id == first.id;
+    if (!same_id)
+      dispatch(ANY_MANUFACTURER, address.id);
+    if (address.manufacturer != ANY_MANUFACTURER &&
+        !(same_id && address.manufacturer == first.manufacturer))
+      dispatch(address.manufacturer, address.id);
+  }
+}
+} // namespace wmbus_radio
+} // namespace esphome
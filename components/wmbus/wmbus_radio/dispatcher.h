@@ -0,0 +1,82 @@
+#pragma once
+
+#include <functional>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+#include "duplicate_filter.h"
+#include "latency_histogram.h"
+#include "packet.h"
+
+namespace esphome {
+namespace wmbus_radio {
+// Frame path from radio interrupt to sensor publish, each stage measured from
+// the end of the previous one (TOTAL from interrupt to publish)
+enum class LatencyStage { RECEIVE, ENQUEUE, QUEUE, HANDLE, PUBLISH, TOTAL };
+static const size_t LATENCY_STAGES = 6;
+const char *latency_stage_to_string(LatencyStage stage);
+
+static const uint16_t ANY_MANUFACTURER = 0xFFFF;
+
+// Shared by all radios: frames are deduplicated and routed to handlers no
+// matter which radio received them. Handlers run in main loop only.
+class Dispatcher {
+public:
+  // Idempotent, every radio calls it before starting its receiver task
+  void setup();
+
+  void set_duplicate_filter(size_t size, uint32_t ttl_ms) {
+    this->duplicate_filter_size_ = size;
+    this->duplicate_filter_ttl_ms_ = ttl_ms;
+  }
+  void add_address_filter_id(uint32_t id) {
+    this->address_filter_ids_.push_back(id);
+  }
+
+  // Called for every frame
+  void add_frame_handler(std::function<void(Frame *)> &&callback);
+  // Called only for frames addressed to given identification number
+  void add_frame_handler(uint32_t id, uint16_t mfct,
+                         std::function<void(Frame *)> &&callback);
+
+  // Safe to call from receiver tasks once set up
+  bool is_meter_configured(uint32_t id) const;
+  size_t configured_meters() const { return this->address_filter_ids_.size(); }
+  const std::vector<uint32_t> &configured_meter_ids() const {
+    return this->address_filter_ids_;
+  }
+  // Returns false if frame was dropped as a duplicate
+  bool dispatch(Frame *frame);
+
+  void dump_config();
+  void dump_latency();
+  const DuplicateFilter &duplicate_filter() const {
+    return this->duplicate_filter_;
+  }
+  LatencyHistogram &latency(LatencyStage stage) {
+    return this->latency_[(size_t)stage];
+  }
+
+protected:
+  void dispatch_to_addresses_(Frame *frame);
+
+  bool setup_done_{false};
+
+  // Sorted at setup, read-only afterwards so receiver tasks need no locking
+  std::vector<uint32_t> address_filter_ids_;
+
+  size_t duplicate_filter_size_{16};
+  uint32_t duplicate_filter_ttl_ms_{0};
+  DuplicateFilter duplicate_filter_;
+  LatencyHistogram latency_[LATENCY_STAGES];
+  // Reused for unhandled frame warnings, grows to the longest frame once
+  std::string hex_;
+
+  std::vector<std::function<void(Frame *)>> handlers_;
+  // Keyed by M-field (or ANY_MANUFACTURER) << 32 | A-field identification
+  std::unordered_map<uint64_t, std::vector<std::function<void(Frame *)>>>
+      address_handlers_;
+};
+} // namespace wmbus_radio
+} // namespace esphome
@@ -0,0 +1,52 @@
+#include "duplicate_filter.h"
+
+#include <algorithm>
+
+namespace esphome {
+namespace wmbus_radio {
+void DuplicateFilter::setup(size_t capacity, uint32_t ttl_ms) {
+  this->entries_.assign(ttl_ms ? capacity : 0, Entry{0, 0, false});
+  this->ttl_ms_ = ttl_ms;
+}
+
+// 32-bit FNV-1a, length is mixed in so truncated copies differ
+uint32_t DuplicateFilter::hash_(const uint8_t *data, size_t size) {
+  uint32_t hash = 2166136261u ^ (uint32_t)size;
+  for (size_t i = 0; i < size; i++) {
+    hash ^= data[i];
+    hash *= 16777619u;
+  }
+  return hash;
+}
+
+bool DuplicateFilter::check(const uint8_t *data, size_t size,
+                            uint32_t now_ms) {
+  if (!this->enabled())
+    return false;
+
+  auto hash = hash_(data, size);
+  auto begin = this->entries_.begin();
+  // Least recently seen, unless an entry is free or expired
+  size_t replace = this->entries_.size() - 1;
+
+  // A hit makes the entry most recently seen, but does not refresh its
+  // timestamp, so a meter repeating the very same telegram forever still
+  // gets through once per TTL
+  for (size_t i = 0; i < this->entries_.size(); i++) {
+    auto &entry = this->entries_[i];
+    if (!entry.used || now_ms - entry.timestamp_ms >= this->ttl_ms_) {
+      replace = i;
+    } else if (entry.hash == hash) {
+      this->hits_++;
+      std::rotate(begin, begin + i, begin + i + 1);
+      return true;
+    }
+  }
+
+  this->misses_++;
+  this->entries_[replace] = Entry{hash, now_ms, true};
+  std::rotate(begin, begin + replace, begin + replace + 1);
+  return false;
+}
+} // namespace wmbus_radio
+} // namespace esphome
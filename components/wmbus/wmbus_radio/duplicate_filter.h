@@ -0,0 +1,41 @@
+#pragma once
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+namespace esphome {
+namespace wmbus_radio {
+// Remembers hashes of recently dispatched frames, so copies repeated by the
+// meter or retransmitted by repeaters within the TTL are not processed again.
+// Bounded: a new frame takes the place of an expired entry, or when all are
+// alive, of the least recently seen one.
+class DuplicateFilter {
+public:
+  void setup(size_t capacity, uint32_t ttl_ms);
+  bool enabled() const { return !this->entries_.empty(); }
+
+  // Returns true if the same frame was seen within TTL, otherwise remembers it
+  bool check(const uint8_t *data, size_t size, uint32_t now_ms);
+
+  size_t capacity() const { return this->entries_.size(); }
+  uint32_t ttl() const { return this->ttl_ms_; }
+  uint32_t hits() const { return this->hits_; }
+  uint32_t misses() const { return this->misses_; }
+
+protected:
+  static uint32_t hash_(const uint8_t *data, size_t size);
+
+  struct Entry {
+    uint32_t hash;
+    uint32_t timestamp_ms;
+    bool used;
+  };
+  // Most recently seen first, unused entries last
+  std::vector<Entry> entries_;
+  uint32_t ttl_ms_{0};
+
+  uint32_t hits_{0};
+  uint32_t misses_{0};
+};
+} // namespace wmbus_radio
+} // namespace esphome
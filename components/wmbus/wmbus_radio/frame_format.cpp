@@ -0,0 +1,84 @@
+#include "frame_format.h"
+
+#include <cstring>
+
+namespace esphome {
+namespace wmbus_radio {
+static const char HEX_DIGITS[] = "0123456789abcdef";
+// Length of "YYYY-MM-DD HH:MM:SS.00Z"
+static const size_t TIME_SIZE = 23;
+// Longest int8_t, "-128"
+static const size_t RSSI_SIZE = 4;
+
+size_t hex_size(size_t data_size) { return 2 * data_size; }
+
+char *write_hex(char *out, const uint8_t *data, size_t size) {
+  for (size_t i = 0; i < size; i++) {
+    *out++ = HEX_DIGITS[data[i] >> 4];
+    *out++ = HEX_DIGITS[data[i] & 0x0F];
+  }
+  return out;
+}
+
+static char *write_string(char *out, const char *str) {
+  auto length = std::strlen(str);
+  std::memcpy(out, str, length);
+  return out + length;
+}
+
+static char *write_int(char *out, int value) {
+  if (value < 0) {
+    *out++ = '-';
+    value = -value;
+  }
+  char digits[3];
+  size_t count = 0;
+  do {
+    digits[count++] = '0' + value % 10;
+    value /= 10;
+  } while (value);
+  while (count)
+    *out++ = digits[--count];
+  return out;
+}
+
+size_t rtlwmbus_size(size_t link_mode_length, size_t data_size) {
+  return link_mode_length + sizeof(";1;1;") - 1 + TIME_SIZE + 1 + RSSI_SIZE +
+         sizeof(";;;0x") - 1 + hex_size(data_size) + 1;
+}
+
+char *write_rtlwmbus(char *out, const char *link_mode, std::time_t timestamp,
+                     int8_t rssi, const uint8_t *data, size_t size) {
+  out = write_string(out, link_mode);
+  out = write_string(out, ";1;1;");
+  std::tm tm;
+  gmtime_r(&timestamp, &tm);
+  // strftime needs room for NUL, which is overwritten by the separator
+  out += std::strftime(out, TIME_SIZE + 1, "%F %T.00Z", &tm);
+  *out++ = ';';
+  out = write_int(out, rssi);
+  out = write_string(out, ";;;0x");
+  out = write_hex(out, data, size);
+  *out++ = '\n';
+  return out;
+}
+
+size_t binary_record_size(size_t data_size) {
+  return BINARY_RECORD_HEADER_SIZE + data_size;
+}
+
+uint8_t *write_binary_record(uint8_t *out, uint8_t link_mode,
+                             std::time_t timestamp, int8_t rssi,
+                             const uint8_t *data, size_t size) {
+  uint32_t time = timestamp;
+  *out++ = link_mode;
+  *out++ = (uint8_t)rssi;
+  for (int shift = 0; shift < 32; shift += 8)
+    *out++ = time >> shift;
+  *out++ = size & 0xFF;
+  *out++ = size >> 8;
+  std::memcpy(out, data, size);
+  return out + size;
+}
+} // namespace wmbus_radio
+} // namespace esphome
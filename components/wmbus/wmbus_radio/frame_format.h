@@ -0,0 +1,29 @@
+#pragma once
+#include <cstddef>
+#include <cstdint>
+#include <ctime>
+
+namespace esphome {
+namespace wmbus_radio {
+// Frame formatters writing into caller provided buffers. They do not allocate
+// nor append a terminating NUL and return the end of written data. Buffers
+// have to hold at least the number of bytes given by matching *_size().
+
+// Lower case hex digits, no separators
+size_t hex_size(size_t data_size);
+char *write_hex(char *out, const uint8_t *data, size_t size);
+
+// rtl_wmbus line: "<mode>;1;1;<UTC time>;<RSSI>;;;0x<hex>\n"
+size_t rtlwmbus_size(size_t link_mode_length, size_t data_size);
+char *write_rtlwmbus(char *out, const char *link_mode, std::time_t timestamp,
+                     int8_t rssi, const uint8_t *data, size_t size);
+
+// Binary record: link mode (1), RSSI (1, signed), UNIX time (4, LE),
+// frame length (2, LE), frame bytes
+static const size_t BINARY_RECORD_HEADER_SIZE = 8;
+size_t binary_record_size(size_t data_size);
+uint8_t *write_binary_record(uint8_t *out, uint8_t link_mode,
+                             std::time_t timestamp, int8_t rssi,
+                             const uint8_t *data, size_t size);
+} // namespace wmbus_radio
+} // namespace esphome
@@ -0,0 +1,55 @@
+#include "latency_histogram.h"
+
+#include <algorithm>
+
+namespace esphome {
+namespace wmbus_radio {
+const uint32_t LatencyHistogram::BUCKET_LIMITS_US[BUCKETS] = {
+    50,    100,    250,    500,    1000,    2500,    5000,      10000,
+    25000, 50000, 100000, 250000, 500000, 1000000, UINT32_MAX,
+};
+
+void LatencyHistogram::record(uint32_t duration_us) {
+  auto bucket = std::lower_bound(BUCKET_LIMITS_US, BUCKET_LIMITS_US + BUCKETS,
+                                 duration_us) -
+                BUCKET_LIMITS_US;
+  this->counts_[bucket].fetch_add(1, std::memory_order_relaxed);
+
+  auto max = this->max_us_.load(std::memory_order_relaxed);
+  while (duration_us > max &&
+         !this->max_us_.compare_exchange_weak(max, duration_us,
+                                              std::memory_order_relaxed))
+    ;
+}
+
+void LatencyHistogram::snapshot(Snapshot *snapshot) const {
+  for (size_t i = 0; i < BUCKETS; i++)
+    snapshot->counts[i] = this->counts_[i].load(std::memory_order_relaxed);
+  snapshot->max_us = this->max_us_.load(std::memory_order_relaxed);
+}
+
+uint32_t LatencyHistogram::Snapshot::total() const {
+  uint32_t total = 0;
+  for (auto count : this->counts)
+    total += count;
+  return total;
+}
+
+uint32_t LatencyHistogram::Snapshot::percentile(const Snapshot &before,
+                                                uint8_t percent) const {
+  auto samples = this->total() - before.total();
+  if (!samples)
+    return 0;
+
+  // Rank of the sample, rounded up so that p100 is the last one
+  uint64_t rank = ((uint64_t)samples * percent + 99) / 100;
+  uint64_t seen = 0;
+  for (size_t i = 0; i < BUCKETS; i++) {
+    seen += this->counts[i] - before.counts[i];
+    if (seen >= rank && seen)
+      return std::min(BUCKET_LIMITS_US[i], this->max_us);
+  }
+  return this->max_us;
+}
+} // namespace wmbus_radio
+} // namespace esphome
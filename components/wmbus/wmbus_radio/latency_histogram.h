@@ -0,0 +1,34 @@
+#pragma once
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+
+namespace esphome {
+namespace wmbus_radio {
+// Fixed-bucket histogram of durations in microseconds. Recording is lock-free,
+// so samples may come from receiver task and main loop at the same time.
+class LatencyHistogram {
+public:
+  static const size_t BUCKETS = 15;
+  // Inclusive upper bound of each bucket, the last one takes everything else
+  static const uint32_t BUCKET_LIMITS_US[BUCKETS];
+
+  struct Snapshot {
+    uint32_t counts[BUCKETS]{};
+    uint32_t max_us{0};
+    uint32_t total() const;
+    // Upper bound of the bucket holding given percentile of samples recorded
+    // since `before` (capped by max), 0 without samples
+    uint32_t percentile(const Snapshot &before, uint8_t percent) const;
+  };
+
+  void record(uint32_t duration_us);
+  void snapshot(Snapshot *snapshot) const;
+  uint32_t max() const { return this->max_us_; }
+
+protected:
+  std::atomic<uint32_t> counts_[BUCKETS]{};
+  std::atomic<uint32_t> max_us_{0};
+};
+} // namespace wmbus_radio
+} // namespace esphome
@@ -0,0 +1,28 @@
+#include "link_statistics.h"
+
+#include <algorithm>
+
+namespace esphome {
+namespace wmbus_radio {
+const int8_t LinkStatistics::RSSI_BUCKET_LIMITS_DBM[RSSI_BUCKETS] = {
+    -100, -90, -80, -70, -60, -50, INT8_MAX,
+};
+
+void LinkStatistics::record_frame(int8_t rssi) {
+  auto bucket =
+      std::lower_bound(RSSI_BUCKET_LIMITS_DBM,
+                       RSSI_BUCKET_LIMITS_DBM + RSSI_BUCKETS, rssi) -
+      RSSI_BUCKET_LIMITS_DBM;
+  this->rssi_counts_[bucket].fetch_add(1, std::memory_order_relaxed);
+  this->count(LinkEvent::FRAME);
+}
+
+void LinkStatistics::snapshot(Snapshot *snapshot) const {
+  for (size_t i = 0; i < LINK_EVENTS; i++)
+    snapshot->events[i] = this->events_[i].load(std::memory_order_relaxed);
+  for (size_t i = 0; i < RSSI_BUCKETS; i++)
+    snapshot->rssi_counts[i] =
+        this->rssi_counts_[i].load(std::memory_order_relaxed);
+}
+} // namespace wmbus_radio
+} // namespace esphome
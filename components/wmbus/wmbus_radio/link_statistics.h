@@ -0,0 +1,54 @@
+#pragma once
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+
+namespace esphome {
+namespace wmbus_radio {
+enum class LinkEvent {
+  // Frame passed all checks, RSSI is recorded along
+  FRAME,
+  // No preamble within timeout after interrupt
+  PREAMBLE_TIMEOUT,
+  // Radio stopped delivering data in the middle of a frame
+  READ_TIMEOUT,
+  // Length unknown or longer than packet buffer
+  SIZE_ERROR,
+  // Invalid 3-out-of-6 symbol (T1)
+  DECODE_ERROR,
+  // DLL CRC mismatch in format A and B
+  CRC_ERROR,
+  // Rejected by checkWMBusFrame
+  FRAME_REJECTED,
+};
+static const size_t LINK_EVENTS = 7;
+
+// Per radio counters of receive outcomes. Counting is lock-free and cheap
+// enough for the receiver task, readers take snapshots and compare them.
+class LinkStatistics {
+public:
+  static const size_t RSSI_BUCKETS = 7;
+  // Inclusive upper bound of each bucket in dBm, the last one takes the rest
+  static const int8_t RSSI_BUCKET_LIMITS_DBM[RSSI_BUCKETS];
+
+  struct Snapshot {
+    uint32_t events[LINK_EVENTS]{};
+    uint32_t rssi_counts[RSSI_BUCKETS]{};
+    uint32_t count(LinkEvent event) const {
+      return this->events[(size_t)event];
+    }
+  };
+
+  void count(LinkEvent event) {
+    this->events_[(size_t)event].fetch_add(1, std::memory_order_relaxed);
+  }
+  // Counts a good frame together with its signal strength
+  void record_frame(int8_t rssi);
+  void snapshot(Snapshot *snapshot) const;
+
+protected:
+  std::atomic<uint32_t> events_[LINK_EVENTS]{};
+  std::atomic<uint32_t> rssi_counts_[RSSI_BUCKETS]{};
+};
+} // namespace wmbus_radio
+} // namespace esphome
@@ -0,0 +1,129 @@
+#include "listen_scheduler.h"
+
+namespace esphome {
+namespace wmbus_radio {
+// Wrap-around safe `a` not before `b`
+static bool not_before(uint32_t a, uint32_t b) { return (int32_t)(a - b) >= 0; }
+
+void ListenScheduler::add_meter(uint32_t id) {
+  // Not limited, sleep must not miss any configured meter
+  if (this->find_(id) == nullptr)
+    this->meters_.push_back({id, true, {}});
+}
+
+ListenScheduler::Meter *ListenScheduler::find_(uint32_t id) {
+  for (auto &meter : this->meters_)
+    if (meter.id == id)
+      return &meter;
+  return nullptr;
+}
+
+void ListenScheduler::update(uint32_t now_ms) {
+  if (!this->started_) {
+    this->started_ = true;
+    this->until_ms_ = this->accounted_ms_ = now_ms;
+  }
+  auto elapsed = now_ms - this->accounted_ms_;
+  (this->listening_ ? this->listen_ms_ : this->sleep_ms_) += elapsed;
+  this->accounted_ms_ = now_ms;
+
+  // Stay for the whole window of a telegram being due now
+  bool due = false;
+  uint32_t due_end = 0;
+  for (auto &meter : this->meters_) {
+    auto expected = meter.interval.expected(now_ms, this->guard_ms_);
+    if (!expected || !not_before(now_ms, expected - this->guard_ms_))
+      continue;
+    auto end = expected + this->guard_ms_;
+    if (!due || not_before(due_end, end))
+      due_end = end;
+    due = true;
+  }
+  if (due) {
+    this->listening_ = true;
+    this->until_ms_ = due_end;
+    return;
+  }
+
+  // Listening is cut short as soon as a newly learned window allows to sleep
+  if (!this->listening_ && !not_before(now_ms, this->until_ms_))
+    return;
+
+  uint32_t wake_ms;
+  if (this->sleep_until_(now_ms, &wake_ms)) {
+    this->listening_ = false;
+    this->until_ms_ = wake_ms;
+    return;
+  }
+  this->listening_ = true;
+
+  // Come back by the next window, so that radio may sleep once it is over
+  uint32_t until = now_ms + LISTEN_PERIOD_MS;
+  uint32_t expected;
+  if (this->next_expected(now_ms, &expected) &&
+      not_before(until, expected - this->guard_ms_))
+    until = expected - this->guard_ms_;
+  this->until_ms_ = until;
+}
+
+bool ListenScheduler::sleep_until_(uint32_t now_ms, uint32_t *wake_ms) const {
+  if (!this->sleep_)
+    return false;
+
+  // Any configured meter without prediction may transmit at any time
+  bool found = false;
+  for (auto &meter : this->meters_) {
+    if (!meter.configured)
+      continue;
+    auto expected = meter.interval.expected(now_ms, this->guard_ms_);
+    if (!expected)
+      return false;
+    auto start = expected - this->guard_ms_;
+    if (!found || not_before(*wake_ms, start))
+      *wake_ms = start;
+    found = true;
+  }
+  return found;
+}
+
+uint32_t ListenScheduler::remaining_ms(uint32_t now_ms) const {
+  if (!not_before(this->until_ms_, now_ms))
+    return 0;
+  return this->until_ms_ - now_ms;
+}
+
+bool ListenScheduler::next_expected(uint32_t now_ms, uint32_t *at_ms) const {
+  bool found = false;
+  for (auto &meter : this->meters_) {
+    auto expected = meter.interval.expected(now_ms, this->guard_ms_);
+    if (!expected || (found && not_before(expected, *at_ms)))
+      continue;
+    *at_ms = expected;
+    found = true;
+  }
+  return found;
+}
+
+void ListenScheduler::record_frame(uint32_t id, uint32_t now_ms) {
+  if (!this->learning_)
+    return;
+
+  auto meter = this->find_(id);
+  if (meter == nullptr) {
+    // Configured meters do not take room of learned ones
+    if (this->learned_ >= MAX_METERS)
+      return;
+    this->meters_.push_back({id, false, {}});
+    this->learned_++;
+    meter = &this->meters_.back();
+  }
+
+  auto captured = meter->interval.captured();
+  auto missed = meter->interval.missed();
+  if (!meter->interval.record(now_ms))
+    return;
+  this->captured_ += meter->interval.captured() - captured;
+  this->missed_ += meter->interval.missed() - missed;
+}
+} // namespace wmbus_radio
+} // namespace esphome
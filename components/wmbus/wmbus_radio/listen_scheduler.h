@@ -0,0 +1,79 @@
+#pragma once
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+#include "transmission_interval.h"
+
+namespace esphome {
+namespace wmbus_radio {
+// Learns transmission intervals of meters heard so far. With sleep enabled,
+// once every configured meter has a learned interval, the radio only listens
+// within guard time around their predicted telegrams. Used from receiver task
+// only, apart from the counters.
+class ListenScheduler {
+public:
+  // Limit of learned meters, apart from configured ones
+  static const size_t MAX_METERS = 32;
+  // Longest time between updates while listening
+  static const uint32_t LISTEN_PERIOD_MS = 60000;
+
+  struct Meter {
+    uint32_t id;
+    // Sleep waits for intervals of configured meters only
+    bool configured;
+    TransmissionInterval interval;
+  };
+
+  void add_meter(uint32_t id);
+  void set_learning(bool enabled) { this->learning_ = enabled; }
+  void set_sleep(bool enabled) { this->sleep_ = enabled; }
+  void set_guard_time(uint32_t guard_ms) { this->guard_ms_ = guard_ms; }
+
+  bool enabled() const { return this->learning_ || this->sleep_; }
+  bool learning() const { return this->learning_; }
+  bool sleep() const { return this->sleep_; }
+  uint32_t guard_time() const { return this->guard_ms_; }
+  // False while radio should sleep between windows
+  bool listening() const { return this->listening_; }
+
+  // Decides whether radio listens or sleeps until remaining_ms
+  void update(uint32_t now_ms);
+  // Time until update has to be called again
+  uint32_t remaining_ms(uint32_t now_ms) const;
+  // Telegram of meter received
+  void record_frame(uint32_t id, uint32_t now_ms);
+  // Earliest telegram expected from a learned meter, false if none
+  bool next_expected(uint32_t now_ms, uint32_t *at_ms) const;
+
+  // Telegrams of learned meters received and missed in between
+  uint32_t captured() const { return this->captured_; }
+  uint32_t missed() const { return this->missed_; }
+  // Time spent listening and sleeping so far
+  uint32_t listen_ms() const { return this->listen_ms_; }
+  uint32_t sleep_ms() const { return this->sleep_ms_; }
+
+protected:
+  Meter *find_(uint32_t id);
+  bool sleep_until_(uint32_t now_ms, uint32_t *wake_ms) const;
+
+  std::vector<Meter> meters_;
+  // Meters not configured, limited to MAX_METERS
+  size_t learned_{0};
+  bool learning_{false};
+  bool sleep_{false};
+  uint32_t guard_ms_{500};
+
+  bool started_{false};
+  bool listening_{true};
+  uint32_t until_ms_{0};
+  uint32_t accounted_ms_{0};
+
+  std::atomic<uint32_t> captured_{0};
+  std::atomic<uint32_t> missed_{0};
+  std::atomic<uint32_t> listen_ms_{0};
+  std::atomic<uint32_t> sleep_ms_{0};
+};
+} // namespace wmbus_radio
+} // namespace esphome
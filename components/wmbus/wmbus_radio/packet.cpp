@@ -1,5 +1,7 @@
 #include "packet.h"
 
+#include <algorithm>
+#include <cinttypes>
 #include <ctime>
 
 #include "esphome/components/wmbus/wmbus_common/meters.h"
@@ -8,18 +10,35 @@
 #include "decode3of6.h"
 
 #define WMBUS_PREAMBLE_SIZE (3)
+// L-field 255 -> 17 blocks -> 290 bytes with CRCs -> 435 bytes 3-of-6 coded
+#define WMBUS_MAX_PACKET_SIZE (435)
 #define WMBUS_MODE_C_PREAMBLE (0x54)
 #define WMBUS_BLOCK_A_PREAMBLE (0xCD)
 #define WMBUS_BLOCK_B_PREAMBLE (0x3D)
 
 namespace esphome {
 namespace wmbus_radio {
-Packet::Packet() { this->data_.reserve(WMBUS_PREAMBLE_SIZE); }
+Packet::Packet() {
+  // Allocate once, resizing within capacity never touches the heap again
+  this->data_.reserve(WMBUS_MAX_PACKET_SIZE);
+  this->reset();
+}
+
+void Packet::reset() {
+  this->data_.resize(WMBUS_PREAMBLE_SIZE);
+  this->received_ = 0;
+  this->decoder_ = {};
+  this->expected_size_ = 0;
+  this->rssi_ = 0;
+  this->crc_ok_ = false;
+  this->link_mode_ = LinkMode::UNKNOWN;
+  this->timestamps_ = {};
+}
 
 // Determine the link mode based on the first byte of the data
 LinkMode Packet::link_mode() {
   if (this->link_mode_ == LinkMode::UNKNOWN)
-    if (this->data_.size())
+    if (this->received_)
       if (this->data_[0] == WMBUS_MODE_C_PREAMBLE)
         this->link_mode_ = LinkMode::C1;
       else
@@ -35,11 +54,10 @@ uint8_t Packet::l_field() {
   switch (this->link_mode()) {
   case LinkMode::C1:
     return this->data_[2];
-  case LinkMode::T1: {
-    auto decoded = decode3of6(this->data_);
-    if (decoded)
-      return (*decoded)[0];
-  }
+  case LinkMode::T1:
+    // Preamble is decoded in place as soon as it is received
+    if (this->decoder_.size())
+      return this->data_[0];
   }
   return 0;
 }
@@ -67,78 +85,187 @@ size_t Packet::expected_size() {
   return this->expected_size_;
 }
 
-size_t Packet::rx_capacity() {
-  // TODO: Remove side effects?
-  auto cap = this->data_.capacity() - this->data_.size();
-  this->data_.resize(this->data_.capacity());
-  return cap;
+size_t Packet::rx_capacity() { return this->data_.size() - this->received_; }
+
+uint8_t *Packet::rx_data_ptr() { return this->data_.data() + this->received_; }
+
+bool Packet::rx_advance(size_t length) {
+  this->received_ += length;
+
+  if (this->link_mode() != LinkMode::T1)
+    return true;
+
+  // Decode what has arrived while the rest of the frame is still on air
+  if (this->rx_capacity())
+    return this->decoder_.advance(this->data_.data(), this->received_);
+  return this->decoder_.finish(this->data_.data(), this->received_);
+}
+
+const uint8_t *Packet::rx_frame_data() {
+  // C1 frames start after the mode and block preamble bytes
+  return this->data_.data() + (this->link_mode() == LinkMode::C1 ? 2 : 0);
+}
+
+size_t Packet::rx_frame_size() {
+  switch (this->link_mode()) {
+  case LinkMode::C1:
+    return this->received_ > 2 ? this->received_ - 2 : 0;
+  case LinkMode::T1:
+    return this->decoder_.size();
+  }
+  return 0;
 }
 
-uint8_t *Packet::rx_data_ptr() {
-  return this->data_.data() + this->data_.size();
+size_t Packet::ci_field_offset() {
+  // Format A closes the first block (L C M A) with CRC, format B does not
+  if (this->link_mode() == LinkMode::C1 &&
+      this->data_[1] == WMBUS_BLOCK_B_PREAMBLE)
+    return 10;
+  return 12;
 }
 
 bool Packet::calculate_payload_size() {
   auto total_length = this->expected_size();
-  this->data_.reserve(total_length);
+  if (total_length > this->data_.capacity())
+    return false;
+  this->data_.resize(total_length);
   return total_length;
 }
 
-std::optional<Frame> Packet::convert_to_frame() {
-  std::optional<Frame> frame = {};
-
-  if (this->link_mode() == LinkMode::T1 &&
-      this->expected_size() == this->data_.size()) {
-    auto decoded_data = decode3of6(this->data_);
-    if (decoded_data)
-      this->data_ = decoded_data.value();
-  }
-  else if (this->link_mode() == LinkMode::C1) {
+bool Packet::remove_crcs() {
+  if (this->link_mode() == LinkMode::T1)
+    this->data_.resize(this->rx_capacity() || this->decoder_.failed()
+                           ? 0
+                           : this->decoder_.size());
+  else if (this->link_mode() == LinkMode::C1)
     this->data_.erase(this->data_.begin(), this->data_.begin() + 2);
-  }
 
-  removeAnyDLLCRCs(this->data_);
+  this->crc_ok_ = removeAnyDLLCRCs(this->data_);
+  return this->crc_ok_;
+}
+
+uint32_t Packet::dll_id() {
+  // L C M(2) A: ID(4) version type
+  auto id = this->data_.data() + 4;
+  return id[0] | id[1] << 8 | id[2] << 16 | (uint32_t)id[3] << 24;
+}
+
+std::optional<Frame> Packet::convert_to_frame(LinkStatistics *statistics) {
+  std::optional<Frame> frame = {};
+
+  if (!this->crc_ok_)
+    statistics->count(LinkEvent::CRC_ERROR);
   int dummy;
   if (checkWMBusFrame(this->data_, (size_t *)&dummy, &dummy, &dummy, false) ==
-      FrameStatus::FullFrame)
+      FrameStatus::FullFrame) {
     frame.emplace(this);
-
-  delete this;
+    statistics->record_frame(this->rssi_);
+  } else
+    statistics->count(LinkEvent::FRAME_REJECTED);
 
   return frame;
 }
 
 Frame::Frame(Packet *packet)
-    : data_(std::move(packet->data_)), link_mode_(packet->link_mode_),
-      rssi_(packet->rssi_) {}
+    : data_(packet->data_), link_mode_(packet->link_mode_),
+      rssi_(packet->rssi_), timestamps_(packet->timestamps_) {}
 
 std::vector<uint8_t> &Frame::data() { return this->data_; }
 LinkMode Frame::link_mode() { return this->link_mode_; }
 int8_t Frame::rssi() { return this->rssi_; }
 
+const FrameHeader &Frame::header() {
+  if (this->header_)
+    return *this->header_;
+
+  auto &header = this->header_.emplace();
+  auto &data = this->data_;
+  header.link_mode = this->link_mode_;
+  header.addresses_count = 0;
+  header.complete = false;
+
+  // L C M(2) A: ID(4) version type CI
+  if (data.size() < 11) {
+    header.c_field = header.ci_field = 0;
+    return header;
+  }
+
+  // Version and type follow whichever of ID and M comes last
+  auto address = [&data](size_t m_offset, size_t id_offset) {
+    auto end = std::max(m_offset + 2, id_offset + 4);
+    return FrameAddress{
+        (uint16_t)(data[m_offset] | data[m_offset + 1] << 8),
+        data[id_offset] | data[id_offset + 1] << 8 | data[id_offset + 2] << 16 |
+            (uint32_t)data[id_offset + 3] << 24,
+        data[end], data[end + 1]};
+  };
+
+  header.c_field = data[1];
+  header.ci_field = data[10];
+  header.addresses[header.addresses_count++] = address(2, 4);
+
+  if (isCiFieldManufacturerSpecific(header.ci_field)) {
+    header.complete = true;
+  } else if (isCiFieldOfType(header.ci_field, CI_TYPE::TPL)) {
+    header.complete = true;
+    // Long TPL header (ID M version type) carries the meter address, while
+    // the DLL one may belong to a radio converter
+    if (header.ci_field == 0x72 && data.size() >= 19)
+      header.addresses[header.addresses_count++] = address(15, 11);
+  }
+
+  return header;
+}
+
+Address FrameAddress::to_address() const {
+  Address address;
+  address.id = str_sprintf("%08" PRIx32, this->id);
+  address.mfct = this->manufacturer;
+  address.version = this->version;
+  address.type = this->type;
+  return address;
+}
+
 std::vector<uint8_t> Frame::as_raw() { return this->data_; }
-std::string Frame::as_hex() { return format_hex(this->data_); }
+
+std::string Frame::as_hex() {
+  std::string output;
+  this->as_hex(output);
+  return output;
+}
+
 std::string Frame::as_rtlwmbus() {
-  const size_t time_repr_size = sizeof("YYYY-MM-DD HH:MM:SS.00Z");
-  char time_buffer[time_repr_size];
-  auto t = std::time(NULL);
-  std::strftime(time_buffer, time_repr_size, "%F %T.00Z", std::gmtime(&t));
-
-  auto output = std::string{};
-  output.reserve(2 + 5 + 24 + 1 + 4 + 5 + 2 * this->data_.size() + 1);
-
-  output += linkModeName(this->link_mode_); // size 2
-  output += ";1;1;";                        // size 5
-  output += time_buffer;                    // size 24
-  output += ';';                            // size 1
-  output += std::to_string(this->rssi_);    // size up to 4
-  output += ";;;0x";                        // size 5
-  output += this->as_hex();                 // size 2 * frame.size()
-  output += "\n";                           // size 1
+  std::string output;
+  this->as_rtlwmbus(output);
+  return output;
+}
 
+std::vector<uint8_t> Frame::as_binary() {
+  std::vector<uint8_t> output;
+  this->as_binary(output);
   return output;
 }
 
+void Frame::as_hex(std::string &output) {
+  output.resize(hex_size(this->data_.size()));
+  write_hex(&output[0], this->data_.data(), this->data_.size());
+}
+
+void Frame::as_rtlwmbus(std::string &output) {
+  auto link_mode = linkModeName(this->link_mode_);
+  output.resize(rtlwmbus_size(link_mode.size(), this->data_.size()));
+  auto end = write_rtlwmbus(&output[0], link_mode.c_str(), std::time(nullptr),
+                            this->rssi_, this->data_.data(), this->data_.size());
+  output.resize(end - output.data());
+}
+
+void Frame::as_binary(std::vector<uint8_t> &output) {
+  output.resize(binary_record_size(this->data_.size()));
+  write_binary_record(output.data(), (uint8_t)this->link_mode_,
+                      std::time(nullptr), this->rssi_, this->data_.data(),
+                      this->data_.size());
+}
+
 void Frame::mark_as_handled() { this->handlers_count_++; }
 uint8_t Frame::handlers_count() { return this->handlers_count_; }
 
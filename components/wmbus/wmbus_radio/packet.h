@@ -9,34 +9,92 @@
 #include "esphome/components/wmbus/wmbus_common/wmbus.h"
 #include "esphome/core/helpers.h"
 
+#include "decode3of6.h"
+#include "frame_format.h"
+#include "link_statistics.h"
+
 namespace esphome {
 namespace wmbus_radio {
 struct Frame;
 
+// micros() at frame processing stages, for latency statistics
+struct FrameTimestamps {
+  uint32_t wakeup_us{0};
+  uint32_t read_us{0};
+  uint32_t enqueue_us{0};
+  uint32_t dequeue_us{0};
+};
+
 struct Packet {
   friend class Frame;
 
 public:
   Packet();
+  void reset();
 
   uint8_t *rx_data_ptr();
   size_t rx_capacity();
+  bool rx_advance(size_t length);
   bool calculate_payload_size();
   void set_rssi(int8_t rssi);
+  FrameTimestamps &timestamps() { return this->timestamps_; }
 
-  std::optional<Frame> convert_to_frame();
+  // Leading frame bytes already received in plain form, block CRCs included
+  const uint8_t *rx_frame_data();
+  size_t rx_frame_size();
+  // Offset of CI-field in rx_frame_data(), depends on frame format
+  size_t ci_field_offset();
+
+  // Called by receiver task once frame is read: trims data to the frame and
+  // removes DLL CRCs in place, false if they did not match
+  bool remove_crcs();
+  // DLL address id, once remove_crcs succeeded
+  uint32_t dll_id();
+
+  // Frame borrows packet data, so packet must outlive the returned frame
+  // Outcome (good frame, CRC error, rejected frame) is counted in statistics
+  std::optional<Frame> convert_to_frame(LinkStatistics *statistics);
 
 protected:
   std::vector<uint8_t> data_;
+  size_t received_ = 0;
+  Decoder3of6 decoder_;
 
   size_t expected_size();
   size_t expected_size_ = 0;
 
   uint8_t l_field();
   int8_t rssi_ = 0;
+  bool crc_ok_ = false;
 
   LinkMode link_mode();
   LinkMode link_mode_ = LinkMode::UNKNOWN;
+
+  FrameTimestamps timestamps_;
+};
+
+// DLL or TPL long header address, as transmitted (little endian fields)
+struct FrameAddress {
+  uint16_t manufacturer;
+  uint32_t id;
+  uint8_t version;
+  uint8_t type;
+
+  // wmbusmeters representation, for matching against address expressions
+  Address to_address() const;
+};
+
+// Link layer header fields, decoded without touching the payload
+struct FrameHeader {
+  LinkMode link_mode;
+  uint8_t c_field;
+  uint8_t ci_field;
+  // DLL address first, then the long TPL header one if present
+  FrameAddress addresses[2];
+  uint8_t addresses_count;
+  // False if the frame may carry addresses not known without full parsing
+  // (e.g. behind ELL/AFL/NWL headers), so it cannot be filtered by address
+  bool complete;
 };
 
 struct Frame {
@@ -46,19 +104,30 @@ public:
   std::vector<uint8_t> &data();
   LinkMode link_mode();
   int8_t rssi();
+  const FrameTimestamps &timestamps() { return this->timestamps_; }
+  // Parsed on first use, then shared by all handlers of the frame
+  const FrameHeader &header();
 
   std::vector<uint8_t> as_raw();
   std::string as_hex();
   std::string as_rtlwmbus();
+  std::vector<uint8_t> as_binary();
+  // Reuse capacity of given buffer, so formatting every frame does not
+  // allocate once the buffer has grown to the longest frame
+  void as_hex(std::string &output);
+  void as_rtlwmbus(std::string &output);
+  void as_binary(std::vector<uint8_t> &output);
 
   void mark_as_handled();
   uint8_t handlers_count();
 
 protected:
-  std::vector<uint8_t> data_;
+  std::vector<uint8_t> &data_;
   LinkMode link_mode_;
   int8_t rssi_;
   uint8_t handlers_count_ = 0;
+  FrameTimestamps timestamps_;
+  std::optional<FrameHeader> header_;
 };
 
 } // namespace wmbus_radio
@@ -0,0 +1,38 @@
+#include "packet_pool.h"
+
+namespace esphome {
+namespace wmbus_radio {
+bool PacketPool::setup(size_t size) {
+  this->packets_.resize(size);
+  this->free_queue_ = xQueueCreate(size, sizeof(Packet *));
+  if (!this->free_queue_)
+    return false;
+
+  for (auto &packet : this->packets_) {
+    auto packet_ptr = &packet;
+    xQueueSend(this->free_queue_, &packet_ptr, 0);
+  }
+  return true;
+}
+
+Packet *PacketPool::acquire() {
+  Packet *packet;
+  if (xQueueReceive(this->free_queue_, &packet, 0) != pdPASS) {
+    this->exhausted_count_++;
+    return nullptr;
+  }
+
+  auto in_use = ++this->in_use_;
+  if (in_use > this->high_water_mark_)
+    this->high_water_mark_ = in_use;
+
+  packet->reset();
+  return packet;
+}
+
+void PacketPool::release(Packet *packet) {
+  this->in_use_--;
+  xQueueSend(this->free_queue_, &packet, 0);
+}
+} // namespace wmbus_radio
+} // namespace esphome
@@ -0,0 +1,36 @@
+#pragma once
+#include <atomic>
+#include <cstddef>
+#include <vector>
+
+#include "freertos/FreeRTOS.h"
+#include "freertos/queue.h"
+
+#include "packet.h"
+
+namespace esphome {
+namespace wmbus_radio {
+// Fixed set of max-length packet buffers, allocated once at setup. Receiver
+// task acquires a buffer per frame, main loop releases it after dispatching.
+class PacketPool {
+public:
+  bool setup(size_t size);
+
+  Packet *acquire();
+  void release(Packet *packet);
+
+  size_t size() const { return this->packets_.size(); }
+  size_t in_use() const { return this->in_use_; }
+  size_t high_water_mark() const { return this->high_water_mark_; }
+  uint32_t exhausted_count() const { return this->exhausted_count_; }
+
+protected:
+  std::vector<Packet> packets_;
+  QueueHandle_t free_queue_{nullptr};
+
+  std::atomic<size_t> in_use_{0};
+  std::atomic<size_t> high_water_mark_{0};
+  std::atomic<uint32_t> exhausted_count_{0};
+};
+} // namespace wmbus_radio
+} // namespace esphome
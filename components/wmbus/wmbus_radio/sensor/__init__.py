@@ -0,0 +1,141 @@
+import esphome.codegen as cg
+import esphome.config_validation as cv
+from esphome.components import sensor
+from esphome.const import (
+    CONF_ID,
+    ENTITY_CATEGORY_DIAGNOSTIC,
+    STATE_CLASS_MEASUREMENT,
+    STATE_CLASS_TOTAL_INCREASING,
+    UNIT_PERCENT,
+)
+
+from .. import RadioComponent, wmbus_radio_ns
+
+CONF_RADIO_ID = "radio_id"
+CONF_QUEUE_ENQUEUED = "queue_enqueued"
+CONF_QUEUE_DROPPED = "queue_dropped"
+CONF_QUEUE_MAX_OCCUPANCY = "queue_max_occupancy"
+CONF_ADDRESS_FILTERED = "address_filtered"
+CONF_POOL_EXHAUSTED = "pool_exhausted"
+CONF_POOL_HIGH_WATER_MARK = "pool_high_water_mark"
+CONF_DISPATCH_BATCH_SIZE = "dispatch_batch_size"
+CONF_DISPATCH_MAX_BATCH_SIZE = "dispatch_max_batch_size"
+CONF_DISPATCH_TIME = "dispatch_time"
+CONF_DISPATCH_MAX_TIME = "dispatch_max_time"
+CONF_DUPLICATE_HITS = "duplicate_hits"
+CONF_DUPLICATE_MISSES = "duplicate_misses"
+CONF_TASK_STACK_HIGH_WATER_MARK = "task_stack_high_water_mark"
+CONF_FRAMES_PER_SECOND = "frames_per_second"
+CONF_PREAMBLE_TIMEOUTS = "preamble_timeouts"
+CONF_READ_TIMEOUTS = "read_timeouts"
+CONF_SIZE_ERRORS = "size_errors"
+CONF_DECODE_ERRORS = "decode_errors"
+CONF_CRC_ERRORS = "crc_errors"
+CONF_FRAME_REJECTS = "frame_rejects"
+CONF_MISSED_TELEGRAMS = "missed_telegrams"
+CONF_CAPTURE_RATE = "capture_rate"
+CONF_DUTY_CYCLE = "duty_cycle"
+# Not in esphome.const, same as Home Assistant UnitOfTime.MICROSECONDS
+UNIT_MICROSECOND = "μs"
+# Order of LinkStatistics::RSSI_BUCKET_LIMITS_DBM
+RSSI_BUCKETS = [
+    "below_100",
+    "100_to_90",
+    "90_to_80",
+    "80_to_70",
+    "70_to_60",
+    "60_to_50",
+    "above_50",
+]
+# Order of LatencyStage
+LATENCY_STAGES = ["receive", "enqueue", "queue", "handle", "publish", "total"]
+
+DEPENDENCIES = ["wmbus_radio"]
+
+RadioStatistics = wmbus_radio_ns.class_(
+    "RadioStatistics", cg.PollingComponent, cg.Parented.template(RadioComponent)
+)
+
+COUNTER_SCHEMA = sensor.sensor_schema(
+    accuracy_decimals=0,
+    state_class=STATE_CLASS_TOTAL_INCREASING,
+    entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+)
+GAUGE_SCHEMA = sensor.sensor_schema(
+    accuracy_decimals=0,
+    state_class=STATE_CLASS_MEASUREMENT,
+    entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+)
+RATE_SCHEMA = sensor.sensor_schema(
+    unit_of_measurement="frames/s",
+    accuracy_decimals=2,
+    state_class=STATE_CLASS_MEASUREMENT,
+    entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+)
+PERCENT_SCHEMA = sensor.sensor_schema(
+    unit_of_measurement=UNIT_PERCENT,
+    accuracy_decimals=1,
+    state_class=STATE_CLASS_MEASUREMENT,
+    entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+)
+DURATION_SCHEMA = sensor.sensor_schema(
+    unit_of_measurement=UNIT_MICROSECOND,
+    accuracy_decimals=0,
+    state_class=STATE_CLASS_MEASUREMENT,
+    entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+)
+
+SENSORS = {
+    CONF_QUEUE_ENQUEUED: COUNTER_SCHEMA,
+    CONF_QUEUE_DROPPED: COUNTER_SCHEMA,
+    CONF_QUEUE_MAX_OCCUPANCY: GAUGE_SCHEMA,
+    CONF_ADDRESS_FILTERED: COUNTER_SCHEMA,
+    CONF_POOL_EXHAUSTED: COUNTER_SCHEMA,
+    CONF_POOL_HIGH_WATER_MARK: GAUGE_SCHEMA,
+    CONF_DISPATCH_BATCH_SIZE: GAUGE_SCHEMA,
+    CONF_DISPATCH_MAX_BATCH_SIZE: GAUGE_SCHEMA,
+    CONF_DISPATCH_TIME: DURATION_SCHEMA,
+    CONF_DISPATCH_MAX_TIME: DURATION_SCHEMA,
+    CONF_DUPLICATE_HITS: COUNTER_SCHEMA,
+    CONF_DUPLICATE_MISSES: COUNTER_SCHEMA,
+    # Least free receiver task stack since boot, in bytes
+    CONF_TASK_STACK_HIGH_WATER_MARK: GAUGE_SCHEMA,
+    CONF_FRAMES_PER_SECOND: RATE_SCHEMA,
+    CONF_PREAMBLE_TIMEOUTS: COUNTER_SCHEMA,
+    CONF_READ_TIMEOUTS: COUNTER_SCHEMA,
+    CONF_SIZE_ERRORS: COUNTER_SCHEMA,
+    CONF_DECODE_ERRORS: COUNTER_SCHEMA,
+    CONF_CRC_ERRORS: COUNTER_SCHEMA,
+    CONF_FRAME_REJECTS: COUNTER_SCHEMA,
+    # Good frames within update interval by signal strength
+    **{f"rssi_{bucket}": GAUGE_SCHEMA for bucket in RSSI_BUCKETS},
+    # Listen schedule, telegrams of meters with learned interval since boot
+    CONF_MISSED_TELEGRAMS: COUNTER_SCHEMA,
+    CONF_CAPTURE_RATE: PERCENT_SCHEMA,
+    # Share of update interval the radio was listening
+    CONF_DUTY_CYCLE: PERCENT_SCHEMA,
+    # 95th percentile of samples within update interval
+    **{f"latency_{stage}": DURATION_SCHEMA for stage in LATENCY_STAGES},
+}
+
+CONFIG_SCHEMA = (
+    cv.Schema(
+        {
+            cv.GenerateID(): cv.declare_id(RadioStatistics),
+            cv.GenerateID(CONF_RADIO_ID): cv.use_id(RadioComponent),
+            **{cv.Optional(key): schema for key, schema in SENSORS.items()},
+        }
+    )
+    .extend(cv.polling_component_schema("60s"))
+)
+
+
+async def to_code(config):
+    var = cg.new_Pvariable(config[CONF_ID])
+    await cg.register_component(var, config)
+    await cg.register_parented(var, config[CONF_RADIO_ID])
+
+    for key in SENSORS:
+        if key in config:
+            sens = await sensor.new_sensor(config[key])
+            cg.add(getattr(var, f"set_{key}_sensor")(sens))
@@ -0,0 +1,166 @@
+#include "sensor.h"
+
+#include "esphome/core/hal.h"
+#include "esphome/core/log.h"
+
+namespace esphome {
+namespace wmbus_radio {
+static const char *TAG = "wmbus_radio.sensor";
+
+static void publish(sensor::Sensor *sensor, float value) {
+  if (sensor != nullptr)
+    sensor->publish_state(value);
+}
+
+void RadioStatistics::update() {
+  publish(this->queue_enqueued_sensor_, this->parent_->queue_enqueued());
+  publish(this->queue_dropped_sensor_, this->parent_->queue_dropped());
+  publish(this->queue_max_occupancy_sensor_,
+          this->parent_->queue_max_occupancy());
+  publish(this->address_filtered_sensor_, this->parent_->address_filtered());
+
+  auto &pool = this->parent_->packet_pool();
+  publish(this->pool_exhausted_sensor_, pool.exhausted_count());
+  publish(this->pool_high_water_mark_sensor_, pool.high_water_mark());
+
+  publish(this->dispatch_batch_size_sensor_,
+          this->parent_->dispatch_last_batch_size());
+  publish(this->dispatch_max_batch_size_sensor_,
+          this->parent_->dispatch_max_batch_size());
+  publish(this->dispatch_time_sensor_, this->parent_->dispatch_last_time_us());
+  publish(this->dispatch_max_time_sensor_,
+          this->parent_->dispatch_max_time_us());
+
+  auto &duplicates = this->parent_->duplicate_filter();
+  publish(this->duplicate_hits_sensor_, duplicates.hits());
+  publish(this->duplicate_misses_sensor_, duplicates.misses());
+
+  if (this->task_stack_high_water_mark_sensor_ != nullptr)
+    this->task_stack_high_water_mark_sensor_->publish_state(
+        this->parent_->task_stack_high_water_mark());
+
+  this->publish_link_statistics_();
+
+  auto &scheduler = this->parent_->listen_scheduler();
+  publish(this->missed_telegrams_sensor_, scheduler.missed());
+  if (this->capture_rate_sensor_ != nullptr) {
+    auto captured = scheduler.captured();
+    auto expected = captured + scheduler.missed();
+    this->capture_rate_sensor_->publish_state(
+        expected ? captured * 100.0f / expected : NAN);
+  }
+
+  auto listen_ms = scheduler.listen_ms(), sleep_ms = scheduler.sleep_ms();
+  if (this->duty_cycle_sensor_ != nullptr) {
+    auto listened = listen_ms - this->listen_ms_;
+    auto total = listened + sleep_ms - this->sleep_ms_;
+    // Without schedule the radio listens all the time
+    this->duty_cycle_sensor_->publish_state(
+        total ? listened * 100.0f / total
+              : (scheduler.enabled() ? NAN : 100.0f));
+  }
+  this->listen_ms_ = listen_ms;
+  this->sleep_ms_ = sleep_ms;
+
+  this->publish_latency_(this->latency_receive_sensor_, LatencyStage::RECEIVE);
+  this->publish_latency_(this->latency_enqueue_sensor_, LatencyStage::ENQUEUE);
+  this->publish_latency_(this->latency_queue_sensor_, LatencyStage::QUEUE);
+  this->publish_latency_(this->latency_handle_sensor_, LatencyStage::HANDLE);
+  this->publish_latency_(this->latency_publish_sensor_, LatencyStage::PUBLISH);
+  this->publish_latency_(this->latency_total_sensor_, LatencyStage::TOTAL);
+}
+
+void RadioStatistics::publish_latency_(sensor::Sensor *sensor,
+                                       LatencyStage stage) {
+  auto &before = this->latency_snapshots_[(size_t)stage];
+  LatencyHistogram::Snapshot now;
+  this->parent_->latency(stage).snapshot(&now);
+
+  if (sensor != nullptr) {
+    // Nothing to report if no frame went through this stage meanwhile
+    if (now.total() == before.total())
+      sensor->publish_state(NAN);
+    else
+      sensor->publish_state(now.percentile(before, 95));
+  }
+  before = now;
+}
+
+void RadioStatistics::publish_link_statistics_() {
+  auto &before = this->link_snapshot_;
+  LinkStatistics::Snapshot now;
+  this->parent_->link_statistics().snapshot(&now);
+  const uint32_t now_ms = millis();
+
+  // First update covers the time since boot
+  if (this->frames_per_second_sensor_ != nullptr &&
+      now_ms != this->link_snapshot_ms_)
+    this->frames_per_second_sensor_->publish_state(
+        (now.count(LinkEvent::FRAME) - before.count(LinkEvent::FRAME)) *
+        1000.0f / (now_ms - this->link_snapshot_ms_));
+
+  publish(this->preamble_timeouts_sensor_,
+          now.count(LinkEvent::PREAMBLE_TIMEOUT));
+  publish(this->read_timeouts_sensor_, now.count(LinkEvent::READ_TIMEOUT));
+  publish(this->size_errors_sensor_, now.count(LinkEvent::SIZE_ERROR));
+  publish(this->decode_errors_sensor_, now.count(LinkEvent::DECODE_ERROR));
+  publish(this->crc_errors_sensor_, now.count(LinkEvent::CRC_ERROR));
+  publish(this->frame_rejects_sensor_, now.count(LinkEvent::FRAME_REJECTED));
+
+  sensor::Sensor *rssi_sensors[LinkStatistics::RSSI_BUCKETS] = {
+      this->rssi_below_100_sensor_, this->rssi_100_to_90_sensor_,
+      this->rssi_90_to_80_sensor_,  this->rssi_80_to_70_sensor_,
+      this->rssi_70_to_60_sensor_,  this->rssi_60_to_50_sensor_,
+      this->rssi_above_50_sensor_,
+  };
+  for (size_t i = 0; i < LinkStatistics::RSSI_BUCKETS; i++)
+    publish(rssi_sensors[i], now.rssi_counts[i] - before.rssi_counts[i]);
+
+  before = now;
+  this->link_snapshot_ms_ = now_ms;
+}
+
+void RadioStatistics::dump_config() {
+  ESP_LOGCONFIG(TAG, "wM-Bus Radio Statistics:");
+  LOG_UPDATE_INTERVAL(this);
+  LOG_SENSOR("  ", "Queue enqueued", this->queue_enqueued_sensor_);
+  LOG_SENSOR("  ", "Queue dropped", this->queue_dropped_sensor_);
+  LOG_SENSOR("  ", "Queue max occupancy", this->queue_max_occupancy_sensor_);
+  LOG_SENSOR("  ", "Address filtered", this->address_filtered_sensor_);
+  LOG_SENSOR("  ", "Pool exhausted", this->pool_exhausted_sensor_);
+  LOG_SENSOR("  ", "Pool high water mark", this->pool_high_water_mark_sensor_);
+  LOG_SENSOR("  ", "Dispatch batch size", this->dispatch_batch_size_sensor_);
+  LOG_SENSOR("  ", "Dispatch max batch size",
+             this->dispatch_max_batch_size_sensor_);
+  LOG_SENSOR("  ", "Dispatch time", this->dispatch_time_sensor_);
+  LOG_SENSOR("  ", "Dispatch max time", this->dispatch_max_time_sensor_);
+  LOG_SENSOR("  ", "Duplicate hits", this->duplicate_hits_sensor_);
+  LOG_SENSOR("  ", "Duplicate misses", this->duplicate_misses_sensor_);
+  LOG_SENSOR("  ", "Task stack high water mark",
+             this->task_stack_high_water_mark_sensor_);
+  LOG_SENSOR("  ", "Frames per second", this->frames_per_second_sensor_);
+  LOG_SENSOR("  ", "Preamble timeouts", this->preamble_timeouts_sensor_);
+  LOG_SENSOR("  ", "Read timeouts", this->read_timeouts_sensor_);
+  LOG_SENSOR("  ", "Size errors", this->size_errors_sensor_);
+  LOG_SENSOR("  ", "Decode errors", this->decode_errors_sensor_);
+  LOG_SENSOR("  ", "CRC errors", this->crc_errors_sensor_);
+  LOG_SENSOR("  ", "Frame rejects", this->frame_rejects_sensor_);
+  LOG_SENSOR("  ", "RSSI below -100 dBm", this->rssi_below_100_sensor_);
+  LOG_SENSOR("  ", "RSSI -100 to -90 dBm", this->rssi_100_to_90_sensor_);
+  LOG_SENSOR("  ", "RSSI -90 to -80 dBm", this->rssi_90_to_80_sensor_);
+  LOG_SENSOR("  ", "RSSI -80 to -70 dBm", this->rssi_80_to_70_sensor_);
+  LOG_SENSOR("  ", "RSSI -70 to -60 dBm", this->rssi_70_to_60_sensor_);
+  LOG_SENSOR("  ", "RSSI -60 to -50 dBm", this->rssi_60_to_50_sensor_);
+  LOG_SENSOR("  ", "RSSI above -50 dBm", this->rssi_above_50_sensor_);
+  LOG_SENSOR("  ", "Missed telegrams", this->missed_telegrams_sensor_);
+  LOG_SENSOR("  ", "Capture rate", this->capture_rate_sensor_);
+  LOG_SENSOR("  ", "Duty cycle", this->duty_cycle_sensor_);
+  LOG_SENSOR("  ", "Latency receive", this->latency_receive_sensor_);
+  LOG_SENSOR("  ", "Latency enqueue", this->latency_enqueue_sensor_);
+  LOG_SENSOR("  ", "Latency queue", this->latency_queue_sensor_);
+  LOG_SENSOR("  ", "Latency handle", this->latency_handle_sensor_);
+  LOG_SENSOR("  ", "Latency publish", this->latency_publish_sensor_);
+  LOG_SENSOR("  ", "Latency total", this->latency_total_sensor_);
+}
+} // namespace wmbus_radio
+} // namespace esphome
@@ -0,0 +1,66 @@
+#pragma once
+#include "esphome/components/sensor/sensor.h"
+#include "esphome/core/component.h"
+#include "esphome/core/helpers.h"
+
+#include "../component.h"
+
+namespace esphome {
+namespace wmbus_radio {
+class RadioStatistics : public PollingComponent, public Parented<Radio> {
+  SUB_SENSOR(queue_enqueued)
+  SUB_SENSOR(queue_dropped)
+  SUB_SENSOR(queue_max_occupancy)
+  SUB_SENSOR(address_filtered)
+  SUB_SENSOR(pool_exhausted)
+  SUB_SENSOR(pool_high_water_mark)
+  SUB_SENSOR(dispatch_batch_size)
+  SUB_SENSOR(dispatch_max_batch_size)
+  SUB_SENSOR(dispatch_time)
+  SUB_SENSOR(dispatch_max_time)
+  SUB_SENSOR(duplicate_hits)
+  SUB_SENSOR(duplicate_misses)
+  SUB_SENSOR(task_stack_high_water_mark)
+  SUB_SENSOR(frames_per_second)
+  SUB_SENSOR(preamble_timeouts)
+  SUB_SENSOR(read_timeouts)
+  SUB_SENSOR(size_errors)
+  SUB_SENSOR(decode_errors)
+  SUB_SENSOR(crc_errors)
+  SUB_SENSOR(frame_rejects)
+  SUB_SENSOR(rssi_below_100)
+  SUB_SENSOR(rssi_100_to_90)
+  SUB_SENSOR(rssi_90_to_80)
+  SUB_SENSOR(rssi_80_to_70)
+  SUB_SENSOR(rssi_70_to_60)
+  SUB_SENSOR(rssi_60_to_50)
+  SUB_SENSOR(rssi_above_50)
+  SUB_SENSOR(missed_telegrams)
+  SUB_SENSOR(capture_rate)
+  SUB_SENSOR(duty_cycle)
+  SUB_SENSOR(latency_receive)
+  SUB_SENSOR(latency_enqueue)
+  SUB_SENSOR(latency_queue)
+  SUB_SENSOR(latency_handle)
+  SUB_SENSOR(latency_publish)
+  SUB_SENSOR(latency_total)
+
+public:
+  void update() override;
+  void dump_config() override;
+
+protected:
+  void publish_latency_(sensor::Sensor *sensor, LatencyStage stage);
+  void publish_link_statistics_();
+
+  // Histograms at previous update, so percentiles cover one interval only
+  LatencyHistogram::Snapshot latency_snapshots_[LATENCY_STAGES];
+  // Link counters at previous update, for rates and RSSI distribution
+  LinkStatistics::Snapshot link_snapshot_;
+  uint32_t link_snapshot_ms_{0};
+  // Listen schedule times at previous update
+  uint32_t listen_ms_{0};
+  uint32_t sleep_ms_{0};
+};
+} // namespace wmbus_radio
+} // namespace esphome
@@ -5,22 +5,48 @@
 #include "freertos/FreeRTOS.h"
 #include "freertos/task.h"
 
+// Longest wait for FIFO threshold interrupt, a 24 byte chunk takes about 2 ms
+// at 100 kchip/s, so a frame is over if it does not come within this time
+#define FIFO_THRESHOLD_TIMEOUT_MS (10)
+
 namespace esphome {
 namespace wmbus_radio {
 static const char *TAG = "wmbus.transceiver";
 
+size_t RadioTransceiver::read_bulk(uint8_t *buffer, size_t length) {
+  size_t count = 0;
+  while (count < length) {
+    auto byte = this->read();
+    if (!byte.has_value())
+      break;
+    buffer[count++] = *byte;
+  }
+  return count;
+}
+
 bool RadioTransceiver::read_in_task(uint8_t *buffer, size_t length) {
   const uint8_t *buffer_end = buffer + length;
-  int wait_count = 0;
 
   while (buffer != buffer_end) {
-    auto byte = this->read();
-    if (byte.has_value())
-      *buffer++ = *byte;
-    else if (!ulTaskNotifyTake(pdTRUE, pdMS_TO_TICKS(1)))
+    auto count = this->read_bulk(buffer, buffer_end - buffer);
+    buffer += count;
+    if (count)
+      continue;
+
+    if (this->has_fifo_threshold_interrupt()) {
+      // Interrupt may be left over from bytes already read, then FIFO is
+      // just read again and waiting goes on
+      if (!ulTaskNotifyTake(pdTRUE, pdMS_TO_TICKS(FIFO_THRESHOLD_TIMEOUT_MS)))
+        return false;
+      continue;
+    }
+
+    // Data interrupt signals more bytes. Without one, the remaining bytes may
+    // still be below the FIFO threshold, so check once more before giving up
+    if (!ulTaskNotifyTake(pdTRUE, pdMS_TO_TICKS(1)) &&
+        !(count = this->read_bulk(buffer, buffer_end - buffer)))
       return false;
-    else
-      wait_count++;
+    buffer += count;
   }
 
   return true;
@@ -34,16 +60,6 @@ void RadioTransceiver::set_irq_pin(InternalGPIOPin *irq_pin) {
   this->irq_pin_ = irq_pin;
 }
 
-void RadioTransceiver::attach_data_interrupt(void (*func)(TaskHandle_t *),
-                                             TaskHandle_t *arg) {
-  if (this->data_pin_ == nullptr)
-    return;
-
-  auto *pin = static_cast<InternalGPIOPin *>(this->data_pin_);
-  pin->setup();
-  pin->attach_interrupt(func, arg, gpio::INTERRUPT_RISING_EDGE);
-}
-
 void RadioTransceiver::reset() {
   this->reset_pin_->digital_write(0);
   delay(5);
@@ -76,6 +92,15 @@ uint8_t RadioTransceiver::spi_read(uint8_t address) {
   return this->spi_transaction(0x00, address, {0});
 }
 
+void RadioTransceiver::spi_read(uint8_t address, uint8_t *data,
+                                size_t length) {
+  this->delegate_->begin_transaction();
+  this->delegate_->transfer(address);
+  for (size_t i = 0; i < length; i++)
+    data[i] = this->delegate_->transfer(0x00);
+  this->delegate_->end_transaction();
+}
+
 void RadioTransceiver::spi_write(uint8_t address,
                                  std::initializer_list<uint8_t> data) {
   this->spi_transaction(0x80, address, data);
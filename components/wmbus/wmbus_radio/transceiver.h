@@ -8,34 +8,11 @@
 #include <initializer_list>
 #include <vector>
 
+#define BYTE(val, n) (((val) >> (8 * (n))) & 0xFF)
+
 namespace esphome {
 namespace wmbus_radio {
 
-class Frame {
- public:
-  Frame(const std::vector<uint8_t> &data, int8_t rssi) : data_(data), rssi_(rssi) {}
-
-  const std::vector<uint8_t> &data() const { return data_; }
-  int8_t rssi() const { return rssi_; }
-
-  std::string as_hex() const {
-    std::string result;
-    for (uint8_t byte : data_) {
-      result += str_sprintf("%02X", byte);
-    }
-    return result;
-  }
-
-  std::string as_rtlwmbus() const {
-    // Format for rtl_wmbus compatibility
-    return str_sprintf("T1;%d;%s", rssi_, as_hex().c_str());
-  }
-
- private:
-  std::vector<uint8_t> data_;
-  int8_t rssi_;
-};
-
 class RadioTransceiver {
  public:
   virtual ~RadioTransceiver() = default;
@@ -44,12 +21,27 @@ class RadioTransceiver {
   virtual void setup() = 0;
   virtual optional<uint8_t> read() = 0;
   virtual void restart_rx() = 0;
+  // Lowest power state keeping configuration, left by restart_rx
+  virtual void standby() = 0;
   virtual int8_t get_rssi() = 0;
   virtual const char *get_name() = 0;
 
+  // Read up to length bytes available right now, returns number of bytes read
+  virtual size_t read_bulk(uint8_t *buffer, size_t length);
+  // True if data interrupt is raised once FIFO holds the bytes read_bulk was
+  // asked for, so reading can block on it instead of polling
+  virtual bool has_fifo_threshold_interrupt() { return false; }
+
   // Common methods
   bool read_in_task(uint8_t *buffer, size_t length);
-  void attach_data_interrupt(void (*func)(TaskHandle_t *), TaskHandle_t *arg);
+  template<typename T> void attach_data_interrupt(void (*func)(T *), T *arg) {
+    if (this->data_pin_ == nullptr)
+      return;
+
+    auto *pin = static_cast<InternalGPIOPin *>(this->data_pin_);
+    pin->setup();
+    pin->attach_interrupt(func, arg, gpio::INTERRUPT_RISING_EDGE);
+  }
 
   void set_spi_delegate(spi::SPIDevice *delegate) { this->delegate_ = delegate; }
   void set_reset_pin(InternalGPIOPin *pin);
@@ -57,6 +49,8 @@ class RadioTransceiver {
   void set_sync_pin(GPIOPin *pin) { this->sync_pin_ = pin; }
   void set_irq_pin(InternalGPIOPin *pin);
   void set_frequency(float frequency_mhz) { this->frequency_mhz_ = frequency_mhz; }
+  // SX1276 only: signal FIFO level on DIO1 instead of FIFO empty
+  void set_fifo_level_mode(bool enabled) { this->fifo_level_mode_ = enabled; }
 
   void dump_config();
 
@@ -67,6 +61,7 @@ class RadioTransceiver {
 
   uint8_t spi_transaction(uint8_t operation, uint8_t address, std::initializer_list<uint8_t> data);
   uint8_t spi_read(uint8_t address);
+  void spi_read(uint8_t address, uint8_t *data, size_t length);
   void spi_write(uint8_t address, std::initializer_list<uint8_t> data);
   void spi_write(uint8_t address, uint8_t data);
 
@@ -76,6 +71,7 @@ class RadioTransceiver {
   GPIOPin *sync_pin_{nullptr};   // GDO2 for CC1101
   InternalGPIOPin *irq_pin_{nullptr};    // IRQ for SX1276
   float frequency_mhz_{868.95};
+  bool fifo_level_mode_{false};
 };
 
 }  // namespace wmbus_radio
@@ -1,4 +1,7 @@
 #include "transceiver_cc1101.h"
+
+#include <algorithm>
+
 #include "esphome/core/log.h"
 #include "esphome/core/hal.h"
 
@@ -78,6 +81,12 @@ static const char *TAG = "CC1101";
 #define CC1101_TXBYTES      0x3A  // Underflow and # of bytes in TXFIFO
 #define CC1101_RXBYTES      0x3B  // Overflow and # of bytes in RXFIFO
 
+// MARCSTATE values
+#define MARCSTATE_IDLE      0x01
+#define MARCSTATE_RX        0x0D
+// IDLE to RX with calibration takes about 800 us
+#define MARCSTATE_TIMEOUT_US 2000
+
 // FIFO access
 #define CC1101_TXFIFO       0x3F  // TX FIFO
 #define CC1101_RXFIFO       0x3F  // RX FIFO
@@ -85,7 +94,11 @@ static const char *TAG = "CC1101";
 // Crystal frequency
 static constexpr uint32_t F_OSC = 26000000; // 26 MHz crystal
 
-#define BYTE(val, n) (((val) >> (8 * (n))) & 0xFF)
+// RX FIFO threshold goes in steps of 4 bytes, up to 64 bytes
+#define RX_FIFO_THRESHOLD_STEP 4
+#define RX_FIFO_THRESHOLD_MAX 64
+// Radio::receive_frame starts every frame with reading the 3-byte preamble
+#define PREAMBLE_SIZE 3
 
 void CC1101::strobe_(uint8_t command) {
   this->delegate_->begin_transaction();
@@ -116,10 +129,12 @@ void CC1101::setup_rf_settings_() {
   write_register_(CC1101_IOCFG2, 0x2E);  // High impedance (3-state)
   
   // GDO0 output pin configuration - RX FIFO threshold reached
+  // Deasserts once drained below threshold, so every burst read re-arms it
   write_register_(CC1101_IOCFG0, 0x00);  // Assert when RX FIFO threshold reached
   
-  // RX FIFO and TX FIFO thresholds - 4 bytes in FIFO
-  write_register_(CC1101_FIFOTHR, 0x00);  // 4 bytes in TX FIFO, 60 bytes in RX FIFO
+  // RX FIFO and TX FIFO thresholds - 4 bytes in FIFO, adjusted by read_bulk
+  this->fifo_threshold_ = 0xFF;
+  set_rx_fifo_threshold_(PREAMBLE_SIZE + 1);
   
   // Sync word for wMBus T-mode
   write_register_(CC1101_SYNC1, 0x54);
@@ -192,8 +207,12 @@ uint8_t CC1101::get_chip_version_() {
 }
 
 bool CC1101::is_fifo_available_() {
+  return get_rx_bytes_() > 0;
+}
+
+uint8_t CC1101::get_rx_bytes_() {
   uint8_t rxbytes = read_register_(CC1101_RXBYTES | 0xC0); // Status register
-  return (rxbytes & 0x7F) > 0; // Check if FIFO has data (ignore overflow bit)
+  return rxbytes & 0x7F; // Number of bytes in FIFO (ignore overflow bit)
 }
 
 void CC1101::setup() {
@@ -218,12 +237,7 @@ void CC1101::setup() {
   setup_rf_settings_();
   
   // Set radio frequency
-  const uint32_t frequency_hz =
-      static_cast<uint32_t>(this->frequency_mhz_ * 1e6f);
-  uint32_t frf = ((uint64_t) frequency_hz * (1 << 16)) / F_OSC;
-  write_register_(CC1101_FREQ2, BYTE(frf, 2));
-  write_register_(CC1101_FREQ1, BYTE(frf, 1));
-  write_register_(CC1101_FREQ0, BYTE(frf, 0));
+  write_frequency_();
 
   // Read back frequency registers to log the actual frequency set
   uint8_t freq2 = read_register_(CC1101_FREQ2);
@@ -271,21 +285,89 @@ optional<uint8_t> CC1101::read() {
   return byte;
 }
 
+size_t CC1101::read_bulk(uint8_t *buffer, size_t length) {
+  size_t count = get_rx_bytes_();
+
+  // GDO0 rises once the whole chunk and one more byte are there, so the task
+  // wakes up once per chunk and the errata below does not split it. Radio
+  // keeps receiving after the frame in infinite packet length mode, so the
+  // threshold is reached after a short last chunk too.
+  if (count <= length)
+    set_rx_fifo_threshold_(length + 1);
+
+  // Errata: the last byte must not be read while more bytes are expected,
+  // as it may be read while being written by the radio
+  if (count < length)
+    count = count > 1 ? count - 1 : 0;
+  else
+    count = length;
+
+  if (!count)
+    return 0;
+
+  // Drain all available bytes within a single transaction
+  this->delegate_->begin_transaction();
+  this->delegate_->transfer(CC1101_RXFIFO | 0xC0); // Burst read from RX FIFO
+  for (size_t i = 0; i < count; i++)
+    buffer[i] = this->delegate_->transfer(0x00);
+  this->delegate_->end_transaction();
+
+  return count;
+}
+
+void CC1101::set_rx_fifo_threshold_(size_t bytes) {
+  bytes = std::min<size_t>(bytes, RX_FIFO_THRESHOLD_MAX);
+  // FIFO_THR n: RX threshold of 4 * (n + 1) bytes, TX one of 61 - 4 * n
+  uint8_t threshold =
+      (bytes + RX_FIFO_THRESHOLD_STEP - 1) / RX_FIFO_THRESHOLD_STEP - 1;
+  if (threshold == this->fifo_threshold_)
+    return;
+  write_register_(CC1101_FIFOTHR, threshold);
+  this->fifo_threshold_ = threshold;
+}
+
+void CC1101::write_frequency_() {
+  const uint32_t frequency_hz =
+      static_cast<uint32_t>(this->frequency_mhz_ * 1e6f);
+  uint32_t frf = ((uint64_t) frequency_hz * (1 << 16)) / F_OSC;
+  write_register_(CC1101_FREQ2, BYTE(frf, 2));
+  write_register_(CC1101_FREQ1, BYTE(frf, 1));
+  write_register_(CC1101_FREQ0, BYTE(frf, 0));
+}
+
 void CC1101::restart_rx() {
   // Go to IDLE state
   strobe_(CC1101_SIDLE);
-  delayMicroseconds(100);
+  wait_marcstate_(MARCSTATE_IDLE);
   
   // Flush RX FIFO
   flush_rx_fifo_();
+  // Wake up receiver task as soon as the preamble is there
+  set_rx_fifo_threshold_(PREAMBLE_SIZE + 1);
   
-  // Restart RX
+  // Restart RX (includes frequency synthesizer calibration, see MCSM0)
   strobe_(CC1101_SRX);
-  delayMicroseconds(100);
+  wait_marcstate_(MARCSTATE_RX);
   
   ESP_LOGVV(TAG, "RX restarted");
 }
 
+void CC1101::standby() {
+  // SLEEP would lose PATABLE and test registers, so stay in IDLE
+  strobe_(CC1101_SIDLE);
+}
+
+bool CC1101::wait_marcstate_(uint8_t state) {
+  // Poll state machine instead of sleeping for the worst case
+  const uint32_t start = micros();
+  while ((read_register_(CC1101_MARCSTATE | 0xC0) & 0x1F) != state)
+    if (micros() - start > MARCSTATE_TIMEOUT_US) {
+      ESP_LOGD(TAG, "MARC state 0x%02X not reached", state);
+      return false;
+    }
+  return true;
+}
+
 int8_t CC1101::get_rssi() {
   // Read RSSI from status register
   uint8_t rssi_raw = read_register_(CC1101_RSSI | 0xC0);
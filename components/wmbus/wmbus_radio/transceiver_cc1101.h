@@ -8,7 +8,10 @@ class CC1101 : public RadioTransceiver {
 public:
   void setup() override;
   optional<uint8_t> read() override;
+  size_t read_bulk(uint8_t *buffer, size_t length) override;
+  bool has_fifo_threshold_interrupt() override { return true; }
   void restart_rx() override;
+  void standby() override;
   int8_t get_rssi() override;
   const char *get_name() override;
 
@@ -17,10 +20,16 @@ private:
   uint8_t read_register_(uint8_t address);
   void write_register_(uint8_t address, uint8_t value);
   void setup_rf_settings_();
+  void write_frequency_();
   void flush_rx_fifo_();
   void flush_tx_fifo_();
   uint8_t get_chip_version_();
   bool is_fifo_available_();
+  uint8_t get_rx_bytes_();
+  bool wait_marcstate_(uint8_t state);
+  void set_rx_fifo_threshold_(size_t bytes);
+  // FIFOTHR value last written, unknown until setup
+  uint8_t fifo_threshold_{0xFF};
 };
 
 } // namespace wmbus_radio
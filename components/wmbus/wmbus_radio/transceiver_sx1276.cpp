@@ -1,8 +1,16 @@
 #include "transceiver_sx1276.h"
 
+#include <algorithm>
+
 #include "esphome/core/log.h"
 
 #define F_OSC (32000000)
+// Radio::receive_frame starts every frame with reading the 3-byte preamble
+#define PREAMBLE_SIZE (3)
+// Burst must fill up within the 1 ms read_in_task wait (12 bytes at 100 kcps)
+#define MAX_BURST_SIZE (8)
+// Upper bound for mode changes, former fixed delay
+#define MODE_READY_TIMEOUT_US (5000)
 
 namespace esphome {
 namespace wmbus_radio {
@@ -24,10 +32,7 @@ void SX1276::setup() {
   }
 
   ESP_LOGVV(TAG, "setting radio frequency");
-  const uint32_t frequency = 868950000;
-
-  uint32_t frf = ((uint64_t)frequency * (1 << 19)) / F_OSC;
-  this->spi_write(0x06, {BYTE(frf, 2), BYTE(frf, 1), BYTE(frf, 0)});
+  this->write_frequency_();
 
   // TODO: Calculate in some rational way
   ESP_LOGVV(TAG, "setting radio bandwidth");
@@ -75,9 +80,16 @@ void SX1276::setup() {
   uint8_t packet_mode = 0;
   this->spi_write(0x32, packet_mode);
 
-  ESP_LOGVV(TAG, "set fifo empty flag on DIO1");
-  uint8_t fifo_empty_flag = 0b01 << 4;
-  this->spi_write(0x40, fifo_empty_flag);
+  if (this->fifo_level_mode_) {
+    ESP_LOGVV(TAG, "set fifo level flag on DIO1");
+    uint8_t fifo_level_flag = 0b00 << 4;
+    this->spi_write(0x40, fifo_level_flag);
+    this->set_fifo_threshold_(PREAMBLE_SIZE - 1);
+  } else {
+    ESP_LOGVV(TAG, "set fifo empty flag on DIO1");
+    uint8_t fifo_empty_flag = 0b01 << 4;
+    this->spi_write(0x40, fifo_empty_flag);
+  }
 
   ESP_LOGVV(TAG, "set RRSI smoothing");
   uint8_t rssi_smoothing = 0b111;
@@ -93,17 +105,67 @@ optional<uint8_t> SX1276::read() {
   return {};
 }
 
+size_t SX1276::read_bulk(uint8_t *buffer, size_t length) {
+  if (!this->fifo_level_mode_)
+    return RadioTransceiver::read_bulk(buffer, length);
+
+  // FifoLevel is set once FIFO holds more than threshold bytes, so aim the
+  // threshold at the requested chunk and drain it within one transaction
+  uint8_t count = std::min<size_t>(length, MAX_BURST_SIZE);
+  this->set_fifo_threshold_(count - 1);
+
+  if (this->irq_pin_->digital_read() == false)
+    return 0;
+
+  this->spi_read(0x00, buffer, count);
+  return count;
+}
+
+void SX1276::set_fifo_threshold_(uint8_t threshold) {
+  if (threshold == this->fifo_threshold_)
+    return;
+  // Keep TxStartCondition (FifoEmpty negated) as in reset value
+  this->spi_write(0x35, (uint8_t)((1 << 7) | threshold));
+  this->fifo_threshold_ = threshold;
+}
+
+void SX1276::write_frequency_() {
+  const uint32_t frequency = this->frequency_mhz_ * 1e6f;
+  uint32_t frf = ((uint64_t)frequency * (1 << 19)) / F_OSC;
+  this->spi_write(0x06, {BYTE(frf, 2), BYTE(frf, 1), BYTE(frf, 0)});
+}
+
 void SX1276::restart_rx() {
   // Standby mode
   this->spi_write(0x01, (uint8_t)0b001);
-  delay(5);
+  this->wait_mode_ready_();
 
   // Clear FIFO
   this->spi_write(0x3F, (uint8_t)(1 << 4));
 
+  if (this->fifo_level_mode_)
+    this->set_fifo_threshold_(PREAMBLE_SIZE - 1);
+
   // Enable RX
   this->spi_write(0x01, (uint8_t)0b101);
-  delay(5);
+  this->wait_mode_ready_();
+}
+
+void SX1276::standby() {
+  // Sleep mode keeps registers, restart_rx goes through standby again
+  this->spi_write(0x01, (uint8_t)0b000);
+}
+
+bool SX1276::wait_mode_ready_() {
+  // ModeReady is set as soon as requested mode is operational (RSSI sampling
+  // started in RX), typically within tens to hundreds of microseconds
+  const uint32_t start = micros();
+  while (!(this->spi_read(0x3E) & (1 << 7)))
+    if (micros() - start > MODE_READY_TIMEOUT_US) {
+      ESP_LOGD(TAG, "Mode not ready after %d us", MODE_READY_TIMEOUT_US);
+      return false;
+    }
+  return true;
 }
 
 int8_t SX1276::get_rssi() {
@@ -7,9 +7,17 @@ class SX1276 : public RadioTransceiver {
 public:
   void setup() override;
   optional<uint8_t> read() override;
+  size_t read_bulk(uint8_t *buffer, size_t length) override;
   void restart_rx() override;
+  void standby() override;
   int8_t get_rssi() override;
   const char *get_name() override;
+
+protected:
+  void set_fifo_threshold_(uint8_t threshold);
+  void write_frequency_();
+  bool wait_mode_ready_();
+  uint8_t fifo_threshold_{0x0F}; // Reset value
 };
 } // namespace wmbus_radio
 } // namespace esphome
@@ -0,0 +1,51 @@
+#include "transmission_interval.h"
+
+namespace esphome {
+namespace wmbus_radio {
+bool TransmissionInterval::record(uint32_t now_ms) {
+  if (!this->seen_) {
+    this->seen_ = true;
+    this->last_ms_ = now_ms;
+    return true;
+  }
+
+  auto delta = now_ms - this->last_ms_;
+  if (delta < MIN_INTERVAL_MS)
+    return false;
+  this->last_ms_ = now_ms;
+
+  if (!this->interval_ms_) {
+    this->interval_ms_ = delta;
+    return true;
+  }
+
+  auto periods = (delta + this->interval_ms_ / 2) / this->interval_ms_;
+  if (!periods) {
+    // Learned interval spanned missed telegrams
+    this->interval_ms_ = delta;
+    return true;
+  }
+  // Smooth out jitter of the transmitter
+  this->interval_ms_ = (3 * this->interval_ms_ + delta / periods) / 4;
+  this->captured_++;
+  this->missed_ += periods - 1;
+  return true;
+}
+
+uint32_t TransmissionInterval::expected(uint32_t now_ms,
+                                        uint32_t guard_ms) const {
+  if (!this->interval_ms_)
+    return 0;
+  // Missed arrivals whose window has already closed are skipped
+  uint32_t elapsed = now_ms - this->last_ms_;
+  uint32_t periods = 1;
+  if (elapsed > guard_ms)
+    periods = (elapsed - guard_ms) / this->interval_ms_ + 1;
+  if (periods > MAX_MISSED + 1)
+    return 0;
+  // Zero means no expectation, so shift it by a millisecond if needed
+  auto expected = this->last_ms_ + periods * this->interval_ms_;
+  return expected ? expected : 1;
+}
+} // namespace wmbus_radio
+} // namespace esphome
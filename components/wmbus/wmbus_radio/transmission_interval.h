@@ -0,0 +1,38 @@
+#pragma once
+#include <cstddef>
+#include <cstdint>
+
+namespace esphome {
+namespace wmbus_radio {
+// Learns the near-fixed transmission period of a meter from arrival times of
+// its telegrams and predicts the next one. Times are millis(), wrap-around
+// safe.
+class TransmissionInterval {
+public:
+  // Telegrams closer than that are repetitions, not a transmission interval
+  static const uint32_t MIN_INTERVAL_MS = 2000;
+  // Prediction is dropped after that many telegrams missed in a row
+  static const uint32_t MAX_MISSED = 3;
+
+  // Returns false for repetitions of the previous telegram
+  bool record(uint32_t now_ms);
+  // Arrival of the first telegram whose +-guard window has not closed yet,
+  // 0 if interval is not known or too many telegrams were missed since
+  uint32_t expected(uint32_t now_ms, uint32_t guard_ms) const;
+
+  bool learned() const { return this->interval_ms_; }
+  uint32_t interval_ms() const { return this->interval_ms_; }
+  uint32_t last_ms() const { return this->last_ms_; }
+  // Telegrams received and missed in between since interval is known
+  uint32_t captured() const { return this->captured_; }
+  uint32_t missed() const { return this->missed_; }
+
+protected:
+  bool seen_{false};
+  uint32_t last_ms_{0};
+  uint32_t interval_ms_{0};
+  uint32_t captured_{0};
+  uint32_t missed_{0};
+};
+} // namespace wmbus_radio
+} // namespace esphome
@@ -0,0 +1,41 @@
+#pragma once
+// Minimal helpers shared by host benchmarks. Each benchmark is a standalone
+// program built from the component sources that have no ESPHome dependency:
+//
+//   g++ -std=c++17 -O2 -o bench bench_decode3of6.cpp && ./bench [iterations]
+
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <functional>
+
+namespace bench {
+inline size_t iterations(int argc, char **argv, size_t fallback) {
+  return argc > 1 ? std::strtoul(argv[1], nullptr, 10) : fallback;
+}
+
+// Runs fn `iterations` times, returns wall time in seconds
+inline double measure(size_t iterations, const std::function<void()> &fn) {
+  auto start = std::chrono::steady_clock::now();
+  for (size_t i = 0; i < iterations; i++)
+    fn();
+  std::chrono::duration<double> elapsed =
+      std::chrono::steady_clock::now() - start;
+  return elapsed.count();
+}
+
+inline void report(const char *name, double seconds, double units,
+                   const char *unit) {
+  std::printf("%-32s %10.3f ms %14.0f %s/s\n", name, seconds * 1e3,
+              seconds > 0 ? units / seconds : 0.0, unit);
+}
+
+#define BENCH_CHECK(expr)                                                      \
+  do {                                                                         \
+    if (!(expr)) {                                                             \
+      std::fprintf(stderr, "%s:%d: check failed: %s\n", __FILE__, __LINE__,   \
+                   #expr);                                                     \
+      std::exit(1);                                                            \
+    }                                                                          \
+  } while (0)
+} // namespace bench
@@ -0,0 +1,130 @@
+// Checks the software AES backend against the NIST SP 800-38A vectors and
+// compares expanding the key for every decryption, as done per telegram
+// before, with reusing the expanded key of a meter through AESKeyCache.
+
+#include <cstring>
+#include <random>
+#include <vector>
+
+#include "bench.h"
+
+#include "../../components/wmbus/wmbus_common/aes.cc"
+
+static std::vector<uint8_t> hex(const char *s) {
+  std::vector<uint8_t> bytes;
+  for (; s[0] && s[1]; s += 2)
+    bytes.push_back(std::strtoul(std::string(s, 2).c_str(), nullptr, 16));
+  return bytes;
+}
+
+static const char *KEY = "2b7e151628aed2a6abf7158809cf4f3c";
+static const char *PLAIN = "6bc1bee22e409f96e93d7e117393172a"
+                           "ae2d8a571e03ac9c9eb76fac45af8e51"
+                           "30c81c46a35ce411e5fbc1191a0a52ef"
+                           "f69f2445df4f9b17ad2b417be66c3710";
+static const char *ECB = "3ad77bb40d7a3660a89ecaf32466ef97"
+                         "f5d3d58503b9699de785895a96fdbaaf"
+                         "43b1cd7f598ece23881b00e3ed030688"
+                         "7b0c785e27e8ad3f8223207104725dd4";
+static const char *CBC_IV = "000102030405060708090a0b0c0d0e0f";
+static const char *CBC = "7649abac8119b246cee98e9b12e9197d"
+                         "5086cb9b507219ee95db113a917678b2"
+                         "73bed6b8e3c1743b7116e69e22229516"
+                         "3ff1caa1681fac09120eca307586e1a7";
+
+int main(int argc, char **argv) {
+  auto iterations = bench::iterations(argc, argv, 100000);
+
+  auto key = hex(KEY), plain = hex(PLAIN), iv = hex(CBC_IV);
+  std::vector<uint8_t> out(plain.size());
+
+  AES_ctx ctx;
+  AES_init_ctx(&ctx, key.data());
+  for (size_t i = 0; i < plain.size(); i += AES_BLOCKLEN)
+    AES_ECB_encrypt_ctx(&ctx, &plain[i], &out[i]);
+  BENCH_CHECK(out == hex(ECB));
+  for (size_t i = 0; i < out.size(); i += AES_BLOCKLEN)
+    AES_ECB_decrypt_ctx(&ctx, &out[i], &out[i]);
+  BENCH_CHECK(out == plain);
+
+  AES_CBC_encrypt_buffer_ctx(&ctx, out.data(), plain.data(), plain.size(),
+                             iv.data());
+  BENCH_CHECK(out == hex(CBC));
+  AES_CBC_decrypt_buffer_ctx(&ctx, out.data(), out.data(), out.size(),
+                             iv.data());
+  BENCH_CHECK(out == plain && iv == hex(CBC_IV));
+
+  // The key based functions give the same results
+  auto copy = plain;
+  AES_CBC_encrypt_buffer(out.data(), copy.data(), copy.size(), key.data(),
+                         iv.data());
+  BENCH_CHECK(out == hex(CBC));
+  AES_ECB_encrypt(plain.data(), key.data(), out.data(), AES_BLOCKLEN);
+  BENCH_CHECK(std::equal(out.begin(), out.begin() + AES_BLOCKLEN,
+                         hex(ECB).begin()));
+
+  std::mt19937 rng(1);
+  for (int round = 0; round < 100; round++) {
+    uint8_t k[AES_KEYLEN], v[AES_BLOCKLEN], data[64], enc[64], dec[64];
+    for (auto *b : {k, v})
+      for (int i = 0; i < AES_BLOCKLEN; i++)
+        b[i] = rng();
+    for (auto &b : data)
+      b = rng();
+    AES_init_ctx(&ctx, k);
+    AES_CBC_encrypt_buffer_ctx(&ctx, enc, data, sizeof(data), v);
+    AES_CBC_decrypt_buffer(dec, enc, sizeof(enc), k, v);
+    BENCH_CHECK(!memcmp(dec, data, sizeof(data)));
+  }
+
+  // The cache expands again on a new key, copies do not share the context
+  AESKeyCache cache;
+  uint8_t block[AES_BLOCKLEN];
+  AES_ECB_encrypt_ctx(cache.get(key.data()), plain.data(), block);
+  BENCH_CHECK(!memcmp(block, hex(ECB).data(), AES_BLOCKLEN));
+  auto other = key;
+  other[0] ^= 1;
+  AES_ECB_encrypt_ctx(cache.get(other.data()), plain.data(), block);
+  BENCH_CHECK(memcmp(block, hex(ECB).data(), AES_BLOCKLEN));
+  AESKeyCache copied = cache;
+  AES_ECB_encrypt_ctx(copied.get(key.data()), plain.data(), block);
+  BENCH_CHECK(!memcmp(block, hex(ECB).data(), AES_BLOCKLEN));
+
+  // Mode 5 payload of a typical telegram and a four block ELL CTR stream
+  std::vector<uint8_t> payload(64), decrypted(64);
+  for (auto &b : payload)
+    b = rng();
+  volatile uint8_t sink = 0;
+
+  auto cbc_per_call = bench::measure(iterations, [&]() {
+    AES_CBC_decrypt_buffer(decrypted.data(), payload.data(), payload.size(),
+                           key.data(), iv.data());
+    sink = sink + decrypted[0];
+  });
+  auto cbc_cached = bench::measure(iterations, [&]() {
+    AES_CBC_decrypt_buffer_ctx(cache.get(key.data()), decrypted.data(),
+                               payload.data(), payload.size(), iv.data());
+    sink = sink + decrypted[0];
+  });
+  auto ctr_per_call = bench::measure(iterations, [&]() {
+    for (int i = 0; i < 4; i++) {
+      AES_ECB_encrypt(iv.data(), key.data(), block, AES_BLOCKLEN);
+      sink = sink + block[0];
+    }
+  });
+  auto ctr_cached = bench::measure(iterations, [&]() {
+    for (int i = 0; i < 4; i++) {
+      AES_ECB_encrypt_ctx(cache.get(key.data()), iv.data(), block);
+      sink = sink + block[0];
+    }
+  });
+
+  auto total = (double)iterations;
+  bench::report("cbc 64 bytes expand per call", cbc_per_call, total,
+                "telegrams");
+  bench::report("cbc 64 bytes cached key", cbc_cached, total, "telegrams");
+  bench::report("ctr 4 blocks expand per call", ctr_per_call, total,
+                "telegrams");
+  bench::report("ctr 4 blocks cached key", ctr_cached, total, "telegrams");
+  return 0;
+}
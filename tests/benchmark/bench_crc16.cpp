@@ -0,0 +1,190 @@
+// Compares the table-driven EN 13757 CRC16 and in-place DLL CRC removal with
+// the previous bit-by-bit CRC and copying block trimming, over the test
+// telegrams found in driver sources (with DLL CRCs added back).
+
+#include <cctype>
+#include <cstring>
+#include <filesystem>
+#include <fstream>
+#include <string>
+#include <vector>
+
+#include "bench.h"
+
+#include "../../components/wmbus/wmbus_common/crc16.cc"
+
+static const std::filesystem::path COMMON_DIR =
+    std::filesystem::path(__FILE__).parent_path() /
+    "../../components/wmbus/wmbus_common";
+
+static uint16_t legacy_crc16(const uint8_t *data, size_t len) {
+  uint16_t crc = 0x0000;
+  for (size_t i = 0; i < len; ++i) {
+    uint8_t b = data[i];
+    for (int bit = 0; bit < 8; bit++) {
+      if (((crc & 0x8000) >> 8) ^ (b & 0x80))
+        crc = (crc << 1) ^ CRC16_EN_13757;
+      else
+        crc = (crc << 1);
+      b <<= 1;
+    }
+  }
+  return ~crc;
+}
+
+static bool legacy_trim_format_a(std::vector<uint8_t> &payload) {
+  size_t len = payload.size();
+  std::vector<uint8_t> out;
+  if (legacy_crc16(payload.data(), 10) != (payload[10] << 8 | payload[11]))
+    return false;
+  out.insert(out.end(), payload.begin(), payload.begin() + 10);
+  size_t pos;
+  for (pos = 12; pos + 18 <= len; pos += 18) {
+    if (legacy_crc16(&payload[pos], 16) !=
+        (payload[pos + 16] << 8 | payload[pos + 17]))
+      return false;
+    out.insert(out.end(), payload.begin() + pos, payload.begin() + pos + 16);
+  }
+  if (pos < len - 2) {
+    if (legacy_crc16(&payload[pos], len - 2 - pos) !=
+        (payload[len - 2] << 8 | payload[len - 1]))
+      return false;
+    out.insert(out.end(), payload.begin() + pos, payload.begin() + len - 2);
+  }
+  out[0] = out.size() - 1;
+  payload = out;
+  return true;
+}
+
+static std::vector<std::vector<uint8_t>> driver_telegrams() {
+  std::vector<std::vector<uint8_t>> telegrams;
+  for (auto &entry : std::filesystem::directory_iterator(COMMON_DIR)) {
+    if (entry.path().filename().string().rfind("driver_", 0))
+      continue;
+    std::ifstream file(entry.path());
+    std::string line;
+    while (std::getline(file, line)) {
+      auto start = line.find("telegram=|");
+      if (start == std::string::npos)
+        continue;
+      std::vector<uint8_t> telegram;
+      std::string hex;
+      for (auto c : line.substr(start + 10)) {
+        if (c == '|')
+          break;
+        if (std::isxdigit((unsigned char)c))
+          hex += c;
+      }
+      for (size_t i = 0; i + 1 < hex.size(); i += 2)
+        telegram.push_back(std::stoi(hex.substr(i, 2), nullptr, 16));
+      if (telegram.size() >= 11)
+        telegrams.push_back(telegram);
+    }
+  }
+  return telegrams;
+}
+
+static void append_crc(std::vector<uint8_t> &out, const uint8_t *data,
+                       size_t len) {
+  out.insert(out.end(), data, data + len);
+  auto crc = legacy_crc16(data, len);
+  out.push_back(crc >> 8);
+  out.push_back(crc & 0xFF);
+}
+
+static std::vector<uint8_t> with_crcs_format_a(const std::vector<uint8_t> &t) {
+  std::vector<uint8_t> out;
+  append_crc(out, t.data(), 10);
+  for (size_t pos = 10; pos < t.size(); pos += 16)
+    append_crc(out, t.data() + pos, std::min<size_t>(16, t.size() - pos));
+  return out;
+}
+
+static std::vector<uint8_t> with_crcs_format_b(const std::vector<uint8_t> &t) {
+  std::vector<uint8_t> out;
+  append_crc(out, t.data(), std::min<size_t>(126, t.size()));
+  if (t.size() > 126)
+    append_crc(out, t.data() + 126, t.size() - 126);
+  return out;
+}
+
+int main(int argc, char **argv) {
+  auto iterations = bench::iterations(argc, argv, 500);
+
+  auto telegrams = driver_telegrams();
+  BENCH_CHECK(telegrams.size() > 100);
+
+  std::vector<std::vector<uint8_t>> frames;
+  size_t bytes = 0;
+  for (auto &telegram : telegrams) {
+    for (size_t len : {(size_t)10, (size_t)16, telegram.size()})
+      BENCH_CHECK(crc16_EN13757(telegram.data(), std::min(len, telegram.size())) ==
+                  legacy_crc16(telegram.data(), std::min(len, telegram.size())));
+
+    auto expected = telegram;
+    expected[0] = expected.size() - 1;
+    size_t failed_block;
+
+    auto frame = with_crcs_format_a(telegram);
+    auto legacy = frame;
+    BENCH_CHECK(legacy_trim_format_a(legacy) && legacy == expected);
+    auto stripped = frame;
+    auto len = stripDLLCRCsFrameFormatA(stripped.data(), stripped.size(),
+                                        &failed_block);
+    stripped.resize(len);
+    stripped[0] = len - 1;
+    BENCH_CHECK(stripped == expected);
+    frames.push_back(frame);
+    bytes += frame.size();
+
+    frame = with_crcs_format_b(telegram);
+    stripped = frame;
+    len = stripDLLCRCsFrameFormatB(stripped.data(), stripped.size(),
+                                   &failed_block);
+    stripped.resize(len);
+    stripped[0] = len - 1;
+    BENCH_CHECK(stripped == expected);
+
+    // Corrupted last block is reported and leaves data untouched
+    frame = with_crcs_format_a(telegram);
+    frame[frame.size() - 3] ^= 0x01;
+    stripped = frame;
+    BENCH_CHECK(!stripDLLCRCsFrameFormatA(stripped.data(), stripped.size(),
+                                          &failed_block));
+    BENCH_CHECK(stripped == frame && failed_block > 0);
+  }
+
+  volatile uint16_t sink = 0;
+  auto legacy_crc = bench::measure(iterations, [&]() {
+    for (auto &frame : frames)
+      sink = sink + legacy_crc16(frame.data(), frame.size());
+  });
+  auto table_crc = bench::measure(iterations, [&]() {
+    for (auto &frame : frames)
+      sink = sink + crc16_EN13757(frame.data(), frame.size());
+  });
+
+  std::vector<std::vector<uint8_t>> work = frames;
+  auto legacy_trim = bench::measure(iterations, [&]() {
+    for (size_t i = 0; i < frames.size(); i++) {
+      work[i] = frames[i];
+      legacy_trim_format_a(work[i]);
+    }
+  });
+  size_t failed_block;
+  auto in_place_trim = bench::measure(iterations, [&]() {
+    for (size_t i = 0; i < frames.size(); i++) {
+      work[i] = frames[i];
+      work[i].resize(stripDLLCRCsFrameFormatA(work[i].data(), work[i].size(),
+                                              &failed_block));
+    }
+  });
+
+  auto total = (double)bytes * iterations;
+  bench::report("crc16 bit by bit", legacy_crc, total, "bytes");
+  bench::report("crc16 table", table_crc, total, "bytes");
+  bench::report("trim format A copying", legacy_trim, total, "bytes");
+  bench::report("trim format A in place", in_place_trim, total, "bytes");
+  std::printf("%zu driver telegrams\n", telegrams.size());
+  return 0;
+}
@@ -0,0 +1,148 @@
+// Compares the table-driven 3-out-of-6 decoder with the previous
+// std::map/std::vector based implementation on max-length T1 frames, and
+// checks that streamed in-place decoding matches one-shot decoding.
+
+#include <algorithm>
+#include <map>
+#include <optional>
+#include <vector>
+
+#include "bench.h"
+
+#include "../../components/wmbus/wmbus_radio/decode3of6.cpp"
+
+using namespace esphome::wmbus_radio;
+
+static std::optional<std::vector<uint8_t>>
+legacy_decode3of6(std::vector<uint8_t> &coded_data) {
+  static const std::map<uint8_t, uint8_t> lookupTable = {
+      {0b010110, 0x0}, {0b001101, 0x1}, {0b001110, 0x2}, {0b001011, 0x3},
+      {0b011100, 0x4}, {0b011001, 0x5}, {0b011010, 0x6}, {0b010011, 0x7},
+      {0b101100, 0x8}, {0b100101, 0x9}, {0b100110, 0xA}, {0b100011, 0xB},
+      {0b110100, 0xC}, {0b110001, 0xD}, {0b110010, 0xE}, {0b101001, 0xF},
+  };
+
+  std::vector<uint8_t> decodedBytes;
+  auto segments = coded_data.size() * 8 / 6;
+  auto data = coded_data.data();
+
+  for (size_t i = 0; i < segments; i++) {
+    auto bit_idx = i * 6;
+    auto byte_idx = bit_idx / 8;
+    auto bit_offset = bit_idx % 8;
+
+    uint8_t code = (data[byte_idx] << bit_offset);
+    if (bit_offset > 0)
+      code |= (data[byte_idx + 1] >> (8 - bit_offset));
+    code >>= 2;
+
+    auto it = lookupTable.find(code);
+    if (it == lookupTable.end())
+      return {};
+
+    if (i % 2 == 0)
+      decodedBytes.push_back(it->second << 4);
+    else
+      decodedBytes.back() |= it->second;
+  }
+
+  return decodedBytes;
+}
+
+static std::vector<uint8_t> encode3of6(const std::vector<uint8_t> &data) {
+  static const uint8_t codes[16] = {
+      0b010110, 0b001101, 0b001110, 0b001011, 0b011100, 0b011001,
+      0b011010, 0b010011, 0b101100, 0b100101, 0b100110, 0b100011,
+      0b110100, 0b110001, 0b110010, 0b101001,
+  };
+  std::vector<uint8_t> coded(encoded_size(data.size()));
+  size_t bit = 0;
+  for (auto byte : data)
+    for (auto nibble : {byte >> 4, byte & 0x0F}) {
+      for (int b = 5; b >= 0; b--, bit++)
+        if (codes[nibble] & (1 << b))
+          coded[bit / 8] |= 0x80 >> (bit % 8);
+    }
+  return coded;
+}
+
+int main(int argc, char **argv) {
+  auto iterations = bench::iterations(argc, argv, 20000);
+
+  // Longest T1 frame: L-field 255 -> 290 bytes with CRCs
+  std::vector<uint8_t> plain(290);
+  for (size_t i = 0; i < plain.size(); i++)
+    plain[i] = (i * 37 + 11) & 0xFF;
+
+  for (size_t size : {1, 2, 3, 4, 5, 289, 290}) {
+    std::vector<uint8_t> input(plain.begin(), plain.begin() + size);
+    auto coded = encode3of6(input);
+    auto legacy = legacy_decode3of6(coded);
+    auto decoded = decode3of6(coded);
+    BENCH_CHECK(legacy && decoded && *legacy == *decoded);
+    BENCH_CHECK(decoded->size() == decoded_size(coded.size()));
+    BENCH_CHECK(*decoded == input);
+
+    auto in_place = coded;
+    auto n = decode3of6(in_place.data(), in_place.size(), in_place.data());
+    BENCH_CHECK(std::equal(input.begin(), input.end(), in_place.begin()) &&
+                n == input.size());
+  }
+
+  // Preamble first, then chunks of varying size, as in Radio::receive_frame
+  for (size_t chunk : {1, 2, 3, 7, 24, 290}) {
+    auto coded = encode3of6(plain);
+    Decoder3of6 decoder;
+    size_t received = 3;
+    BENCH_CHECK(decoder.advance(coded.data(), received));
+    BENCH_CHECK(decoder.size() == 2 && coded[0] == plain[0]);
+    while (received < coded.size()) {
+      received = std::min(received + chunk, coded.size());
+      BENCH_CHECK(received < coded.size()
+                      ? decoder.advance(coded.data(), received)
+                      : decoder.finish(coded.data(), received));
+    }
+    BENCH_CHECK(decoder.size() == plain.size());
+    BENCH_CHECK(std::equal(plain.begin(), plain.end(), coded.begin()));
+  }
+
+  auto coded = encode3of6(plain);
+  auto invalid = coded;
+  invalid[100] = 0x00;
+  BENCH_CHECK(!legacy_decode3of6(invalid) && !decode3of6(invalid));
+  Decoder3of6 failing;
+  BENCH_CHECK(!failing.advance(invalid.data(), invalid.size()));
+  BENCH_CHECK(failing.failed() && !failing.finish(invalid.data(), 300));
+
+  double symbols = double(iterations) * (coded.size() * 8 / 6);
+  std::vector<uint8_t> buffer(decoded_size(coded.size()));
+  std::vector<uint8_t> in_place(coded.size());
+  volatile uint8_t sink = 0;
+
+  auto legacy_time = bench::measure(iterations, [&] {
+    sink = sink + (*legacy_decode3of6(coded))[0];
+  });
+  auto table_time = bench::measure(iterations, [&] {
+    decode3of6(coded.data(), coded.size(), buffer.data());
+    sink = sink + buffer[0];
+  });
+  auto stream_time = bench::measure(iterations, [&] {
+    std::copy(coded.begin(), coded.end(), in_place.begin());
+    Decoder3of6 decoder;
+    for (size_t received = 3; received < coded.size(); received += 24)
+      decoder.advance(in_place.data(), received);
+    decoder.finish(in_place.data(), in_place.size());
+    sink = sink + in_place[0];
+  });
+  auto copy_time = bench::measure(iterations, [&] {
+    std::copy(coded.begin(), coded.end(), in_place.begin());
+    sink = sink + in_place[0];
+  });
+
+  bench::report("decode3of6 (std::map, legacy)", legacy_time, symbols,
+                "symbols");
+  bench::report("decode3of6 (lookup table)", table_time, symbols, "symbols");
+  bench::report("Decoder3of6 (streamed, in place)", stream_time - copy_time,
+                symbols, "symbols");
+  return 0;
+}
@@ -0,0 +1,208 @@
+// Compares picking a driver through the auto-detection index with walking the
+// detection list of every driver, over the detection triples found in driver
+// sources, their lower case manufacturer variants and unknown meters. Also
+// compares looking up drivers by name and alias through the name index with
+// the map lookup followed by scanning the aliases of every driver.
+
+#include <filesystem>
+#include <fstream>
+#include <map>
+#include <regex>
+#include <string>
+#include <vector>
+
+#include "bench.h"
+
+#include "../../components/wmbus/wmbus_common/driver_index.h"
+
+static const std::filesystem::path COMMON_DIR =
+    std::filesystem::path(__FILE__).parent_path() /
+    "../../components/wmbus/wmbus_common";
+
+struct Detect {
+  uint16_t mfct;
+  uint8_t type;
+  uint8_t version;
+};
+
+struct Driver {
+  std::string name;
+  std::vector<std::string> aliases;
+  std::vector<Detect> detect;
+
+  // Same as DriverInfo::detect
+  bool matches(uint16_t mfct, uint8_t type, uint8_t version) const {
+    for (auto &dd : detect)
+      if ((dd.mfct & 0x7fff) == (mfct & 0x7fff) && dd.type == type &&
+          dd.version == version)
+        return true;
+    return false;
+  }
+};
+
+static uint16_t manfcode(const std::string &code) {
+  return (code[0] - 64) * 1024 + (code[1] - 64) * 32 + (code[2] - 64);
+}
+
+static std::vector<Driver> parse_drivers() {
+  static const std::regex name_re("setName\\(\"([^\"]+)\"\\)");
+  static const std::regex alias_re("addNameAlias\\(\"([^\"]+)\"\\)");
+  static const std::regex detect_re(
+      "addDetection\\((?:MANUFACTURER_([A-Z]{3})|(0x[0-9a-fA-F]+))[^,]*,"
+      "\\s*(0x[0-9a-fA-F]+|-?\\d+)\\s*,\\s*(0x[0-9a-fA-F]+|-?\\d+)\\s*\\)");
+
+  std::vector<Driver> drivers;
+  for (auto &entry : std::filesystem::directory_iterator(COMMON_DIR)) {
+    if (entry.path().filename().string().rfind("driver_", 0))
+      continue;
+    std::ifstream file(entry.path());
+    std::string text, line;
+    while (std::getline(file, line))
+      if (line.find("//") == std::string::npos ||
+          line.find("//") > line.find("di."))
+        text += line + "\n";
+
+    std::smatch match;
+    if (!std::regex_search(text, match, name_re))
+      continue;
+    Driver driver{match[1], {}, {}};
+    for (std::sregex_iterator i(text.begin(), text.end(), alias_re), end;
+         i != end; ++i)
+      driver.aliases.push_back((*i)[1]);
+    for (std::sregex_iterator i(text.begin(), text.end(), detect_re), end;
+         i != end; ++i) {
+      auto &m = *i;
+      uint16_t mfct = m[1].matched ? manfcode(m[1])
+                                   : std::stoul(m[2], nullptr, 16);
+      driver.detect.push_back({mfct, (uint8_t)std::stol(m[3], nullptr, 0),
+                               (uint8_t)std::stol(m[4], nullptr, 0)});
+    }
+    drivers.push_back(driver);
+  }
+  return drivers;
+}
+
+static const Driver *linear_pick(const std::vector<Driver> &drivers,
+                                 const Detect &t) {
+  for (auto &driver : drivers)
+    if (driver.matches(t.mfct, t.type, t.version))
+      return &driver;
+  return nullptr;
+}
+
+static const Driver *indexed_pick(const DriverDetectIndex<const Driver> &index,
+                                  const Detect &t) {
+  auto &found = index.find(t.mfct, t.type, t.version);
+  return found.empty() ? nullptr : found.front();
+}
+
+// Former lookupDriver
+static const Driver *map_lookup(const std::map<std::string, Driver *> &drivers,
+                                const std::string &name) {
+  auto i = drivers.find(name);
+  if (i != drivers.end())
+    return i->second;
+  for (auto &entry : drivers)
+    for (auto &alias : entry.second->aliases)
+      if (alias == name)
+        return entry.second;
+  return nullptr;
+}
+
+int main(int argc, char **argv) {
+  auto iterations = bench::iterations(argc, argv, 2000);
+
+  auto drivers = parse_drivers();
+  BENCH_CHECK(drivers.size() >= 90);
+
+  DriverDetectIndex<const Driver> index;
+  size_t detections = 0;
+  for (auto &driver : drivers)
+    for (auto &dd : driver.detect) {
+      index.add(dd.mfct, dd.type, dd.version, &driver);
+      detections++;
+    }
+  BENCH_CHECK(detections > 200);
+
+  // registerDriver only logs a taken triple (qwater and wme5 share one), the
+  // first registered driver keeps winning
+  std::vector<Detect> telegrams;
+  size_t shared = 0;
+  for (auto &driver : drivers)
+    for (auto &dd : driver.detect) {
+      shared += index.find(dd.mfct, dd.type, dd.version).front() != &driver;
+      telegrams.push_back(dd);
+      telegrams.push_back({(uint16_t)(dd.mfct | 0x8000), dd.type, dd.version});
+      telegrams.push_back({dd.mfct, dd.type, (uint8_t)(dd.version + 1)});
+      telegrams.push_back({dd.mfct, (uint8_t)(dd.type ^ 0x40), dd.version});
+    }
+  for (auto &t : telegrams)
+    BENCH_CHECK(indexed_pick(index, t) == linear_pick(drivers, t));
+
+  // Removing a driver drops all its triples and nothing else
+  auto removed = index;
+  removed.remove(&drivers.front());
+  for (auto &t : telegrams) {
+    auto expected = indexed_pick(index, t);
+    auto picked = indexed_pick(removed, t);
+    BENCH_CHECK(picked == (expected == &drivers.front() ? nullptr : expected));
+  }
+
+  volatile size_t sink = 0;
+  auto linear = bench::measure(iterations, [&]() {
+    for (auto &t : telegrams)
+      sink = sink + (linear_pick(drivers, t) != nullptr);
+  });
+  auto indexed = bench::measure(iterations, [&]() {
+    for (auto &t : telegrams)
+      sink = sink + (indexed_pick(index, t) != nullptr);
+  });
+
+  std::map<std::string, Driver *> by_name;
+  DriverNameIndex<Driver> names;
+  std::vector<std::string> lookups;
+  for (auto &driver : drivers) {
+    by_name[driver.name] = &driver;
+    names.add(driver.name, &driver, false);
+    lookups.push_back(driver.name);
+    for (auto &alias : driver.aliases) {
+      names.add(alias, &driver, true);
+      lookups.push_back(alias);
+    }
+    lookups.push_back(driver.name + "x");
+  }
+  BENCH_CHECK(names.size() > drivers.size());
+  for (auto &name : lookups)
+    BENCH_CHECK(names.find(name) == map_lookup(by_name, name));
+
+  // A driver name hides an alias of another driver, until the name is gone
+  DriverNameIndex<Driver> shadowed;
+  shadowed.add("alias", &drivers[0], true);
+  shadowed.add("alias", &drivers[1], false);
+  shadowed.add("alias", &drivers[2], true);
+  BENCH_CHECK(shadowed.find("alias") == &drivers[1]);
+  shadowed.clear();
+  shadowed.add("alias", &drivers[0], true);
+  shadowed.add("alias", &drivers[2], true);
+  BENCH_CHECK(shadowed.find("alias") == &drivers[0] && shadowed.size() == 1);
+
+  auto map_names = bench::measure(iterations, [&]() {
+    for (auto &name : lookups)
+      sink = sink + (map_lookup(by_name, name) != nullptr);
+  });
+  auto indexed_names = bench::measure(iterations, [&]() {
+    for (auto &name : lookups)
+      sink = sink + (names.find(name) != nullptr);
+  });
+
+  auto total = (double)telegrams.size() * iterations;
+  bench::report("pick driver linear", linear, total, "lookups");
+  bench::report("pick driver indexed", indexed, total, "lookups");
+  total = (double)lookups.size() * iterations;
+  bench::report("lookup name map and aliases", map_names, total, "lookups");
+  bench::report("lookup name indexed", indexed_names, total, "lookups");
+  std::printf("%zu drivers, %zu detections, %zu shared, %zu index keys, "
+              "%zu names\n",
+              drivers.size(), detections, shared, index.size(), names.size());
+  return 0;
+}
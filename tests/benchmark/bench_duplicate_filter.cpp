@@ -0,0 +1,38 @@
+// Measures lookup cost of the duplicate filter, full and with max-length
+// frames. Semantics are covered by tests/unit/host/test_duplicate_filter.cpp.
+
+#include <vector>
+
+#include "bench.h"
+
+#include "../../components/wmbus/wmbus_radio/duplicate_filter.cpp"
+
+using namespace esphome::wmbus_radio;
+
+int main(int argc, char **argv) {
+  auto iterations = bench::iterations(argc, argv, 200000);
+
+  std::vector<std::vector<uint8_t>> frames;
+  for (size_t n = 0; n < 20; n++) {
+    std::vector<uint8_t> frame(256);
+    for (size_t i = 0; i < frame.size(); i++)
+      frame[i] = (i * 31 + n * 7) & 0xFF;
+    frames.push_back(frame);
+  }
+  auto check = [](DuplicateFilter &filter, std::vector<uint8_t> &frame,
+                  uint32_t now) {
+    return filter.check(frame.data(), frame.size(), now);
+  };
+
+  DuplicateFilter filter;
+  filter.setup(16, 60000);
+  for (size_t n = 0; n < 16; n++)
+    check(filter, frames[n], 0);
+  size_t n = 0;
+  auto seconds = bench::measure(iterations, [&]() {
+    check(filter, frames[n++ % frames.size()], 0);
+  });
+  bench::report("duplicate check (16 entries)", seconds, iterations,
+                "frames");
+  return 0;
+}
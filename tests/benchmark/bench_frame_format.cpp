@@ -0,0 +1,101 @@
+// Compares frame formatters writing into a reused buffer with the previous
+// string building ones (snprintf per byte, temporary hex string appended to
+// the rtl_wmbus line) on max-length frames.
+
+#include <cstdio>
+#include <cstring>
+#include <string>
+#include <vector>
+
+#include "bench.h"
+
+#include "../../components/wmbus/wmbus_radio/frame_format.cpp"
+
+using namespace esphome::wmbus_radio;
+
+static std::string legacy_hex(const std::vector<uint8_t> &data) {
+  std::string result;
+  char byte_hex[3];
+  for (uint8_t byte : data) {
+    std::snprintf(byte_hex, sizeof(byte_hex), "%02x", byte);
+    result += byte_hex;
+  }
+  return result;
+}
+
+static std::string legacy_rtlwmbus(const std::vector<uint8_t> &data,
+                                   std::time_t t, int8_t rssi) {
+  char time_buffer[sizeof("YYYY-MM-DD HH:MM:SS.00Z")];
+  std::strftime(time_buffer, sizeof(time_buffer), "%F %T.00Z", std::gmtime(&t));
+
+  auto output = std::string{};
+  output += "T1";
+  output += ";1;1;";
+  output += time_buffer;
+  output += ';';
+  output += std::to_string(rssi);
+  output += ";;;0x";
+  output += legacy_hex(data);
+  output += "\n";
+  return output;
+}
+
+int main(int argc, char **argv) {
+  auto iterations = bench::iterations(argc, argv, 20000);
+
+  std::vector<uint8_t> data(256);
+  for (size_t i = 0; i < data.size(); i++)
+    data[i] = (i * 37 + 11) & 0xFF;
+  const std::time_t timestamp = 1700000000;
+
+  std::string buffer(rtlwmbus_size(2, data.size()), '\0');
+  std::vector<uint8_t> record(binary_record_size(data.size()));
+
+  for (int8_t rssi : {-128, -75, -5, 0, 7, 127}) {
+    auto end = write_rtlwmbus(&buffer[0], "T1", timestamp, rssi, data.data(),
+                              data.size());
+    BENCH_CHECK(std::string(buffer.data(), end) ==
+                legacy_rtlwmbus(data, timestamp, rssi));
+  }
+  auto hex_end = write_hex(&buffer[0], data.data(), data.size());
+  BENCH_CHECK(std::string(buffer.data(), hex_end) == legacy_hex(data));
+
+  auto record_end = write_binary_record(record.data(), 3, timestamp, -75,
+                                        data.data(), data.size());
+  BENCH_CHECK(record_end == record.data() + record.size());
+  BENCH_CHECK(record[0] == 3 && (int8_t)record[1] == -75);
+  BENCH_CHECK((record[2] | record[3] << 8 | record[4] << 16 |
+               (uint32_t)record[5] << 24) == timestamp);
+  BENCH_CHECK((size_t)(record[6] | record[7] << 8) == data.size());
+  BENCH_CHECK(!std::memcmp(record.data() + BINARY_RECORD_HEADER_SIZE,
+                           data.data(), data.size()));
+
+  volatile size_t sink = 0;
+  auto legacy_hex_time = bench::measure(
+      iterations, [&]() { sink = sink + legacy_hex(data).size(); });
+  auto hex_time = bench::measure(iterations, [&]() {
+    sink = sink + (write_hex(&buffer[0], data.data(), data.size()) - &buffer[0]);
+  });
+  auto legacy_rtl_time = bench::measure(iterations, [&]() {
+    sink = sink + legacy_rtlwmbus(data, timestamp, -75).size();
+  });
+  auto rtl_time = bench::measure(iterations, [&]() {
+    sink = sink + (write_rtlwmbus(&buffer[0], "T1", timestamp, -75,
+                                  data.data(), data.size()) -
+                   &buffer[0]);
+  });
+  auto binary_time = bench::measure(iterations, [&]() {
+    sink = sink + (write_binary_record(record.data(), 3, timestamp, -75,
+                                       data.data(), data.size()) -
+                   record.data());
+  });
+
+  bench::report("hex snprintf per byte", legacy_hex_time, iterations,
+                "frames");
+  bench::report("hex table", hex_time, iterations, "frames");
+  bench::report("rtl_wmbus string building", legacy_rtl_time, iterations,
+                "frames");
+  bench::report("rtl_wmbus in buffer", rtl_time, iterations, "frames");
+  bench::report("binary record in buffer", binary_time, iterations, "frames");
+  return 0;
+}
@@ -0,0 +1,22 @@
+// Measures the cost of recording a latency sample, which happens several
+// times per frame, partly in the receiver task. Bucketing and percentiles are
+// covered by tests/unit/host/test_latency_histogram.cpp.
+
+#include "bench.h"
+
+#include "../../components/wmbus/wmbus_radio/latency_histogram.cpp"
+
+using namespace esphome::wmbus_radio;
+
+int main(int argc, char **argv) {
+  auto iterations = bench::iterations(argc, argv, 10000000);
+
+  LatencyHistogram histogram;
+  uint32_t value = 0;
+  auto seconds = bench::measure(iterations, [&]() {
+    histogram.record(value);
+    value = value * 1103515245 + 12345;
+  });
+  bench::report("latency record", seconds, iterations, "samples");
+  return 0;
+}
@@ -0,0 +1,26 @@
+// Measures the cost of counting a link event, which happens in the receiver
+// task. Bucketing and counters are covered by
+// tests/unit/host/test_link_statistics.cpp.
+
+#include "bench.h"
+
+#include "../../components/wmbus/wmbus_radio/link_statistics.cpp"
+
+using namespace esphome::wmbus_radio;
+
+int main(int argc, char **argv) {
+  auto iterations = bench::iterations(argc, argv, 10000000);
+
+  LinkStatistics statistics;
+  auto seconds = bench::measure(
+      iterations, [&]() { statistics.count(LinkEvent::DECODE_ERROR); });
+  bench::report("link event count", seconds, iterations, "events");
+
+  int8_t rssi = 0;
+  seconds = bench::measure(iterations, [&]() {
+    statistics.record_frame(rssi);
+    rssi = -(int8_t)((rssi * 37 + 11) & 0x7F);
+  });
+  bench::report("link frame record", seconds, iterations, "frames");
+  return 0;
+}
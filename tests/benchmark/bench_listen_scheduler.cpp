@@ -0,0 +1,100 @@
+// Simulates a day of meters around one radio, shows capture rate and duty
+// cycle of sleeping between predicted windows against listening all the
+// time and measures the cost of a scheduling decision. Scheduling rules are
+// covered by tests/unit/host/test_listen_scheduler.cpp.
+
+#include "bench.h"
+
+#include <vector>
+
+#include "../../components/wmbus/wmbus_radio/listen_scheduler.cpp"
+#include "../../components/wmbus/wmbus_radio/transmission_interval.cpp"
+
+using namespace esphome::wmbus_radio;
+
+struct SimulatedMeter {
+  uint32_t id;
+  uint32_t interval_ms;
+  uint32_t next_ms;
+};
+
+static uint32_t random_state = 12345;
+static uint32_t random_below(uint32_t limit) {
+  random_state = random_state * 1103515245 + 12345;
+  return (random_state >> 8) % limit;
+}
+
+struct SimulationResult {
+  // Share of transmitted telegrams received
+  double capture_rate;
+  // Share of time spent listening
+  double duty_cycle;
+};
+
+// Simulates a day of 12 meters
+static SimulationResult simulate(bool sleep) {
+  ListenScheduler scheduler;
+  scheduler.set_learning(true);
+  scheduler.set_sleep(sleep);
+  scheduler.set_guard_time(300);
+
+  random_state = 12345;
+  std::vector<SimulatedMeter> meters;
+  for (uint32_t i = 0; i < 12; i++) {
+    uint32_t interval = 20000 + random_below(100000);
+    meters.push_back({i, interval, 1000 + random_below(interval)});
+    scheduler.add_meter(i);
+  }
+
+  uint32_t transmitted = 0, received = 0;
+  uint32_t wakeup_ms = 0;
+  for (uint32_t now = 0; now < 24 * 3600 * 1000; now += 10) {
+    bool wakeup = now >= wakeup_ms;
+    for (auto &meter : meters) {
+      if (now < meter.next_ms)
+        continue;
+      transmitted++;
+      if (scheduler.listening()) {
+        received++;
+        scheduler.record_frame(meter.id, now);
+        wakeup = true;
+      }
+      // Transmitter jitter of +-100 ms
+      meter.next_ms += meter.interval_ms - 100 + random_below(200);
+    }
+    if (wakeup) {
+      scheduler.update(now);
+      wakeup_ms = now + scheduler.remaining_ms(now);
+    }
+  }
+  return {(double)received / transmitted,
+          (double)scheduler.listen_ms() /
+              (scheduler.listen_ms() + scheduler.sleep_ms())};
+}
+
+int main(int argc, char **argv) {
+  auto iterations = bench::iterations(argc, argv, 1000000);
+
+  auto always = simulate(false);
+  auto windows = simulate(true);
+  std::printf("always listening: capture rate %.1f%%, duty cycle %.1f%%\n",
+              always.capture_rate * 100, always.duty_cycle * 100);
+  std::printf("predicted windows: capture rate %.1f%%, duty cycle %.1f%%\n",
+              windows.capture_rate * 100, windows.duty_cycle * 100);
+
+  ListenScheduler scheduler;
+  scheduler.set_learning(true);
+  scheduler.set_sleep(true);
+  for (uint32_t id = 0; id < 16; id++) {
+    scheduler.add_meter(id);
+    scheduler.record_frame(id, id * 1000);
+    scheduler.record_frame(id, id * 1000 + 30000);
+  }
+  uint32_t now = 0;
+  auto seconds = bench::measure(iterations, [&]() {
+    scheduler.update(now);
+    now += 137;
+  });
+  bench::report("listen schedule update", seconds, iterations, "updates");
+  return 0;
+}
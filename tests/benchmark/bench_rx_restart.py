@@ -0,0 +1,164 @@
+"""Simulated SPI bus benchmark for receiver restart dead time.
+
+Replays ``restart_rx`` of both transceivers against simulated chips and
+compares the former fixed delays with polling of SX1276 ModeReady and CC1101
+MARCSTATE. Reports the dead time, from the radio leaving RX until it listens
+again and the receiver task waits for the next frame, and how long the task
+is busy restarting (all in simulated time).
+
+    python bench_rx_restart.py
+"""
+
+SPI_TRANSACTION_US = 12.0  # CS toggling and driver overhead
+SPI_BYTE_US = 1.0  # 8 MHz SPI clock
+
+# SX1276: XO keeps running in standby, RX needs PLL lock (TS_FS) and receiver
+# wake-up (TS_RE)
+SX1276_STANDBY_READY_US = 20.0
+SX1276_RX_READY_US = 60.0 + 60.0
+SX1276_DELAY_US = 5000.0
+
+# CC1101: leaving RX is immediate, IDLE to RX calibrates first (MCSM0
+# FS_AUTOCAL = 1)
+CC1101_IDLE_READY_US = 2.0
+CC1101_RX_READY_US = 809.0
+CC1101_DELAY_US = 100.0
+
+MARCSTATE_IDLE = 0x01
+MARCSTATE_RX = 0x0D
+
+
+class SimulatedSPIBus:
+    def __init__(self):
+        self.now = 0.0
+        self.transactions = 0
+
+    def transaction(self, length):
+        self.transactions += 1
+        self.now += SPI_TRANSACTION_US + SPI_BYTE_US * (1 + length)
+
+    def delay(self, duration_us):
+        self.now += duration_us
+
+
+class SimulatedSX1276:
+    def __init__(self, bus):
+        self.bus = bus
+        self.mode = 0b101
+        self.ready_at = 0.0
+        self.deaf_since = None
+        self.listening_at = None
+
+    def spi_write(self, address, value):
+        self.bus.transaction(1)
+        if address != 0x01:
+            return
+        self.mode = value
+        if value == 0b101:
+            self.ready_at = self.bus.now + SX1276_RX_READY_US
+            self.listening_at = self.ready_at
+        else:
+            self.ready_at = self.bus.now + SX1276_STANDBY_READY_US
+            self.deaf_since = self.bus.now
+
+    def spi_read(self, address):
+        self.bus.transaction(1)
+        assert address == 0x3E
+        return (1 << 7) if self.bus.now >= self.ready_at else 0
+
+    def restart_rx(self, polling):
+        self.spi_write(0x01, 0b001)
+        if polling:
+            while not self.spi_read(0x3E) & (1 << 7):
+                pass
+        else:
+            self.bus.delay(SX1276_DELAY_US)
+        self.spi_write(0x3F, 1 << 4)
+        self.spi_write(0x01, 0b101)
+        if polling:
+            while not self.spi_read(0x3E) & (1 << 7):
+                pass
+        else:
+            self.bus.delay(SX1276_DELAY_US)
+
+
+class SimulatedCC1101:
+    def __init__(self, bus):
+        self.bus = bus
+        self.state_changes = [(0.0, MARCSTATE_RX)]
+        self.deaf_since = None
+        self.listening_at = None
+        self.strobes = []
+
+    def marcstate(self):
+        state = None
+        for at, value in self.state_changes:
+            if at <= self.bus.now:
+                state = value
+        return state
+
+    def strobe(self, command):
+        self.bus.transaction(0)
+        self.strobes.append(command)
+        if command == 0x36:  # SIDLE
+            self.deaf_since = self.bus.now
+            self.state_changes.append(
+                (self.bus.now + CC1101_IDLE_READY_US, MARCSTATE_IDLE)
+            )
+        elif command == 0x34:  # SRX
+            self.listening_at = self.bus.now + CC1101_RX_READY_US
+            self.state_changes.append((self.listening_at, MARCSTATE_RX))
+
+    def read_marcstate(self):
+        self.bus.transaction(1)
+        return self.marcstate()
+
+    def restart_rx(self, polling):
+        self.strobe(0x36)
+        if polling:
+            while self.read_marcstate() != MARCSTATE_IDLE:
+                pass
+        else:
+            self.bus.delay(CC1101_DELAY_US)
+        self.strobe(0x3A)  # SFRX
+        self.strobe(0x34)
+        if polling:
+            while self.read_marcstate() != MARCSTATE_RX:
+                pass
+        else:
+            self.bus.delay(CC1101_DELAY_US)
+
+
+RADIOS = {"SX1276": SimulatedSX1276, "CC1101": SimulatedCC1101}
+
+
+def simulate(radio_type, polling):
+    bus = SimulatedSPIBus()
+    radio = RADIOS[radio_type](bus)
+    radio.restart_rx(polling)
+    return {
+        "dead_us": max(radio.listening_at, bus.now) - radio.deaf_since,
+        "restart_us": bus.now,
+        "transactions": bus.transactions,
+        "radio": radio,
+    }
+
+
+def main():
+    for radio_type in RADIOS:
+        for polling in (False, True):
+            result = simulate(radio_type, polling)
+            print(
+                "%-7s %-6s dead %8.1f us, task busy %8.1f us, %3d transactions"
+                % (
+                    radio_type,
+                    "poll" if polling else "delay",
+                    result["dead_us"],
+                    result["restart_us"],
+                    result["transactions"],
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Simulated SPI bus benchmark for SX1276 FIFO reads.
+
+Replays ``Radio::read_packet_`` against a simulated SX1276 receiving a
+max-length T1 frame and compares the per-byte FIFO-empty polling path with
+the FIFO-level interrupt + burst read path. Reports SPI transactions, SPI
+bus time and the delay between the last byte on air and the frame being
+complete in memory (all in simulated time).
+
+    python bench_sx1276_fifo.py
+"""
+
+BYTE_ON_AIR_US = 80.0  # 100 kcps T1 chip rate
+SPI_TRANSACTION_US = 12.0  # CS toggling and driver overhead
+SPI_BYTE_US = 1.0  # 8 MHz SPI clock
+TICK_US = 1000.0  # ulTaskNotifyTake(pdMS_TO_TICKS(1)) timeout
+WAKEUP_US = 20.0  # ISR to receiver task latency
+
+PREAMBLE_SIZE = 3
+RX_CHUNK_SIZE = 24
+MAX_BURST_SIZE = 8
+# L-field 255 T1 frame, 3-of-6 coded
+MAX_PACKET_SIZE = 435
+
+
+class SimulatedSPIBus:
+    def __init__(self):
+        self.now = 0.0
+        self.transactions = 0
+        self.busy = 0.0
+
+    def transaction(self, length):
+        duration = SPI_TRANSACTION_US + SPI_BYTE_US * (1 + length)
+        self.transactions += 1
+        self.busy += duration
+        self.now += duration
+
+
+class SimulatedSX1276:
+    def __init__(self, bus, frame_size, fifo_level_mode):
+        self.bus = bus
+        self.frame_size = frame_size
+        self.fifo_level_mode = fifo_level_mode
+        self.fifo_threshold = PREAMBLE_SIZE - 1
+        self.consumed = 0
+
+    def arrived(self, now=None):
+        now = self.bus.now if now is None else now
+        return min(self.frame_size, int(now // BYTE_ON_AIR_US))
+
+    def fifo_count(self):
+        return self.arrived() - self.consumed
+
+    def dio1(self):
+        if self.fifo_level_mode:
+            return self.fifo_count() > self.fifo_threshold
+        return self.fifo_count() == 0
+
+    # SX1276::read()
+    def read(self):
+        if self.dio1():
+            return None
+        self.bus.transaction(1)
+        self.consumed += 1
+        return 1
+
+    # SX1276::read_bulk()
+    def read_bulk(self, length):
+        if not self.fifo_level_mode:
+            count = 0
+            while count < length and self.read() is not None:
+                count += 1
+            return count
+
+        count = min(length, MAX_BURST_SIZE)
+        if self.fifo_threshold != count - 1:
+            self.bus.transaction(1)
+            self.fifo_threshold = count - 1
+        if not self.dio1():
+            return 0
+        self.bus.transaction(count)
+        self.consumed += count
+        return count
+
+    def wait_for_data(self):
+        """ulTaskNotifyTake(pdTRUE, 1 ms), returns True when notified."""
+        if not self.fifo_level_mode:
+            self.bus.now += TICK_US
+            return False
+        needed = self.consumed + self.fifo_threshold + 1
+        if needed > self.frame_size:
+            self.bus.now += TICK_US
+            return False
+        rising_edge = needed * BYTE_ON_AIR_US
+        if rising_edge - self.bus.now > TICK_US:
+            self.bus.now += TICK_US
+            return False
+        self.bus.now = max(self.bus.now, rising_edge) + WAKEUP_US
+        return True
+
+    # RadioTransceiver::read_in_task()
+    def read_in_task(self, length):
+        while length:
+            count = self.read_bulk(length)
+            length -= count
+            if count:
+                continue
+            if not self.wait_for_data():
+                count = self.read_bulk(length)
+                if not count:
+                    return False
+                length -= count
+        return True
+
+
+def simulate(fifo_level_mode, frame_size=MAX_PACKET_SIZE):
+    bus = SimulatedSPIBus()
+    radio = SimulatedSX1276(bus, frame_size, fifo_level_mode)
+
+    # Task wakes up once the preamble is in
+    bus.now = PREAMBLE_SIZE * BYTE_ON_AIR_US + WAKEUP_US
+    remaining = frame_size
+    chunk = PREAMBLE_SIZE
+    while remaining:
+        assert radio.read_in_task(chunk), "frame lost"
+        remaining -= chunk
+        chunk = min(remaining, RX_CHUNK_SIZE)
+
+    return {
+        "transactions": bus.transactions,
+        "spi_busy_us": bus.busy,
+        "frame_time_us": bus.now,
+        "completion_delay_us": bus.now - frame_size * BYTE_ON_AIR_US,
+    }
+
+
+def main():
+    print(
+        f"{'mode':<20}{'transactions':>14}{'SPI busy':>14}"
+        f"{'frame time':>14}{'completion':>14}"
+    )
+    for name, mode in (("fifo empty polling", False), ("fifo level burst", True)):
+        result = simulate(mode)
+        print(
+            f"{name:<20}{result['transactions']:>14}"
+            f"{result['spi_busy_us']:>11.0f} us"
+            f"{result['frame_time_us']:>11.0f} us"
+            f"{result['completion_delay_us']:>11.0f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
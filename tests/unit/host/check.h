@@ -0,0 +1,59 @@
+#pragma once
+// Minimal test registry for host unit tests, built and run by
+// tests/unit/test_host.py. Each test_*.cpp is a program of its own:
+//
+//   TEST(queue_keeps_order) { EXPECT(...); }
+
+#include <cstdio>
+#include <vector>
+
+#include "freertos/FreeRTOS.h"
+
+namespace check {
+struct Test {
+  const char *name;
+  void (*function)();
+};
+
+inline std::vector<Test> &tests() {
+  static std::vector<Test> tests;
+  return tests;
+}
+inline int failures = 0;
+
+struct Registrar {
+  Registrar(const char *name, void (*function)()) {
+    tests().push_back({name, function});
+  }
+};
+} // namespace check
+
+#define TEST(name)                                                             \
+  static void name();                                                          \
+  static check::Registrar name##_registrar(#name, name);                       \
+  static void name()
+
+#define EXPECT(expr)                                                           \
+  do {                                                                         \
+    if (!(expr)) {                                                             \
+      std::fprintf(stderr, "%s:%d: check failed: %s\n", __FILE__, __LINE__,   \
+                   #expr);                                                     \
+      check::failures++;                                                       \
+    }                                                                          \
+  } while (0)
+
+int main() {
+  int failed = 0;
+  for (auto &test : check::tests()) {
+    // Simulated time and notifications start over for every test
+    esphome::host::reset();
+    int before = check::failures;
+    test.function();
+    if (check::failures != before) {
+      std::fprintf(stderr, "FAILED %s\n", test.name);
+      failed++;
+    }
+  }
+  std::printf("%zu tests, %d failed\n", check::tests().size(), failed);
+  return failed ? 1 : 0;
+}
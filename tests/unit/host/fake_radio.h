@@ -0,0 +1,54 @@
+#pragma once
+// Radio component with a fake transceiver for host unit tests, see
+// tests/unit/test_host.py
+
+#include <deque>
+#include <vector>
+
+#include "esphome/components/wmbus_radio/component.h"
+
+namespace fake_radio {
+using namespace esphome;
+using namespace esphome::wmbus_radio;
+
+// Hands out bytes given by the test, as if they were in the radio FIFO
+class FakeTransceiver : public RadioTransceiver {
+public:
+  void setup() override {}
+  optional<uint8_t> read() override {
+    if (this->fifo.empty())
+      return {};
+    uint8_t byte = this->fifo.front();
+    this->fifo.pop_front();
+    return byte;
+  }
+  void restart_rx() override {}
+  void standby() override {}
+  int8_t get_rssi() override { return -60; }
+  const char *get_name() override { return "fake"; }
+
+  std::deque<uint8_t> fifo;
+};
+
+class TestRadio : public Radio {
+public:
+  TestRadio(Dispatcher *dispatcher) {
+    this->set_dispatcher(dispatcher);
+    this->set_radio(&this->transceiver);
+  }
+
+  // As if the data interrupt woke the receiver task with the frame in FIFO
+  void receive(const std::vector<uint8_t> &bytes) {
+    this->transceiver.fifo.assign(bytes.begin(), bytes.end());
+    // Radio keeps receiving noise after the frame
+    this->transceiver.fifo.insert(this->transceiver.fifo.end(), 16, 0);
+    host::notifications++;
+    this->receive_frame();
+  }
+
+  PacketPool &pool() { return this->packet_pool_; }
+  using Radio::filter_address_;
+
+  FakeTransceiver transceiver;
+};
+} // namespace fake_radio
@@ -0,0 +1,93 @@
+#pragma once
+// Builds wM-Bus frames for host unit tests, see tests/unit/test_host.py
+
+#include <cstdint>
+#include <string>
+#include <vector>
+
+#include "esphome/components/wmbus/wmbus_common/crc16.h"
+
+namespace frames {
+// L C M(2) A: ID(4) version type, then CI and what follows it, without CRCs
+inline std::vector<uint8_t> dll(uint32_t id, uint16_t mfct = 0x2c2d,
+                                std::vector<uint8_t> tpl = {0x78, 0x02, 0xff,
+                                                            0x20, 0x71, 0x00},
+                                uint8_t version = 0x1b, uint8_t type = 0x07) {
+  std::vector<uint8_t> frame = {0,
+                                0x44,
+                                (uint8_t)mfct,
+                                (uint8_t)(mfct >> 8),
+                                (uint8_t)id,
+                                (uint8_t)(id >> 8),
+                                (uint8_t)(id >> 16),
+                                (uint8_t)(id >> 24),
+                                version,
+                                type};
+  frame.insert(frame.end(), tpl.begin(), tpl.end());
+  frame[0] = frame.size() - 1;
+  return frame;
+}
+
+// Frame as printed by wmbusmeters (driver test telegrams), '_' separates the
+// header from the payload
+inline std::vector<uint8_t> from_hex(const std::string &hex) {
+  std::vector<uint8_t> frame;
+  std::string digits;
+  for (char c : hex)
+    if (c != '_')
+      digits += c;
+  for (size_t i = 0; i + 1 < digits.size(); i += 2)
+    frame.push_back(std::stoul(digits.substr(i, 2), nullptr, 16));
+  return frame;
+}
+
+// Long TPL header (ID M version type) of a meter behind a converter
+inline std::vector<uint8_t> long_tpl(uint32_t id, uint16_t mfct = 0x2c2d,
+                                     uint8_t version = 0x1b,
+                                     uint8_t type = 0x07) {
+  return {0x72,
+          (uint8_t)id,
+          (uint8_t)(id >> 8),
+          (uint8_t)(id >> 16),
+          (uint8_t)(id >> 24),
+          (uint8_t)mfct,
+          (uint8_t)(mfct >> 8),
+          version,
+          type,
+          0x01,
+          0x00,
+          0x00,
+          0x00,
+          0x02,
+          0xff,
+          0x20,
+          0x71,
+          0x00};
+}
+
+inline void append_block(std::vector<uint8_t> &out, const uint8_t *block,
+                         size_t size) {
+  out.insert(out.end(), block, block + size);
+  auto crc = crc16_EN13757((unsigned char *)block, size);
+  out.push_back(crc >> 8);
+  out.push_back(crc & 0xff);
+}
+
+// Frame format A with block CRCs, as transmitted in C1 mode with preamble
+inline std::vector<uint8_t> c1_format_a(const std::vector<uint8_t> &frame) {
+  std::vector<uint8_t> out = {0x54, 0xcd};
+  append_block(out, frame.data(), 10);
+  for (size_t offset = 10; offset < frame.size(); offset += 16)
+    append_block(out, frame.data() + offset,
+                 std::min<size_t>(16, frame.size() - offset));
+  return out;
+}
+
+// Frame format B of up to 126 bytes: one CRC at the end, L-field counts it
+inline std::vector<uint8_t> c1_format_b(std::vector<uint8_t> frame) {
+  frame[0] += 2;
+  std::vector<uint8_t> out = {0x54, 0x3d};
+  append_block(out, frame.data(), frame.size());
+  return out;
+}
+} // namespace frames
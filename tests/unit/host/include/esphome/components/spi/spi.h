@@ -0,0 +1,19 @@
+#pragma once
+// Host stand-in for ESPHome, see tests/unit/test_host.py
+#include <cstdint>
+
+#include "esphome/core/gpio.h"
+
+namespace esphome {
+namespace spi {
+// Virtual, so tests can simulate the chip on the other end
+class SPIDevice {
+public:
+  virtual ~SPIDevice() = default;
+  virtual void setup() {}
+  virtual void begin_transaction() {}
+  virtual uint8_t transfer(uint8_t data) { return 0; }
+  virtual void end_transaction() {}
+};
+} // namespace spi
+} // namespace esphome
@@ -0,0 +1,7 @@
+#pragma once
+// Host stand-in for ESPHome, see tests/unit/test_host.py
+namespace esphome {
+namespace time {
+class RealTimeClock {};
+} // namespace time
+} // namespace esphome
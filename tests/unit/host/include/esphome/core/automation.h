@@ -0,0 +1,16 @@
+#pragma once
+// Host stand-in for ESPHome, see tests/unit/test_host.py
+#include "esphome/core/helpers.h"
+
+namespace esphome {
+template <typename... Ts> class Trigger {
+public:
+  void trigger(Ts... x) {}
+};
+
+template <typename... Ts> class Action {
+public:
+  virtual ~Action() = default;
+  virtual void play(Ts... x) = 0;
+};
+} // namespace esphome
@@ -0,0 +1,42 @@
+#pragma once
+// Host stand-in for ESPHome, see tests/unit/test_host.py
+#include <functional>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "esphome/core/optional.h"
+
+namespace esphome {
+class Component {
+public:
+  virtual ~Component() = default;
+  virtual void setup() {}
+  virtual void loop() {}
+  virtual void dump_config() {}
+
+  void mark_failed() { this->failed_ = true; }
+  bool is_failed() const { return this->failed_; }
+
+  // Run by run_deferred(), as the main loop would
+  void defer(std::function<void()> &&f) {
+    this->deferred_.push_back(std::move(f));
+  }
+  void run_deferred() {
+    auto deferred = std::move(this->deferred_);
+    this->deferred_.clear();
+    for (auto &f : deferred)
+      f();
+  }
+
+protected:
+  bool failed_{false};
+  std::vector<std::function<void()>> deferred_;
+};
+
+class Application {
+public:
+  std::string get_friendly_name() const { return "host"; }
+};
+inline Application App;
+} // namespace esphome
@@ -0,0 +1,22 @@
+#pragma once
+// Host stand-in for ESPHome, see tests/unit/test_host.py
+namespace esphome {
+namespace gpio {
+enum InterruptType { INTERRUPT_RISING_EDGE, INTERRUPT_FALLING_EDGE };
+} // namespace gpio
+
+class GPIOPin {
+public:
+  virtual ~GPIOPin() = default;
+  virtual void setup() {}
+  virtual bool digital_read() { return false; }
+  virtual void digital_write(bool value) {}
+};
+
+class InternalGPIOPin : public GPIOPin {
+public:
+  template <typename T>
+  void attach_interrupt(void (*func)(T *), T *arg,
+                        gpio::InterruptType type) const {}
+};
+} // namespace esphome
@@ -0,0 +1,17 @@
+#pragma once
+// Host stand-in for ESPHome, see tests/unit/test_host.py
+// Time is simulated: it only moves when a test or a delay advances it
+#include <cstdint>
+
+namespace esphome {
+namespace host {
+inline uint64_t now_us = 0;
+inline void advance_us(uint64_t us) { now_us += us; }
+inline void advance_ms(uint64_t ms) { now_us += ms * 1000; }
+} // namespace host
+
+inline uint32_t micros() { return (uint32_t)host::now_us; }
+inline uint32_t millis() { return (uint32_t)(host::now_us / 1000); }
+inline void delay(uint32_t ms) { host::advance_ms(ms); }
+inline void delayMicroseconds(uint32_t us) { host::advance_us(us); }
+} // namespace esphome
@@ -0,0 +1,52 @@
+#pragma once
+// Host stand-in for ESPHome, see tests/unit/test_host.py
+#include <cstdarg>
+#include <cstdio>
+#include <functional>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "esphome/core/optional.h"
+
+namespace esphome {
+inline std::string str_sprintf(const char *format, ...) {
+  va_list args;
+  va_start(args, format);
+  auto length = std::vsnprintf(nullptr, 0, format, args);
+  va_end(args);
+  std::string output(length, '\0');
+  va_start(args, format);
+  std::vsnprintf(&output[0], length + 1, format, args);
+  va_end(args);
+  return output;
+}
+
+template <typename... X> class CallbackManager;
+template <typename... Ts> class CallbackManager<void(Ts...)> {
+public:
+  void add(std::function<void(Ts...)> &&callback) {
+    this->callbacks_.push_back(std::move(callback));
+  }
+  void call(Ts... args) {
+    for (auto &callback : this->callbacks_)
+      callback(args...);
+  }
+  size_t size() const { return this->callbacks_.size(); }
+  void operator()(Ts... args) { this->call(args...); }
+
+protected:
+  std::vector<std::function<void(Ts...)>> callbacks_;
+};
+
+template <typename T> class Parented {
+public:
+  Parented() {}
+  Parented(T *parent) : parent_(parent) {}
+  T *get_parent() const { return this->parent_; }
+  void set_parent(T *parent) { this->parent_ = parent; }
+
+protected:
+  T *parent_{nullptr};
+};
+} // namespace esphome
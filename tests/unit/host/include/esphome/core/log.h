@@ -0,0 +1,40 @@
+#pragma once
+// Host stand-in for ESPHome, see tests/unit/test_host.py
+// Messages are printed only with WMBUS_HOST_LOG set, format is checked always
+#include <cstdarg>
+#include <cstdio>
+#include <cstdlib>
+
+namespace esphome {
+__attribute__((format(printf, 2, 3))) inline void host_log(const char *tag,
+                                                             const char *format,
+                                                             ...) {
+  static const bool enabled = std::getenv("WMBUS_HOST_LOG") != nullptr;
+  if (!enabled)
+    return;
+  va_list args;
+  va_start(args, format);
+  std::fprintf(stderr, "[%s] ", tag);
+  std::vfprintf(stderr, format, args);
+  std::fputc('\n', stderr);
+  va_end(args);
+}
+} // namespace esphome
+
+#define esph_log_e(tag, ...) ::esphome::host_log(tag, __VA_ARGS__)
+#define esph_log_w(tag, ...) ::esphome::host_log(tag, __VA_ARGS__)
+#define esph_log_i(tag, ...) ::esphome::host_log(tag, __VA_ARGS__)
+#define esph_log_d(tag, ...) ::esphome::host_log(tag, __VA_ARGS__)
+#define esph_log_config(tag, ...) ::esphome::host_log(tag, __VA_ARGS__)
+#define esph_log_v(tag, ...) ::esphome::host_log(tag, __VA_ARGS__)
+#define esph_log_vv(tag, ...) ::esphome::host_log(tag, __VA_ARGS__)
+
+#define ESP_LOGE esph_log_e
+#define ESP_LOGW esph_log_w
+#define ESP_LOGI esph_log_i
+#define ESP_LOGD esph_log_d
+#define ESP_LOGCONFIG esph_log_config
+#define ESP_LOGV esph_log_v
+#define ESP_LOGVV esph_log_vv
+
+#define LOG_PIN(prefix, pin) ((void)(pin))
@@ -0,0 +1,7 @@
+#pragma once
+// Host stand-in for ESPHome, see tests/unit/test_host.py
+#include <optional>
+
+namespace esphome {
+template <typename T> using optional = std::optional<T>;
+} // namespace esphome
@@ -0,0 +1,44 @@
+#pragma once
+// Host stand-in for FreeRTOS, see tests/unit/test_host.py
+// Single threaded: tasks are not started, tests call task bodies directly
+#include <cstdint>
+#include <deque>
+#include <functional>
+#include <vector>
+
+#include "esphome/core/hal.h"
+
+typedef int BaseType_t;
+typedef unsigned int UBaseType_t;
+typedef uint32_t TickType_t;
+typedef void (*TaskFunction_t)(void *);
+typedef void *TaskHandle_t;
+
+#define pdTRUE 1
+#define pdFALSE 0
+#define pdPASS pdTRUE
+#define pdFAIL pdFALSE
+#define portMAX_DELAY ((TickType_t)0xffffffff)
+#define portNUM_PROCESSORS 2
+#define portYIELD_FROM_ISR(x) ((void)(x))
+#define tskNO_AFFINITY 0x7FFFFFFF
+#define pdMS_TO_TICKS(ms) ((TickType_t)(ms))
+
+namespace esphome {
+namespace host {
+// Notification value of the one task the tests run
+inline uint32_t notifications = 0;
+// Called when the task would block without a notification, may give one, as
+// an interrupt arriving meanwhile would. Returns time spent waiting in ms.
+inline std::function<TickType_t(TickType_t)> on_block;
+// Core passed when the task was created
+inline BaseType_t task_core = -1;
+
+inline void reset() {
+  now_us = 0;
+  notifications = 0;
+  on_block = nullptr;
+  task_core = -1;
+}
+} // namespace host
+} // namespace esphome
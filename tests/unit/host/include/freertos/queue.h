@@ -0,0 +1,39 @@
+#pragma once
+// Host stand-in for FreeRTOS, see tests/unit/test_host.py
+#include <cstring>
+
+#include "FreeRTOS.h"
+
+struct HostQueue {
+  size_t length;
+  size_t item_size;
+  std::deque<std::vector<uint8_t>> items;
+};
+typedef HostQueue *QueueHandle_t;
+
+inline QueueHandle_t xQueueCreate(UBaseType_t length, UBaseType_t item_size) {
+  // Queues live as long as the test program
+  return new HostQueue{length, item_size, {}};
+}
+
+inline BaseType_t xQueueSend(QueueHandle_t queue, const void *item,
+                             TickType_t ticks) {
+  if (queue->items.size() >= queue->length)
+    return pdFAIL;
+  auto bytes = (const uint8_t *)item;
+  queue->items.emplace_back(bytes, bytes + queue->item_size);
+  return pdPASS;
+}
+
+inline BaseType_t xQueueReceive(QueueHandle_t queue, void *item,
+                                TickType_t ticks) {
+  if (queue->items.empty())
+    return pdFAIL;
+  std::memcpy(item, queue->items.front().data(), queue->item_size);
+  queue->items.pop_front();
+  return pdPASS;
+}
+
+inline UBaseType_t uxQueueMessagesWaiting(QueueHandle_t queue) {
+  return queue->items.size();
+}
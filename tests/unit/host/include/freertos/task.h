@@ -0,0 +1,39 @@
+#pragma once
+// Host stand-in for FreeRTOS, see tests/unit/test_host.py
+#include "FreeRTOS.h"
+
+inline BaseType_t xTaskCreatePinnedToCore(TaskFunction_t function,
+                                          const char *name, uint32_t stack,
+                                          void *arg, UBaseType_t priority,
+                                          TaskHandle_t *handle,
+                                          BaseType_t core) {
+  static int task;
+  *handle = &task;
+  esphome::host::task_core = core;
+  return pdPASS;
+}
+
+inline UBaseType_t uxTaskGetStackHighWaterMark(TaskHandle_t task) { return 0; }
+
+inline void vTaskDelay(TickType_t ticks) { esphome::host::advance_ms(ticks); }
+
+inline void xTaskNotifyGive(TaskHandle_t task) {
+  esphome::host::notifications++;
+}
+
+inline void vTaskNotifyGiveFromISR(TaskHandle_t task, BaseType_t *woken) {
+  esphome::host::notifications++;
+  *woken = pdFALSE;
+}
+
+inline uint32_t ulTaskNotifyTake(BaseType_t clear, TickType_t ticks) {
+  using namespace esphome;
+  if (!host::notifications && ticks) {
+    auto waited = host::on_block ? host::on_block(ticks) : ticks;
+    host::advance_ms(waited);
+  }
+  auto value = host::notifications;
+  if (value)
+    host::notifications = clear ? 0 : value - 1;
+  return value;
+}
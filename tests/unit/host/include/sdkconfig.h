@@ -0,0 +1,2 @@
+#pragma once
+// Host stand-in for ESP-IDF, see tests/unit/test_host.py
@@ -0,0 +1,82 @@
+// DLL CRC removal of frame formats A and B, with and without verification.
+//
+// Sources: wmbus_common/crc16.cc
+
+#include <algorithm>
+#include <vector>
+
+#include "check.h"
+#include "frames.h"
+
+static std::vector<uint8_t> frame() {
+  return frames::dll(0x12345678, 0x2c2d,
+                     {0x78, 0x02, 0xff, 0x20, 0x71, 0x00, 0x04, 0x13, 0x01,
+                      0x02, 0x03, 0x04, 0x0b, 0x3b, 0x05, 0x06, 0x07, 0x02,
+                      0xfd, 0x17, 0x00, 0x00});
+}
+
+// Without the C1 preamble
+static std::vector<uint8_t> format_a() {
+  auto bytes = frames::c1_format_a(frame());
+  return {bytes.begin() + 2, bytes.end()};
+}
+static std::vector<uint8_t> format_b() {
+  auto bytes = frames::c1_format_b(frame());
+  return {bytes.begin() + 2, bytes.end()};
+}
+
+static bool stripped(std::vector<uint8_t> bytes, size_t length) {
+  auto expected = frame();
+  return length && std::equal(expected.begin() + 1, expected.end(),
+                              bytes.begin() + 1) &&
+         length == expected.size();
+}
+
+TEST(format_a_blocks_are_removed) {
+  auto bytes = format_a();
+  size_t failed_block = 99;
+  auto length = stripDLLCRCsFrameFormatA(bytes.data(), bytes.size(),
+                                         &failed_block);
+  EXPECT(stripped(bytes, length));
+  EXPECT(failed_block == 99);
+}
+
+TEST(format_a_bad_block_is_reported) {
+  auto bytes = format_a();
+  bytes[13] ^= 0x01;
+  auto original = bytes;
+  size_t failed_block = 0;
+  EXPECT(!stripDLLCRCsFrameFormatA(bytes.data(), bytes.size(), &failed_block));
+  EXPECT(failed_block == 12);
+  EXPECT(bytes == original);
+}
+
+TEST(format_b_crc_is_removed) {
+  auto bytes = format_b();
+  size_t failed_block = 0;
+  auto length = stripDLLCRCsFrameFormatB(bytes.data(), bytes.size(),
+                                         &failed_block);
+  // L-field of format B counts the CRC
+  EXPECT(stripped(bytes, length));
+
+  bytes = format_b();
+  bytes[5] ^= 0x01;
+  EXPECT(!stripDLLCRCsFrameFormatB(bytes.data(), bytes.size(), &failed_block));
+  EXPECT(failed_block == 0);
+}
+
+TEST(unverified_crcs_are_removed_anyway) {
+  auto bytes = format_a();
+  bytes[bytes.size() - 1] ^= 0x01;
+  bytes[11] ^= 0x01;
+  size_t failed_block = 0;
+  auto length = stripDLLCRCsFrameFormatA(bytes.data(), bytes.size(),
+                                         &failed_block, false);
+  EXPECT(stripped(bytes, length));
+
+  bytes = format_b();
+  bytes[bytes.size() - 1] ^= 0x01;
+  length = stripDLLCRCsFrameFormatB(bytes.data(), bytes.size(), &failed_block,
+                                    false);
+  EXPECT(stripped(bytes, length));
+}
@@ -0,0 +1,176 @@
+// Dispatcher shared by radios: routing of frames to handlers by address,
+// duplicates heard by more than one radio.
+//
+// Sources: wmbus_radio/component.cpp wmbus_radio/dispatcher.cpp
+// Sources: wmbus_radio/packet.cpp wmbus_radio/packet_pool.cpp
+// Sources: wmbus_radio/transceiver.cpp wmbus_radio/transceiver_cc1101.cpp
+// Sources: wmbus_radio/transceiver_sx1276.cpp wmbus_radio/decode3of6.cpp
+// Sources: wmbus_radio/duplicate_filter.cpp wmbus_radio/frame_format.cpp
+// Sources: wmbus_radio/latency_histogram.cpp wmbus_radio/link_statistics.cpp
+// Sources: wmbus_radio/listen_scheduler.cpp
+// Sources: wmbus_radio/transmission_interval.cpp wmbus_common
+
+#include <cstring>
+#include <string>
+
+#include "check.h"
+#include "fake_radio.h"
+#include "frames.h"
+
+using namespace esphome;
+using namespace esphome::wmbus_radio;
+using fake_radio::TestRadio;
+
+static const uint16_t KAM = 0x2c2d;
+static const uint16_t DME = 0x11a5;
+
+// Handler names in order of calls
+class Calls {
+public:
+  void add(Dispatcher &dispatcher, const char *name) {
+    dispatcher.add_frame_handler([this, name](Frame *frame) {
+      this->names += std::string(name) + " ";
+    });
+  }
+  void add(Dispatcher &dispatcher, const char *name, uint32_t id,
+           uint16_t mfct) {
+    dispatcher.add_frame_handler(id, mfct, [this, name](Frame *frame) {
+      this->names += std::string(name) + " ";
+    });
+  }
+  std::string take() {
+    auto names = this->names;
+    this->names.clear();
+    return names;
+  }
+
+  std::string names;
+};
+
+// Dispatches a received C1 frame, as Radio does after removing CRCs
+static bool dispatch(Dispatcher &dispatcher, const std::vector<uint8_t> &dll) {
+  auto bytes = frames::c1_format_a(dll);
+  Packet packet;
+  std::memcpy(packet.rx_data_ptr(), bytes.data(), 3);
+  packet.rx_advance(3);
+  packet.calculate_payload_size();
+  std::memcpy(packet.rx_data_ptr(), bytes.data() + 3, bytes.size() - 3);
+  packet.rx_advance(packet.rx_capacity());
+  EXPECT(packet.remove_crcs());
+  LinkStatistics statistics;
+  auto frame = packet.convert_to_frame(&statistics);
+  EXPECT(frame.has_value());
+  return frame && dispatcher.dispatch(&frame.value());
+}
+
+TEST(routes_by_manufacturer_and_id) {
+  Dispatcher dispatcher;
+  Calls calls;
+  calls.add(dispatcher, "a_kam", 0x12345678, KAM);
+  calls.add(dispatcher, "a_dme", 0x12345678, DME);
+  calls.add(dispatcher, "b_kam", 0x87654321, KAM);
+  dispatcher.setup();
+
+  dispatch(dispatcher, frames::dll(0x12345678, KAM));
+  EXPECT(calls.take() == "a_kam ");
+  dispatch(dispatcher, frames::dll(0x12345678, DME));
+  EXPECT(calls.take() == "a_dme ");
+  dispatch(dispatcher, frames::dll(0x87654321, KAM));
+  EXPECT(calls.take() == "b_kam ");
+  dispatch(dispatcher, frames::dll(0x87654321, DME));
+  EXPECT(calls.take() == "");
+}
+
+TEST(any_manufacturer_falls_back_to_id) {
+  Dispatcher dispatcher;
+  Calls calls;
+  calls.add(dispatcher, "any", 0x12345678, ANY_MANUFACTURER);
+  calls.add(dispatcher, "kam", 0x12345678, KAM);
+  dispatcher.setup();
+
+  dispatch(dispatcher, frames::dll(0x12345678, KAM));
+  EXPECT(calls.take() == "any kam ");
+  dispatch(dispatcher, frames::dll(0x12345678, DME));
+  EXPECT(calls.take() == "any ");
+  dispatch(dispatcher, frames::dll(0x12340000, DME));
+  EXPECT(calls.take() == "");
+}
+
+TEST(catch_all_handlers_run_first_for_every_frame) {
+  Dispatcher dispatcher;
+  Calls calls;
+  calls.add(dispatcher, "meter", 0x12345678, KAM);
+  calls.add(dispatcher, "all");
+  dispatcher.setup();
+
+  dispatch(dispatcher, frames::dll(0x12345678, KAM));
+  EXPECT(calls.take() == "all meter ");
+  dispatch(dispatcher, frames::dll(0x87654321, KAM));
+  EXPECT(calls.take() == "all ");
+}
+
+TEST(long_header_routes_to_meter_behind_converter) {
+  Dispatcher dispatcher;
+  Calls calls;
+  calls.add(dispatcher, "converter", 0x99999999, ANY_MANUFACTURER);
+  calls.add(dispatcher, "meter", 0x12345678, DME);
+  calls.add(dispatcher, "meter_any", 0x12345678, ANY_MANUFACTURER);
+  dispatcher.setup();
+
+  dispatch(dispatcher,
+           frames::dll(0x99999999, KAM, frames::long_tpl(0x12345678, DME)));
+  EXPECT(calls.take() == "converter meter_any meter ");
+
+  // Same address in both headers calls handlers once
+  dispatch(dispatcher,
+           frames::dll(0x12345678, DME, frames::long_tpl(0x12345678, DME)));
+  EXPECT(calls.take() == "meter_any meter ");
+}
+
+TEST(unknown_header_goes_to_all_address_handlers) {
+  Dispatcher dispatcher;
+  Calls calls;
+  calls.add(dispatcher, "a", 0x12345678, KAM);
+  calls.add(dispatcher, "b", 0x87654321, DME);
+  dispatcher.setup();
+
+  // ELL header may hide the meter address behind encryption
+  dispatch(dispatcher,
+           frames::dll(0x99999999, KAM, {0x8c, 0x20, 0x00, 0x00, 0x00}));
+  auto names = calls.take();
+  EXPECT(names == "a b " || names == "b a ");
+}
+
+TEST(radios_share_handlers_and_duplicates) {
+  Dispatcher dispatcher;
+  TestRadio first(&dispatcher), second(&dispatcher);
+  first.set_duplicate_filter(8, 1000);
+
+  uint8_t handled_by = 0;
+  first.add_frame_handler([](Frame *frame) { frame->mark_as_handled(); });
+  second.add_frame_handler(0x12345678, KAM, [&handled_by](Frame *frame) {
+    frame->mark_as_handled();
+    handled_by = frame->handlers_count();
+  });
+  first.setup();
+  second.setup();
+  EXPECT(dispatcher.duplicate_filter().capacity() == 8);
+
+  // Handlers added through either radio see frames of both
+  auto frame = frames::c1_format_a(frames::dll(0x12345678, KAM));
+  second.receive(frame);
+  second.loop();
+  EXPECT(handled_by == 2);
+
+  // Same transmission heard by the other radio
+  handled_by = 0;
+  first.receive(frame);
+  first.loop();
+  EXPECT(handled_by == 0);
+  EXPECT(dispatcher.duplicate_filter().hits() == 1);
+
+  host::advance_ms(1000);
+  first.receive(frame);
+  first.loop();
+  EXPECT(handled_by == 2);
+}
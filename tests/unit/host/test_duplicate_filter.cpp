@@ -0,0 +1,95 @@
+// Duplicate filter: TTL window, least recently seen eviction and counters.
+//
+// Sources: wmbus_radio/duplicate_filter.cpp
+
+#include <vector>
+
+#include "check.h"
+
+#include "esphome/components/wmbus_radio/duplicate_filter.h"
+
+using namespace esphome::wmbus_radio;
+
+static std::vector<uint8_t> frame(size_t n) {
+  std::vector<uint8_t> bytes(64);
+  for (size_t i = 0; i < bytes.size(); i++)
+    bytes[i] = (i * 31 + n * 7) & 0xFF;
+  return bytes;
+}
+
+static bool seen(DuplicateFilter &filter, size_t n, uint32_t now_ms) {
+  auto bytes = frame(n);
+  return filter.check(bytes.data(), bytes.size(), now_ms);
+}
+
+TEST(disabled_without_ttl) {
+  DuplicateFilter filter;
+  filter.setup(16, 0);
+  EXPECT(!filter.enabled());
+  EXPECT(filter.capacity() == 0);
+  EXPECT(!seen(filter, 0, 0));
+  EXPECT(!seen(filter, 0, 0));
+  EXPECT(filter.hits() == 0 && filter.misses() == 0);
+}
+
+TEST(copies_within_ttl_are_duplicates) {
+  DuplicateFilter filter;
+  filter.setup(4, 1000);
+  EXPECT(!seen(filter, 0, 0));
+  EXPECT(seen(filter, 0, 500));
+  EXPECT(seen(filter, 0, 999));
+  // Hit does not extend the TTL
+  EXPECT(!seen(filter, 0, 1000));
+  EXPECT(seen(filter, 0, 1500));
+  EXPECT(filter.hits() == 3 && filter.misses() == 2);
+}
+
+TEST(prefix_of_remembered_frame_differs) {
+  DuplicateFilter filter;
+  filter.setup(4, 1000);
+  auto bytes = frame(0);
+  EXPECT(!filter.check(bytes.data(), bytes.size(), 0));
+  EXPECT(!filter.check(bytes.data(), bytes.size() - 1, 0));
+  EXPECT(filter.check(bytes.data(), bytes.size() - 1, 0));
+}
+
+TEST(least_recently_seen_is_evicted) {
+  DuplicateFilter filter;
+  filter.setup(4, 1000);
+  for (size_t n = 0; n < 4; n++)
+    EXPECT(!seen(filter, n, 0));
+  // Oldest, but seen again
+  EXPECT(seen(filter, 0, 100));
+
+  EXPECT(!seen(filter, 4, 200));
+  EXPECT(seen(filter, 0, 300));
+  EXPECT(seen(filter, 4, 300));
+  EXPECT(seen(filter, 2, 300));
+  EXPECT(seen(filter, 3, 300));
+  EXPECT(!seen(filter, 1, 300));
+}
+
+TEST(expired_entry_is_replaced_before_live_one) {
+  DuplicateFilter filter;
+  filter.setup(4, 1000);
+  EXPECT(!seen(filter, 0, 0));
+  EXPECT(!seen(filter, 1, 400));
+  EXPECT(seen(filter, 0, 900));
+  EXPECT(!seen(filter, 2, 950));
+  EXPECT(!seen(filter, 3, 950));
+
+  // 1 is least recently seen, but 0 has expired
+  EXPECT(!seen(filter, 4, 1200));
+  EXPECT(seen(filter, 1, 1200));
+  EXPECT(seen(filter, 2, 1200));
+  EXPECT(seen(filter, 3, 1200));
+  EXPECT(seen(filter, 4, 1200));
+}
+
+TEST(timestamps_wrap_around_with_millis) {
+  DuplicateFilter filter;
+  filter.setup(4, 1000);
+  EXPECT(!seen(filter, 0, 0xFFFFFF00));
+  EXPECT(seen(filter, 0, 0x100));
+  EXPECT(!seen(filter, 0, 0x400));
+}
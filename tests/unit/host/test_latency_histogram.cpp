@@ -0,0 +1,63 @@
+// Latency histogram: bucketing, percentiles of an interval between snapshots
+// and the overflow bucket.
+//
+// Sources: wmbus_radio/latency_histogram.cpp
+
+#include "check.h"
+
+#include "esphome/components/wmbus_radio/latency_histogram.h"
+
+using namespace esphome::wmbus_radio;
+
+TEST(empty_histogram_has_no_percentile) {
+  LatencyHistogram histogram;
+  LatencyHistogram::Snapshot empty, snapshot;
+  histogram.snapshot(&snapshot);
+  EXPECT(snapshot.total() == 0);
+  EXPECT(snapshot.percentile(empty, 95) == 0);
+  EXPECT(histogram.max() == 0);
+}
+
+TEST(bucket_limits_are_inclusive) {
+  LatencyHistogram histogram;
+  LatencyHistogram::Snapshot empty, snapshot;
+  histogram.record(50);
+  histogram.record(51);
+  histogram.snapshot(&snapshot);
+  EXPECT(snapshot.counts[0] == 1 && snapshot.counts[1] == 1);
+  EXPECT(snapshot.percentile(empty, 50) == 50);
+  // Bucket bound is capped by the largest sample
+  EXPECT(snapshot.percentile(empty, 95) == 51);
+  EXPECT(histogram.max() == 51);
+}
+
+TEST(percentiles_cover_samples_since_previous_snapshot) {
+  LatencyHistogram histogram;
+  LatencyHistogram::Snapshot first, second;
+  for (int i = 0; i < 100; i++)
+    histogram.record(10);
+  histogram.snapshot(&first);
+
+  for (int i = 0; i < 95; i++)
+    histogram.record(700);
+  for (int i = 0; i < 5; i++)
+    histogram.record(3000);
+  histogram.snapshot(&second);
+  EXPECT(second.total() - first.total() == 100);
+  EXPECT(second.percentile(first, 50) == 1000);
+  EXPECT(second.percentile(first, 95) == 1000);
+  EXPECT(second.percentile(first, 96) == 3000);
+  // Nothing recorded since
+  EXPECT(second.percentile(second, 95) == 0);
+}
+
+TEST(overflow_bucket_reports_largest_sample) {
+  LatencyHistogram histogram;
+  LatencyHistogram::Snapshot empty, snapshot;
+  histogram.record(5000000);
+  histogram.record(UINT32_MAX);
+  histogram.snapshot(&snapshot);
+  EXPECT(snapshot.counts[LatencyHistogram::BUCKETS - 1] == 2);
+  EXPECT(snapshot.percentile(empty, 50) == UINT32_MAX);
+  EXPECT(snapshot.percentile(empty, 100) == UINT32_MAX);
+}
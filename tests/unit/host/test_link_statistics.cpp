@@ -0,0 +1,86 @@
+// Link statistics: RSSI bucketing and event counters, alone and as counted by
+// the radio for received frames.
+//
+// Sources: wmbus_radio/component.cpp wmbus_radio/dispatcher.cpp
+// Sources: wmbus_radio/packet.cpp wmbus_radio/packet_pool.cpp
+// Sources: wmbus_radio/transceiver.cpp wmbus_radio/transceiver_cc1101.cpp
+// Sources: wmbus_radio/transceiver_sx1276.cpp wmbus_radio/decode3of6.cpp
+// Sources: wmbus_radio/duplicate_filter.cpp wmbus_radio/frame_format.cpp
+// Sources: wmbus_radio/latency_histogram.cpp wmbus_radio/link_statistics.cpp
+// Sources: wmbus_radio/listen_scheduler.cpp
+// Sources: wmbus_radio/transmission_interval.cpp wmbus_common
+
+#include "check.h"
+#include "fake_radio.h"
+#include "frames.h"
+
+using namespace esphome;
+using namespace esphome::wmbus_radio;
+using fake_radio::TestRadio;
+
+TEST(nothing_counted_initially) {
+  LinkStatistics statistics;
+  LinkStatistics::Snapshot snapshot;
+  statistics.snapshot(&snapshot);
+  for (auto count : snapshot.events)
+    EXPECT(count == 0);
+  for (auto count : snapshot.rssi_counts)
+    EXPECT(count == 0);
+}
+
+TEST(rssi_bucket_limits_are_inclusive) {
+  LinkStatistics statistics;
+  LinkStatistics::Snapshot snapshot;
+  for (int8_t rssi : {-120, -100, -99, -50, -49, 0})
+    statistics.record_frame(rssi);
+  statistics.snapshot(&snapshot);
+  EXPECT(snapshot.rssi_counts[0] == 2);
+  EXPECT(snapshot.rssi_counts[1] == 1);
+  EXPECT(snapshot.rssi_counts[5] == 1);
+  EXPECT(snapshot.rssi_counts[LinkStatistics::RSSI_BUCKETS - 1] == 2);
+  EXPECT(snapshot.count(LinkEvent::FRAME) == 6);
+}
+
+TEST(events_are_counted_separately) {
+  LinkStatistics statistics;
+  LinkStatistics::Snapshot snapshot;
+  statistics.count(LinkEvent::CRC_ERROR);
+  statistics.count(LinkEvent::CRC_ERROR);
+  statistics.count(LinkEvent::PREAMBLE_TIMEOUT);
+  statistics.snapshot(&snapshot);
+  EXPECT(snapshot.count(LinkEvent::CRC_ERROR) == 2);
+  EXPECT(snapshot.count(LinkEvent::PREAMBLE_TIMEOUT) == 1);
+  EXPECT(snapshot.count(LinkEvent::FRAME) == 0);
+  EXPECT(snapshot.count(LinkEvent::FRAME_REJECTED) == 0);
+}
+
+TEST(radio_counts_received_frames) {
+  Dispatcher dispatcher;
+  TestRadio radio(&dispatcher);
+  radio.setup();
+
+  auto good = frames::c1_format_a(frames::dll(0x12345678));
+  auto corrupted = good;
+  corrupted[8] ^= 0x01;
+  radio.receive(good);
+  radio.receive(corrupted);
+  // Preamble of neither format
+  radio.receive({0x00, 0x00, 0x00});
+  // Nothing in FIFO after the interrupt
+  radio.transceiver.fifo.clear();
+  host::notifications++;
+  radio.receive_frame();
+  for (int i = 0; i < 3; i++)
+    radio.loop();
+
+  LinkStatistics::Snapshot snapshot;
+  radio.link_statistics().snapshot(&snapshot);
+  // Frame with CRC error is counted, but still left to checkWMBusFrame
+  EXPECT(snapshot.count(LinkEvent::CRC_ERROR) == 1);
+  EXPECT(snapshot.count(LinkEvent::FRAME) == 2);
+  EXPECT(snapshot.count(LinkEvent::FRAME_REJECTED) == 0);
+  // Fake transceiver reports -60 dBm
+  EXPECT(snapshot.rssi_counts[4] == 2);
+  EXPECT(snapshot.count(LinkEvent::DECODE_ERROR) == 1);
+  EXPECT(snapshot.count(LinkEvent::PREAMBLE_TIMEOUT) == 1);
+}
@@ -0,0 +1,121 @@
+// Listen scheduler: interval learning and sleeping between predicted windows
+// of configured meters.
+//
+// Sources: wmbus_radio/listen_scheduler.cpp wmbus_radio/transmission_interval.cpp
+
+#include "check.h"
+
+#include "esphome/components/wmbus_radio/listen_scheduler.h"
+
+using namespace esphome::wmbus_radio;
+
+TEST(disabled_by_default) {
+  ListenScheduler scheduler;
+  EXPECT(!scheduler.enabled());
+  scheduler.record_frame(1, 0);
+  scheduler.record_frame(1, 10000);
+  scheduler.record_frame(1, 20000);
+  EXPECT(scheduler.captured() == 0);
+}
+
+TEST(repetitions_do_not_count_as_telegrams) {
+  ListenScheduler scheduler;
+  scheduler.set_learning(true);
+  EXPECT(scheduler.enabled());
+  scheduler.record_frame(1, 0);
+  scheduler.record_frame(1, 500);
+  scheduler.record_frame(1, 10000);
+  scheduler.record_frame(1, 30000);
+  EXPECT(scheduler.captured() == 1 && scheduler.missed() == 1);
+}
+
+TEST(learning_alone_keeps_listening) {
+  ListenScheduler scheduler;
+  scheduler.set_learning(true);
+  scheduler.set_guard_time(100);
+  scheduler.add_meter(7);
+  scheduler.update(0);
+  EXPECT(scheduler.listening());
+  EXPECT(scheduler.remaining_ms(0) == ListenScheduler::LISTEN_PERIOD_MS);
+
+  scheduler.record_frame(7, 500);
+  scheduler.record_frame(7, 10500);
+  uint32_t at_ms;
+  EXPECT(scheduler.next_expected(11000, &at_ms) && at_ms == 20500);
+  // Back by the next window, but does not sleep in between
+  scheduler.update(11000);
+  EXPECT(scheduler.listening());
+  EXPECT(scheduler.remaining_ms(11000) == 9400);
+  EXPECT(scheduler.sleep_ms() == 0 && scheduler.listen_ms() == 11000);
+}
+
+TEST(sleeps_between_windows_of_configured_meters) {
+  ListenScheduler scheduler;
+  scheduler.set_learning(true);
+  scheduler.set_sleep(true);
+  scheduler.set_guard_time(100);
+  scheduler.add_meter(7);
+  scheduler.update(0);
+  scheduler.record_frame(7, 500);
+  scheduler.record_frame(7, 10500);
+  // Meter that is not configured is learned, but not waited for
+  scheduler.record_frame(9, 10600);
+
+  scheduler.update(11000);
+  EXPECT(!scheduler.listening());
+  EXPECT(scheduler.remaining_ms(11000) == 9400);
+  scheduler.update(20400);
+  EXPECT(scheduler.listening());
+  // Whole window around the expected telegram
+  EXPECT(scheduler.remaining_ms(20400) == 200);
+  EXPECT(scheduler.sleep_ms() == 9400 && scheduler.listen_ms() == 11000);
+
+  // Telegram missed, sleeps until the window after
+  scheduler.update(20600);
+  EXPECT(!scheduler.listening());
+  EXPECT(scheduler.remaining_ms(20600) == 9800);
+  // Missing too many telegrams wakes the radio up for good
+  scheduler.update(60600);
+  EXPECT(scheduler.listening());
+}
+
+TEST(listens_until_every_configured_meter_is_predictable) {
+  ListenScheduler scheduler;
+  scheduler.set_learning(true);
+  scheduler.set_sleep(true);
+  scheduler.set_guard_time(100);
+  scheduler.add_meter(7);
+  scheduler.add_meter(8);
+  scheduler.update(0);
+  scheduler.record_frame(7, 500);
+  scheduler.record_frame(7, 10500);
+
+  scheduler.update(11000);
+  EXPECT(scheduler.listening());
+
+  scheduler.record_frame(8, 12000);
+  scheduler.record_frame(8, 17000);
+  scheduler.update(17100);
+  EXPECT(!scheduler.listening());
+  // Earliest of both windows
+  EXPECT(scheduler.remaining_ms(17100) == 20400 - 17100);
+}
+
+TEST(configured_meters_do_not_limit_learned_ones) {
+  ListenScheduler scheduler;
+  scheduler.set_learning(true);
+  for (uint32_t id = 0; id < 40; id++)
+    scheduler.add_meter(id);
+  for (uint32_t id = 100; id < 100 + ListenScheduler::MAX_METERS + 1; id++) {
+    scheduler.record_frame(id, 0);
+    scheduler.record_frame(id, 10000);
+    scheduler.record_frame(id, 20000);
+  }
+  EXPECT(scheduler.captured() == ListenScheduler::MAX_METERS);
+
+  // Configured meters are learned beyond the limit
+  scheduler.record_frame(39, 0);
+  scheduler.record_frame(39, 10000);
+  scheduler.record_frame(39, 20000);
+  EXPECT(scheduler.captured() == ListenScheduler::MAX_METERS + 1);
+}
@@ -0,0 +1,134 @@
+// Meter values: field ids interned by the meter and sensor field handles,
+// resolved before and after the values they refer to are received.
+//
+// Sources: wmbus_meter/wmbus_meter.cpp wmbus_common/driver_hcae2.cc
+// Sources: wmbus_common/driver_izar.cc
+// Sources: wmbus_radio/component.cpp wmbus_radio/dispatcher.cpp
+// Sources: wmbus_radio/packet.cpp wmbus_radio/packet_pool.cpp
+// Sources: wmbus_radio/transceiver.cpp wmbus_radio/transceiver_cc1101.cpp
+// Sources: wmbus_radio/transceiver_sx1276.cpp wmbus_radio/decode3of6.cpp
+// Sources: wmbus_radio/duplicate_filter.cpp wmbus_radio/frame_format.cpp
+// Sources: wmbus_radio/latency_histogram.cpp wmbus_radio/link_statistics.cpp
+// Sources: wmbus_radio/listen_scheduler.cpp
+// Sources: wmbus_radio/transmission_interval.cpp wmbus_common
+
+#include <cmath>
+#include <string>
+
+#include "check.h"
+#include "fake_radio.h"
+#include "frames.h"
+
+#include "esphome/components/wmbus_meter/wmbus_meter.h"
+
+using namespace esphome;
+using namespace esphome::wmbus_radio;
+using esphome::wmbus_meter::FieldHandle;
+using esphome::wmbus_meter::FieldSource;
+using fake_radio::TestRadio;
+
+// Test telegrams of the drivers, see driver_hcae2.cc and driver_izar.cc
+static const char *HCAE2 =
+    "7644C52501880188550872_01880188C5255508010000002F2F0B6E332211426E110182016"
+    "E1102C2016E110382026E1104C2026E110582036E1106C2036E110782046E1108C2046E11"
+    "0982056E1110C2056E111182066E1112C2066E111382076E1114C2076E111582086E1116C"
+    "2086E111702FD172100";
+static const char *IZAR = "1944304C72242421D401A2_013D4013DD8B46A4999C1293E582CC";
+
+class TestMeter : public wmbus_meter::Meter {
+public:
+  TestMeter(const std::string &id, const std::string &driver,
+            TestRadio &radio) {
+    this->set_meter_params(id, driver, "", {LinkMode::T1, LinkMode::C1});
+    this->set_radio(&radio);
+  }
+
+  using Meter::meter;
+};
+
+struct Site {
+  Site() { this->radio.setup(); }
+
+  void receive(const char *telegram) {
+    this->radio.receive(frames::c1_format_a(frames::from_hex(telegram)));
+    this->radio.loop();
+  }
+
+  Dispatcher dispatcher;
+  TestRadio radio{&dispatcher};
+};
+
+static bool near(optional<float> value, float expected) {
+  return value.has_value() && std::fabs(*value - expected) < 1e-4f;
+}
+
+TEST(value_ids_are_interned_once) {
+  Site site;
+  TestMeter meter("88018801", "hcae2", site.radio);
+  auto &values = *meter.meter;
+
+  // Field of the driver, interned when it was added
+  auto current = values.numericValueId("current_consumption", Unit::HCA);
+  EXPECT(current == values.numericValueId("current_consumption", Unit::HCA));
+  // Named after dventries, interned by the lookup
+  auto date_2 = values.numericValueId("consumption_at_set_date_2", Unit::HCA);
+  EXPECT(date_2 != current);
+  EXPECT(date_2 == values.numericValueId("consumption_at_set_date_2", Unit::HCA));
+  EXPECT(std::isnan(values.getNumericValueById(date_2, Unit::HCA)));
+
+  site.receive(HCAE2);
+  EXPECT(values.getNumericValueById(current, Unit::HCA) == 112233);
+  EXPECT(values.getNumericValueById(date_2, Unit::HCA) == 529);
+  EXPECT(values.getNumericValue("consumption_at_set_date_2", Unit::HCA) == 529);
+
+  // Interned without a value, not printed
+  values.numericValueId("consumption_at_set_date_18", Unit::HCA);
+  EXPECT(std::isnan(values.getNumericValue("consumption_at_set_date_18",
+                                           Unit::HCA)));
+  auto json = meter.as_json();
+  EXPECT(json.find("\"consumption_at_set_date_2_hca\":529") != std::string::npos);
+  EXPECT(json.find("consumption_at_set_date_18") == std::string::npos);
+}
+
+TEST(field_resolved_before_first_telegram) {
+  Site site;
+  TestMeter meter("88018801", "hcae2", site.radio);
+  auto current = meter.resolve_numeric_field("current_consumption_hca");
+  auto date_2 = meter.resolve_numeric_field("consumption_at_set_date_2_hca");
+  auto unknown = meter.resolve_numeric_field("consumption_at_set_date_18_hca");
+  EXPECT(date_2.source == FieldSource::VALUE);
+  EXPECT(!meter.get_numeric_field(current).has_value());
+  EXPECT(!meter.get_numeric_field(date_2).has_value());
+
+  site.receive(HCAE2);
+  EXPECT(near(meter.get_numeric_field(current), 112233));
+  EXPECT(near(meter.get_numeric_field(date_2), 529));
+  EXPECT(!meter.get_numeric_field(unknown).has_value());
+}
+
+TEST(field_resolved_after_value_is_received) {
+  Site site;
+  TestMeter meter("88018801", "hcae2", site.radio);
+  site.receive(HCAE2);
+
+  auto date_17 = meter.resolve_numeric_field("consumption_at_set_date_17_hca");
+  EXPECT(near(meter.get_numeric_field(date_17), 5905));
+  EXPECT(near(meter.get_numeric_field("consumption_at_set_date_17_hca"), 5905));
+  auto rssi = meter.resolve_numeric_field("rssi_dbm");
+  EXPECT(rssi.source == FieldSource::RSSI);
+}
+
+TEST(field_resolved_with_unit_conversion) {
+  Site site;
+  TestMeter meter("21242472", "izar", site.radio);
+  // Driver stores litres, fields are in m3
+  auto total = meter.resolve_numeric_field("total_m3");
+  auto last_month = meter.resolve_numeric_field("last_month_total_m3");
+  auto date = meter.resolve_string_field("last_month_measure_date");
+  EXPECT(date.source == FieldSource::VALUE);
+
+  site.receive(IZAR);
+  EXPECT(near(meter.get_numeric_field(total), 3.488f));
+  EXPECT(near(meter.get_numeric_field(last_month), 3.486f));
+  EXPECT(meter.get_string_field(date) == std::string("2019-09-30"));
+}
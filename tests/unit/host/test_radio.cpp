@@ -0,0 +1,259 @@
+// Radio component on simulated time and FreeRTOS, driven directly by the test
+// instead of the receiver task and main loop.
+//
+// Sources: wmbus_radio/component.cpp wmbus_radio/dispatcher.cpp
+// Sources: wmbus_radio/packet.cpp wmbus_radio/packet_pool.cpp
+// Sources: wmbus_radio/transceiver.cpp wmbus_radio/transceiver_cc1101.cpp
+// Sources: wmbus_radio/transceiver_sx1276.cpp wmbus_radio/decode3of6.cpp
+// Sources: wmbus_radio/duplicate_filter.cpp wmbus_radio/frame_format.cpp
+// Sources: wmbus_radio/latency_histogram.cpp wmbus_radio/link_statistics.cpp
+// Sources: wmbus_radio/listen_scheduler.cpp
+// Sources: wmbus_radio/transmission_interval.cpp wmbus_common
+
+#include <cstring>
+
+#include "check.h"
+#include "fake_radio.h"
+#include "frames.h"
+
+#include "esphome/components/wmbus_radio/component.h"
+
+using namespace esphome;
+using namespace esphome::wmbus_radio;
+using fake_radio::TestRadio;
+
+static std::vector<uint8_t> c1_frame(uint32_t id) {
+  return frames::c1_format_a(frames::dll(id));
+}
+
+// Ids of dispatched frames, each handler call taking cost_us of main loop
+static void record_ids(Dispatcher &dispatcher, std::vector<uint32_t> &ids,
+                       uint32_t cost_us = 0) {
+  dispatcher.add_frame_handler([&ids, cost_us](Frame *frame) {
+    ids.push_back(frame->header().addresses[0].id);
+    frame->mark_as_handled();
+    host::advance_us(cost_us);
+  });
+}
+
+// Packet with first `size` bytes of a C1 frame received
+static void feed(Packet &packet, const std::vector<uint8_t> &bytes,
+                 size_t size) {
+  packet.reset();
+  std::memcpy(packet.rx_data_ptr(), bytes.data(), 3);
+  packet.rx_advance(3);
+  packet.calculate_payload_size();
+  std::memcpy(packet.rx_data_ptr(), bytes.data() + 3, size - 3);
+  packet.rx_advance(size - 3);
+}
+
+TEST(receiver_task_core_follows_setting) {
+  struct Case {
+    int setting;
+    BaseType_t core;
+  } cases[] = {
+      // WiFi task runs on core 0 unless pinned to core 1
+      {TASK_CORE_AUTO, 1},
+      {TASK_CORE_ANY, tskNO_AFFINITY},
+      {0, 0},
+      {1, 1},
+      {portNUM_PROCESSORS, tskNO_AFFINITY},
+  };
+  for (auto &c : cases) {
+    Dispatcher dispatcher;
+    Radio radio;
+    radio.set_dispatcher(&dispatcher);
+    radio.set_task_core(c.setting);
+    radio.setup();
+    EXPECT(!radio.is_failed());
+    EXPECT(host::task_core == c.core);
+  }
+}
+
+TEST(drop_newest_keeps_queued_packets) {
+  Dispatcher dispatcher;
+  std::vector<uint32_t> ids;
+  record_ids(dispatcher, ids);
+  TestRadio radio(&dispatcher);
+  radio.set_queue_size(2);
+  radio.setup();
+
+  for (uint32_t id = 1; id <= 3; id++)
+    radio.receive(c1_frame(id));
+  EXPECT(radio.queue_enqueued() == 2);
+  EXPECT(radio.queue_dropped() == 1);
+  EXPECT(radio.queue_max_occupancy() == 2);
+
+  for (int i = 0; i < 3; i++)
+    radio.loop();
+  EXPECT((ids == std::vector<uint32_t>{1, 2}));
+  EXPECT(radio.pool().in_use() == 0);
+}
+
+TEST(drop_oldest_keeps_latest_packets) {
+  Dispatcher dispatcher;
+  std::vector<uint32_t> ids;
+  record_ids(dispatcher, ids);
+  TestRadio radio(&dispatcher);
+  radio.set_queue_size(2);
+  radio.set_queue_overflow_policy(QueueOverflowPolicy::DROP_OLDEST);
+  radio.setup();
+
+  for (uint32_t id = 1; id <= 4; id++)
+    radio.receive(c1_frame(id));
+  EXPECT(radio.queue_enqueued() == 4);
+  EXPECT(radio.queue_dropped() == 2);
+
+  for (int i = 0; i < 3; i++)
+    radio.loop();
+  EXPECT((ids == std::vector<uint32_t>{3, 4}));
+  // Dropped packets went back to the pool too
+  EXPECT(radio.pool().in_use() == 0);
+}
+
+TEST(exhausted_pool_skips_frame_until_buffer_is_released) {
+  Dispatcher dispatcher;
+  std::vector<uint32_t> ids;
+  record_ids(dispatcher, ids);
+  TestRadio radio(&dispatcher);
+  radio.set_queue_size(1);
+  radio.setup();
+
+  // Queue and the two packets in flight
+  auto &pool = radio.pool();
+  EXPECT(pool.size() == 3);
+  Packet *held[3];
+  for (auto &packet : held)
+    packet = pool.acquire();
+  EXPECT(pool.high_water_mark() == 3);
+
+  radio.receive(c1_frame(1));
+  EXPECT(pool.exhausted_count() == 1);
+  EXPECT(radio.queue_enqueued() == 0);
+
+  pool.release(held[0]);
+  radio.receive(c1_frame(2));
+  radio.loop();
+  EXPECT((ids == std::vector<uint32_t>{2}));
+  EXPECT(pool.exhausted_count() == 1);
+  EXPECT(pool.in_use() == 2);
+}
+
+TEST(without_budget_one_packet_is_dispatched_per_loop) {
+  Dispatcher dispatcher;
+  std::vector<uint32_t> ids;
+  record_ids(dispatcher, ids, 100);
+  TestRadio radio(&dispatcher);
+  radio.set_queue_size(4);
+  radio.setup();
+
+  for (uint32_t id = 1; id <= 3; id++)
+    radio.receive(c1_frame(id));
+  radio.loop();
+  EXPECT(ids.size() == 1);
+  EXPECT(radio.dispatch_last_batch_size() == 1);
+  radio.loop();
+  radio.loop();
+  EXPECT(ids.size() == 3);
+}
+
+TEST(budget_defers_packets_to_next_loop) {
+  Dispatcher dispatcher;
+  std::vector<uint32_t> ids;
+  record_ids(dispatcher, ids, 400);
+  TestRadio radio(&dispatcher);
+  radio.set_queue_size(5);
+  radio.set_dispatch_time_budget(1000);
+  radio.setup();
+
+  for (uint32_t id = 1; id <= 5; id++)
+    radio.receive(c1_frame(id));
+
+  // 400, 800 us within budget, third packet runs over and ends the batch
+  radio.loop();
+  EXPECT(ids.size() == 3);
+  EXPECT(radio.dispatch_last_batch_size() == 3);
+  EXPECT(radio.dispatch_last_time_us() == 1200);
+
+  radio.loop();
+  EXPECT((ids == std::vector<uint32_t>{1, 2, 3, 4, 5}));
+  EXPECT(radio.dispatch_last_batch_size() == 2);
+  EXPECT(radio.dispatch_max_batch_size() == 3);
+  EXPECT(radio.dispatch_max_time_us() == 1200);
+
+  // Empty queue keeps statistics of the last batch
+  radio.loop();
+  EXPECT(radio.dispatch_last_batch_size() == 2);
+}
+
+TEST(address_filter_decides_once_address_is_received) {
+  Dispatcher dispatcher;
+  TestRadio radio(&dispatcher);
+  radio.add_address_filter_id(0x12345678);
+  radio.setup();
+
+  Packet packet;
+  auto configured = frames::c1_format_a(frames::dll(0x12345678));
+  feed(packet, configured, 2 + 9);
+  EXPECT(radio.filter_address_(&packet) == AddressFilterResult::PENDING);
+  feed(packet, configured, 2 + 10);
+  EXPECT(radio.filter_address_(&packet) == AddressFilterResult::ACCEPT);
+
+  // CI-field follows the first block CRC
+  auto other = frames::c1_format_a(frames::dll(0x87654321));
+  feed(packet, other, 2 + 12);
+  EXPECT(radio.filter_address_(&packet) == AddressFilterResult::PENDING);
+  feed(packet, other, 2 + 13);
+  EXPECT(radio.filter_address_(&packet) == AddressFilterResult::REJECT);
+}
+
+TEST(address_filter_accepts_meter_behind_converter) {
+  Dispatcher dispatcher;
+  TestRadio radio(&dispatcher);
+  radio.add_address_filter_id(0x12345678);
+  radio.setup();
+
+  Packet packet;
+  auto converted = frames::c1_format_a(
+      frames::dll(0x99999999, 0x2c2d, frames::long_tpl(0x12345678)));
+  feed(packet, converted, 2 + 16);
+  EXPECT(radio.filter_address_(&packet) == AddressFilterResult::PENDING);
+  feed(packet, converted, 2 + 17);
+  EXPECT(radio.filter_address_(&packet) == AddressFilterResult::ACCEPT);
+
+  auto unknown = frames::c1_format_a(
+      frames::dll(0x99999999, 0x2c2d, frames::long_tpl(0x11111111)));
+  feed(packet, unknown, 2 + 17);
+  EXPECT(radio.filter_address_(&packet) == AddressFilterResult::REJECT);
+
+  // Format B has no CRC between address and CI-field
+  auto format_b = frames::c1_format_b(
+      frames::dll(0x99999999, 0x2c2d, frames::long_tpl(0x12345678)));
+  feed(packet, format_b, 2 + 14);
+  EXPECT(radio.filter_address_(&packet) == AddressFilterResult::PENDING);
+  feed(packet, format_b, 2 + 15);
+  EXPECT(radio.filter_address_(&packet) == AddressFilterResult::ACCEPT);
+}
+
+TEST(address_filter_discards_frames_in_receiver_task) {
+  Dispatcher dispatcher;
+  std::vector<uint32_t> ids;
+  record_ids(dispatcher, ids);
+  TestRadio radio(&dispatcher);
+  radio.add_address_filter_id(0x12345678);
+  radio.set_address_filter(true);
+  radio.setup();
+
+  radio.receive(c1_frame(0x87654321));
+  EXPECT(radio.address_filtered() == 1);
+  EXPECT(radio.queue_enqueued() == 0);
+  EXPECT(radio.pool().in_use() == 0);
+
+  radio.receive(c1_frame(0x12345678));
+  radio.receive(frames::c1_format_a(
+      frames::dll(0x99999999, 0x2c2d, frames::long_tpl(0x12345678))));
+  radio.loop();
+  radio.loop();
+  EXPECT(radio.address_filtered() == 1);
+  EXPECT((ids == std::vector<uint32_t>{0x12345678, 0x99999999}));
+}
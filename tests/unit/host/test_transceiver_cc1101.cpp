@@ -0,0 +1,222 @@
+// CC1101 driver reading frames from a simulated chip, which fills its RX FIFO
+// at T1 chip rate and raises GDO0 on the RX FIFO threshold.
+//
+// Sources: wmbus_radio/transceiver.cpp wmbus_radio/transceiver_cc1101.cpp
+
+#include <deque>
+#include <vector>
+
+#include "check.h"
+
+#include "esphome/components/wmbus_radio/transceiver_cc1101.h"
+
+#include "freertos/task.h"
+
+using namespace esphome;
+using namespace esphome::wmbus_radio;
+
+static const uint8_t IOCFG0 = 0x02;
+static const uint8_t FIFOTHR = 0x03;
+static const uint8_t MARCSTATE = 0x35;
+static const uint8_t RXBYTES = 0x3B;
+static const uint8_t FIFO = 0x3F;
+static const size_t FIFO_SIZE = 64;
+
+class SimulatedCC1101 : public spi::SPIDevice {
+public:
+  // 100 kchip/s, as in T1 mode
+  static const uint32_t BYTE_US = 80;
+
+  SimulatedCC1101() {
+    // Wait for data interrupt the way the receiver task does
+    host::on_block = [this](TickType_t ticks) {
+      this->blocks++;
+      auto end = host::now_us + ticks * 1000;
+      while (!host::notifications && host::now_us < end) {
+        host::now_us = this->air_.empty()
+                           ? end
+                           : std::min<uint64_t>(end, this->next_byte_us_);
+        this->receive_();
+      }
+      return 0;
+    };
+  }
+
+  void transmit(const std::vector<uint8_t> &bytes) {
+    this->receive_();
+    if (this->air_.empty())
+      this->next_byte_us_ = host::now_us + BYTE_US;
+    this->air_.insert(this->air_.end(), bytes.begin(), bytes.end());
+  }
+
+  size_t rx_threshold() { return 4 * ((this->registers[FIFOTHR] & 0x0F) + 1); }
+
+  void begin_transaction() override {
+    this->receive_();
+    this->header_ = -1;
+    this->transactions++;
+  }
+
+  uint8_t transfer(uint8_t data) override {
+    if (this->header_ < 0) {
+      this->header_ = data;
+      uint8_t address = data & 0x3F;
+      if (address >= 0x30 && address <= 0x3D && !(data & 0x40))
+        this->strobe_(address);
+      return 0;
+    }
+
+    uint8_t address = this->header_ & 0x3F;
+    bool read = this->header_ & 0x80, burst = this->header_ & 0x40;
+    if (address == FIFO && read) {
+      if (this->fifo_.empty())
+        return 0;
+      uint8_t byte = this->fifo_.front();
+      this->fifo_.pop_front();
+      this->update_gdo0_();
+      return byte;
+    }
+    if (read && burst && address == RXBYTES)
+      return this->fifo_.size();
+    if (read && burst && address == MARCSTATE)
+      return this->marcstate_;
+    if (read)
+      return this->registers[address];
+
+    this->registers[address] = data;
+    this->update_gdo0_();
+    return 0;
+  }
+
+  uint8_t registers[0x30]{};
+  size_t transactions{0};
+  size_t blocks{0};
+
+protected:
+  void strobe_(uint8_t command) {
+    if (command == 0x36) // SIDLE
+      this->marcstate_ = 0x01;
+    else if (command == 0x34) // SRX
+      this->marcstate_ = 0x0D;
+    else if (command == 0x3A) // SFRX
+      this->fifo_.clear();
+    this->update_gdo0_();
+  }
+
+  void receive_() {
+    while (!this->air_.empty() && this->next_byte_us_ <= host::now_us) {
+      if (this->marcstate_ == 0x0D && this->fifo_.size() < FIFO_SIZE)
+        this->fifo_.push_back(this->air_.front());
+      this->air_.pop_front();
+      this->next_byte_us_ += BYTE_US;
+      this->update_gdo0_();
+    }
+  }
+
+  void update_gdo0_() {
+    // IOCFG0 0x00: asserted at or above RX FIFO threshold
+    bool gdo0 = this->registers[IOCFG0] == 0x00 &&
+                this->fifo_.size() >= this->rx_threshold();
+    if (gdo0 && !this->gdo0_)
+      host::notifications++;
+    this->gdo0_ = gdo0;
+  }
+
+  std::deque<uint8_t> air_;
+  std::deque<uint8_t> fifo_;
+  uint64_t next_byte_us_{0};
+  uint8_t marcstate_{0x01};
+  int header_{-1};
+  bool gdo0_{false};
+};
+
+static std::vector<uint8_t> frame(size_t size) {
+  std::vector<uint8_t> bytes(size);
+  for (size_t i = 0; i < size; i++)
+    bytes[i] = i * 7 + 1;
+  return bytes;
+}
+
+// As Radio::receive_frame and read_packet_ do: wait for frame start, read
+// preamble, then the rest in chunks
+static bool receive(CC1101 &radio, std::vector<uint8_t> &received,
+                    size_t size) {
+  received.assign(size, 0);
+  if (!ulTaskNotifyTake(pdTRUE, pdMS_TO_TICKS(1000)))
+    return false;
+  if (!radio.read_in_task(received.data(), 3))
+    return false;
+  for (size_t offset = 3; offset < size; offset += 24)
+    if (!radio.read_in_task(received.data() + offset,
+                            std::min<size_t>(24, size - offset)))
+      return false;
+  return true;
+}
+
+TEST(frame_read_with_one_wakeup_per_chunk) {
+  SimulatedCC1101 chip;
+  CC1101 radio;
+  radio.set_spi_delegate(&chip);
+  radio.restart_rx();
+  EXPECT(chip.rx_threshold() == 4);
+
+  // 3 + 4 * 24 + 5 bytes, and noise after the frame as in infinite mode
+  auto bytes = frame(104);
+  chip.transmit(bytes);
+  chip.transmit(frame(16));
+  chip.transactions = 0;
+
+  std::vector<uint8_t> received;
+  EXPECT(receive(radio, received, bytes.size()));
+  EXPECT(received == bytes);
+  // Frame start and each chunk after preamble, no polling
+  EXPECT(chip.blocks == 1 + 5);
+  // Complete soon after the last byte on air, below 1 ms polling period
+  EXPECT(host::now_us < (bytes.size() + 4) * SimulatedCC1101::BYTE_US);
+  // Status reads before and after waiting, burst read and threshold change
+  EXPECT(chip.transactions <= 6 * 5);
+}
+
+TEST(threshold_follows_requested_chunk) {
+  SimulatedCC1101 chip;
+  CC1101 radio;
+  radio.set_spi_delegate(&chip);
+  radio.restart_rx();
+
+  chip.transmit(frame(64));
+  std::vector<uint8_t> received;
+  EXPECT(receive(radio, received, 3 + 24));
+  // Chunk and the byte kept in FIFO, rounded up to steps of 4
+  EXPECT(chip.rx_threshold() == 28);
+
+  radio.restart_rx();
+  EXPECT(chip.rx_threshold() == 4);
+}
+
+TEST(left_over_interrupt_does_not_end_read) {
+  SimulatedCC1101 chip;
+  CC1101 radio;
+  radio.set_spi_delegate(&chip);
+  radio.restart_rx();
+
+  auto bytes = frame(24);
+  chip.transmit(bytes);
+  chip.transmit(frame(8));
+  host::notifications = 1;
+  std::vector<uint8_t> received(bytes.size());
+  EXPECT(radio.read_in_task(received.data(), received.size()));
+  EXPECT(received == bytes);
+}
+
+TEST(read_fails_once_air_goes_quiet) {
+  SimulatedCC1101 chip;
+  CC1101 radio;
+  radio.set_spi_delegate(&chip);
+  radio.restart_rx();
+
+  chip.transmit(frame(10));
+  std::vector<uint8_t> received(24);
+  EXPECT(!radio.read_in_task(received.data(), received.size()));
+  // Gives up within the FIFO threshold timeout instead of hanging
+  EXPECT(host::now_us < 20 * 1000);
+}
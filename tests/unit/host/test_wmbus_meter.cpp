@@ -0,0 +1,169 @@
+// Meter component: address expressions matched against frame headers before
+// any parsing, compared with the wmbusmeters rules they stand in for.
+//
+// Sources: wmbus_meter/wmbus_meter.cpp wmbus_common/driver_hcae2.cc
+// Sources: wmbus_radio/component.cpp wmbus_radio/dispatcher.cpp
+// Sources: wmbus_radio/packet.cpp wmbus_radio/packet_pool.cpp
+// Sources: wmbus_radio/transceiver.cpp wmbus_radio/transceiver_cc1101.cpp
+// Sources: wmbus_radio/transceiver_sx1276.cpp wmbus_radio/decode3of6.cpp
+// Sources: wmbus_radio/duplicate_filter.cpp wmbus_radio/frame_format.cpp
+// Sources: wmbus_radio/latency_histogram.cpp wmbus_radio/link_statistics.cpp
+// Sources: wmbus_radio/listen_scheduler.cpp
+// Sources: wmbus_radio/transmission_interval.cpp wmbus_common
+
+#include <cstring>
+#include <random>
+#include <string>
+
+#include "check.h"
+#include "fake_radio.h"
+#include "frames.h"
+
+#include "esphome/components/wmbus_meter/wmbus_meter.h"
+
+using namespace esphome;
+using namespace esphome::wmbus_radio;
+using fake_radio::TestRadio;
+
+static const uint16_t KAM = 0x2c2d;
+static const uint16_t DME = 0x11a5;
+static const uint16_t PII = MANFCODE('P', 'I', 'I');
+
+class TestMeter : public wmbus_meter::Meter {
+public:
+  TestMeter(const std::string &id, TestRadio &radio) {
+    this->set_meter_params(id, "hcae2", "", {LinkMode::T1, LinkMode::C1});
+    this->set_radio(&radio);
+  }
+
+  // Only set by wmbusmeters identity modes, not by the id option
+  void require_last() { this->header_matches_.back().required = true; }
+
+  using Meter::matches_header_;
+};
+
+// Frame of a received C1 transmission, as Radio hands it to handlers
+struct Received {
+  explicit Received(const std::vector<uint8_t> &dll) {
+    auto bytes = frames::c1_format_a(dll);
+    std::memcpy(this->packet.rx_data_ptr(), bytes.data(), 3);
+    this->packet.rx_advance(3);
+    this->packet.calculate_payload_size();
+    std::memcpy(this->packet.rx_data_ptr(), bytes.data() + 3, bytes.size() - 3);
+    this->packet.rx_advance(this->packet.rx_capacity());
+    EXPECT(this->packet.remove_crcs());
+    LinkStatistics statistics;
+    auto frame = this->packet.convert_to_frame(&statistics);
+    EXPECT(frame.has_value());
+    if (frame)
+      this->frame.emplace(*frame);
+  }
+
+  Packet packet;
+  std::optional<Frame> frame;
+};
+
+TEST(header_of_frame_from_meter) {
+  Received received(frames::dll(0x12345678, KAM));
+  auto &header = received.frame->header();
+  EXPECT(header.complete);
+  EXPECT(header.ci_field == 0x78);
+  EXPECT(header.addresses_count == 1);
+  EXPECT(header.addresses[0].id == 0x12345678);
+  EXPECT(header.addresses[0].manufacturer == KAM);
+  EXPECT(header.addresses[0].version == 0x1b);
+  EXPECT(header.addresses[0].type == 0x07);
+  EXPECT(header.addresses[0].to_address().id == "12345678");
+}
+
+TEST(header_of_frame_behind_converter) {
+  Received received(frames::dll(
+      0x99999999, KAM, frames::long_tpl(0x1234abcd, DME, 0x01, 0x08)));
+  auto &header = received.frame->header();
+  EXPECT(header.complete);
+  EXPECT(header.ci_field == 0x72);
+  EXPECT(header.addresses_count == 2);
+  EXPECT(header.addresses[0].id == 0x99999999);
+  EXPECT(header.addresses[0].manufacturer == KAM);
+  EXPECT(header.addresses[1].id == 0x1234abcd);
+  EXPECT(header.addresses[1].manufacturer == DME);
+  EXPECT(header.addresses[1].version == 0x01);
+  EXPECT(header.addresses[1].type == 0x08);
+  // Lower case, as wmbusmeters prints ids
+  EXPECT(header.addresses[1].to_address().id == "1234abcd");
+}
+
+TEST(header_behind_ell_is_incomplete) {
+  Received received(
+      frames::dll(0x12345678, KAM, {0x8c, 0x20, 0x00, 0x00, 0x00}));
+  auto &header = received.frame->header();
+  EXPECT(!header.complete);
+  EXPECT(header.addresses_count == 1);
+}
+
+TEST(matches_header_as_wmbusmeters_does) {
+  const char *ids[] = {"12345678", "1234567*", "12*",      "*",
+                       "p1",       "1234ABCD", "1234abcd", "123",
+                       "00000000", "123456789"};
+  std::mt19937 random(3);
+  size_t cases = 0, accepted = 0;
+
+  while (cases < 3000) {
+    std::string expression;
+    for (size_t i = 0, n = 1 + random() % 3; i < n; i++) {
+      if (i)
+        expression += ",";
+      if (random() % 4 == 0)
+        expression += "!";
+      expression += ids[random() % 10];
+      if (random() % 4 == 0)
+        expression += ".M=PII";
+      if (random() % 4 == 0)
+        expression += ".V=01";
+      if (random() % 5 == 0)
+        expression += ".T=07";
+    }
+    if (!isValidSequenceOfAddressExpressions(expression))
+      continue;
+
+    Dispatcher dispatcher;
+    TestRadio radio(&dispatcher);
+    TestMeter meter(expression, radio);
+    auto expressions = splitAddressExpressions(expression);
+    if (random() % 3 == 0) {
+      meter.require_last();
+      expressions.back().required = true;
+    }
+
+    uint32_t candidates[] = {0x12345678, 0x1234567f, 0x12000000,
+                             0x1234abcd, 0x00000000, 0x12345679,
+                             (uint32_t)random()};
+    FrameHeader header{};
+    header.complete = true;
+    header.addresses_count = 1 + random() % 2;
+    std::vector<Address> addresses;
+    for (size_t i = 0; i < header.addresses_count; i++) {
+      auto &address = header.addresses[i];
+      address.id = candidates[random() % 7];
+      address.manufacturer = random() % 2 ? PII : 0x1234;
+      address.version = random() % 2 ? 0x01 : 0x02;
+      address.type = random() % 2 ? 0x07 : 0x08;
+      addresses.push_back(address.to_address());
+    }
+
+    bool used_wildcard = false;
+    bool expected =
+        doesTelegramMatchExpressions(addresses, expressions, &used_wildcard);
+    if (meter.matches_header_(header) != expected) {
+      std::fprintf(stderr, "  %s id %s: expected %d\n", expression.c_str(),
+                   addresses[0].id.c_str(), expected);
+      EXPECT(false);
+      return;
+    }
+    cases++;
+    accepted += expected;
+  }
+  // Both outcomes are covered
+  EXPECT(accepted > cases / 10);
+  EXPECT(accepted < cases * 9 / 10);
+}
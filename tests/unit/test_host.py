@@ -0,0 +1,118 @@
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+HOST_DIR = Path(__file__).resolve().parent / "host"
+WMBUS_DIR = Path(__file__).resolve().parents[2] / "components" / "wmbus"
+TESTS = sorted(HOST_DIR.glob("test_*.cpp"))
+CXX = shutil.which("g++") or shutil.which("clang++")
+
+# wmbusmeters sources that link without any driver
+WMBUS_COMMON = [
+    "address",
+    "aes",
+    "aescmac",
+    "crc16",
+    "dvparser",
+    "formula",
+    "manufacturer_specificities",
+    "meters",
+    "translatebits",
+    "units",
+    "util",
+    "wmbus",
+    "wmbus_utils",
+]
+
+
+def _sources(test):
+    # "// Sources: wmbus_radio/packet.cpp wmbus_common" lines, relative to
+    # components/wmbus, list what the test links besides itself
+    sources = []
+    for line in test.read_text().splitlines():
+        if line.startswith("// Sources:"):
+            for name in line.split(":", 1)[1].split():
+                if name == "wmbus_common":
+                    sources += [
+                        WMBUS_DIR / "wmbus_common" / f"{n}.cc" for n in WMBUS_COMMON
+                    ]
+                else:
+                    sources.append(WMBUS_DIR / name)
+    return sources
+
+
+class Builder:
+    def __init__(self, directory):
+        self.directory = directory
+        include = directory / "include" / "esphome" / "components"
+        include.mkdir(parents=True)
+        # Layout of an ESPHome build, where components are copied side by side
+        (include / "wmbus").symlink_to(WMBUS_DIR)
+        (include / "wmbus_radio").symlink_to(WMBUS_DIR / "wmbus_radio")
+        (include / "wmbus_meter").symlink_to(WMBUS_DIR / "wmbus_meter")
+        self.flags = [
+            "-std=c++17",
+            "-O0",
+            "-I",
+            str(HOST_DIR / "include"),
+            "-I",
+            str(directory / "include"),
+        ]
+        self.objects = {}
+
+    def objects_for(self, sources):
+        # Shared by all tests and built in parallel, wmbus_common takes a while
+        pending = []
+        for source in sources:
+            if source in self.objects:
+                continue
+            name = source.relative_to(WMBUS_DIR).with_suffix(".o")
+            target = self.directory / str(name).replace(os.sep, "_")
+            command = [CXX, *self.flags, "-c", "-o", str(target), str(source)]
+            process = subprocess.Popen(
+                command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+            )
+            pending.append((source, target, process))
+        errors = []
+        for source, target, process in pending:
+            output, _ = process.communicate()
+            if process.returncode:
+                errors.append(output)
+            else:
+                self.objects[source] = target
+        assert not errors, "\n".join(errors)
+        return [self.objects[source] for source in sources]
+
+
+@pytest.fixture(scope="session")
+def builder(tmp_path_factory):
+    return Builder(tmp_path_factory.mktemp("host"))
+
+
+@pytest.mark.skipif(CXX is None, reason="host C++ compiler not available")
+@pytest.mark.parametrize("source", TESTS, ids=lambda p: p.stem)
+def test_host_unit_tests_pass(source, builder, tmp_path):
+    objects = builder.objects_for(_sources(source))
+    binary = tmp_path / source.stem
+    result = subprocess.run(
+        [
+            CXX,
+            *builder.flags,
+            "-I",
+            str(HOST_DIR),
+            "-o",
+            str(binary),
+            str(source),
+            *map(str, objects),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    result = subprocess.run(
+        [str(binary)], capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
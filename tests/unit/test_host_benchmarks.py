@@ -0,0 +1,37 @@
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BENCHMARK_DIR = Path(__file__).resolve().parents[1] / "benchmark"
+BENCHMARKS = sorted(BENCHMARK_DIR.glob("bench_*.cpp"))
+SIMULATIONS = sorted(BENCHMARK_DIR.glob("bench_*.py"))
+CXX = shutil.which("g++") or shutil.which("clang++")
+
+
+@pytest.mark.skipif(CXX is None, reason="host C++ compiler not available")
+@pytest.mark.parametrize("source", BENCHMARKS, ids=lambda p: p.stem)
+def test_benchmark_builds_and_passes_checks(source, tmp_path):
+    binary = tmp_path / source.stem
+    subprocess.run(
+        [CXX, "-std=c++17", "-O1", "-o", str(binary), str(source)],
+        check=True,
+        capture_output=True,
+    )
+    # Few iterations only, the benchmarks verify results before timing
+    result = subprocess.run(
+        [str(binary), "10"], capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+
+
+@pytest.mark.parametrize("script", SIMULATIONS, ids=lambda p: p.stem)
+def test_simulated_benchmark_runs(script):
+    # Simulated time only, a full run takes well below a second
+    result = subprocess.run(
+        [sys.executable, str(script)], capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout
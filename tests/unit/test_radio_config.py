@@ -0,0 +1,31 @@
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def radio(monkeypatch):
+    # Other tests leave stand-ins for esphome behind
+    for name in list(sys.modules):
+        if name.split(".")[0] in ("esphome", "components"):
+            monkeypatch.delitem(sys.modules, name)
+    pytest.importorskip("esphome")
+    monkeypatch.syspath_prepend(str(REPO_ROOT))
+    return importlib.import_module("components.wmbus.wmbus_radio")
+
+
+def test_listen_schedule_stays_on_radio_frequency(radio):
+    import esphome.config_validation as cv
+
+    config = radio.LISTEN_SCHEDULE_SCHEMA({"sleep": True})
+    assert config["learn_intervals"]
+    assert config["guard_time"].total_milliseconds == 500
+    # Frequency profiles are gone, only T1 and C1 on 868.95 MHz are decoded
+    with pytest.raises(cv.Invalid):
+        radio.LISTEN_SCHEDULE_SCHEMA(
+            {"profiles": [{"frequency": 868.95, "dwell_time": "20s"}]}
+        )
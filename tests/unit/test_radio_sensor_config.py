@@ -0,0 +1,24 @@
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_radio_sensor_platform_validates(monkeypatch):
+    # Other tests leave stand-ins for esphome behind
+    for name in list(sys.modules):
+        if name.split(".")[0] in ("esphome", "components"):
+            monkeypatch.delitem(sys.modules, name)
+    pytest.importorskip("esphome")
+    monkeypatch.syspath_prepend(str(REPO_ROOT))
+    # No importorskip here, a name missing from esphome.const has to fail
+    module = importlib.import_module("components.wmbus.wmbus_radio.sensor")
+
+    config = module.CONFIG_SCHEMA({key: {"name": key} for key in module.SENSORS})
+    for key in module.SENSORS:
+        assert config[key]["name"] == key
+    assert config["latency_total"]["unit_of_measurement"] == "μs"
+    assert config["capture_rate"]["unit_of_measurement"] == "%"
@@ -1,3 +1,6 @@
+import importlib.util
+from pathlib import Path
+
 import pytest
 
 
@@ -5,6 +8,8 @@ class MockCC1101:
     def __init__(self):
         self.registers = {}
         self.strobes = []
+        self.fifo = []
+        self.transactions = 0
 
     def write_register(self, address, value):
         self.registers[address] = value
@@ -52,6 +57,28 @@ class MockCC1101:
         self.write_register(0x25, 0x00)  # FSCAL1
         self.write_register(0x26, 0x1F)  # FSCAL0
 
+    def get_rx_bytes_(self):
+        self.transactions += 1
+        return len(self.fifo) & 0x7F
+
+    def read(self):
+        if not self.get_rx_bytes_():
+            return None
+        self.transactions += 1
+        return self.fifo.pop(0)
+
+    def read_bulk(self, length):
+        count = self.get_rx_bytes_()
+        if count < length:
+            count = count - 1 if count > 1 else 0
+        else:
+            count = length
+        if not count:
+            return []
+        self.transactions += 1
+        data, self.fifo = self.fifo[:count], self.fifo[count:]
+        return data
+
     def restart_rx(self):
         self.strobe(0x36)  # SIDLE
         self.flush_rx_fifo_()
@@ -106,3 +133,59 @@ def test_restart_rx_sequence(radio):
     radio.restart_rx()
     assert radio.strobes == [0x36, 0x3A, 0x34]
 
+
+
+def _receive(radio, frame, read_chunk, arrival=4):
+    received = []
+    pending = list(frame)
+    while len(received) < len(frame):
+        # GDO0 wakes the reader once the FIFO threshold is reached
+        if len(radio.fifo) < arrival:
+            radio.fifo += pending[:arrival]
+            pending = pending[arrival:]
+        received += read_chunk(len(frame) - len(received))
+    return received
+
+
+def test_bulk_read_keeps_last_byte_while_receiving(radio):
+    radio.fifo = [1, 2, 3, 4]
+    assert radio.read_bulk(10) == [1, 2, 3]
+    assert radio.fifo == [4]
+    assert radio.read_bulk(1) == [4]
+
+
+def test_bulk_read_reduces_spi_transactions(radio):
+    frame = list(range(256)) + list(range(34))
+
+    def per_byte(_remaining):
+        byte = radio.read()
+        return [] if byte is None else [byte]
+
+    assert _receive(radio, frame, per_byte) == frame
+    per_byte_transactions = radio.transactions
+
+    radio.transactions = 0
+    assert _receive(radio, frame, radio.read_bulk) == frame
+    assert per_byte_transactions >= 2 * len(frame)
+    assert radio.transactions * 3 < per_byte_transactions
+
+
+def _load_restart_benchmark():
+    path = (
+        Path(__file__).resolve().parents[1] / "benchmark" / "bench_rx_restart.py"
+    )
+    spec = importlib.util.spec_from_file_location("bench_rx_restart", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_restart_rx_waits_for_marcstate_instead_of_fixed_delays():
+    bench = _load_restart_benchmark()
+    delayed = bench.simulate("CC1101", polling=False)
+    polled = bench.simulate("CC1101", polling=True)
+
+    assert polled["radio"].strobes == [0x36, 0x3A, 0x34]
+    assert polled["dead_us"] < delayed["dead_us"]
+    # Returns only once the radio listens again
+    assert polled["restart_us"] >= bench.CC1101_RX_READY_US
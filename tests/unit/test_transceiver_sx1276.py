@@ -1,3 +1,6 @@
+import importlib.util
+from pathlib import Path
+
 import pytest
 
 class MockSX1276:
@@ -39,3 +42,50 @@ def test_restart_rx_sequence():
         (0x3F, 1 << 4),
         (0x01, 0b101),
     ]
+
+
+def _load_fifo_benchmark():
+    path = (
+        Path(__file__).resolve().parents[1] / "benchmark" / "bench_sx1276_fifo.py"
+    )
+    spec = importlib.util.spec_from_file_location("bench_sx1276_fifo", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_fifo_level_burst_reads_reduce_spi_transactions():
+    bench = _load_fifo_benchmark()
+    polling = bench.simulate(fifo_level_mode=False)
+    burst = bench.simulate(fifo_level_mode=True)
+
+    assert polling["transactions"] == bench.MAX_PACKET_SIZE
+    assert burst["transactions"] * 5 < polling["transactions"]
+    assert burst["completion_delay_us"] < polling["completion_delay_us"]
+
+
+@pytest.mark.parametrize("frame_size", [3, 4, 27, 100, 435])
+def test_fifo_level_reads_complete_any_frame_size(frame_size):
+    bench = _load_fifo_benchmark()
+    result = bench.simulate(fifo_level_mode=True, frame_size=frame_size)
+    assert result["completion_delay_us"] < bench.TICK_US
+
+
+def _load_restart_benchmark():
+    path = (
+        Path(__file__).resolve().parents[1] / "benchmark" / "bench_rx_restart.py"
+    )
+    spec = importlib.util.spec_from_file_location("bench_rx_restart", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_restart_rx_polls_mode_ready_instead_of_fixed_delays():
+    bench = _load_restart_benchmark()
+    delayed = bench.simulate("SX1276", polling=False)
+    polled = bench.simulate("SX1276", polling=True)
+
+    assert delayed["dead_us"] >= 2 * bench.SX1276_DELAY_US
+    assert polled["dead_us"] < 1000
+    assert polled["restart_us"] < 1000
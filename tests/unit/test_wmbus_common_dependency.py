@@ -107,6 +107,10 @@ def _import_meter(with_common: bool) -> None:
         auto.build_automation = lambda *_a, **_k: None
         sys.modules["esphome.automation"] = auto
 
+        sys.modules["esphome.final_validate"] = types.ModuleType(
+            "esphome.final_validate"
+        )
+
         mqtt = types.ModuleType("esphome.components.mqtt")
         class _MQTTSchema:
             def extend(self, *_a, **_k):
@@ -130,6 +134,9 @@ def _import_meter(with_common: bool) -> None:
         class _RadioComponent:
             pass
         wmbus_radio.RadioComponent = _RadioComponent
+        wmbus_radio.CONF_ADDRESS_FILTER = "address_filter"
+        wmbus_radio.CONF_LISTEN_SCHEDULE = "listen_schedule"
+        wmbus_radio.CONF_SLEEP = "sleep"
         sys.modules["components.wmbus.wmbus_radio"] = wmbus_radio
 
         if with_common: